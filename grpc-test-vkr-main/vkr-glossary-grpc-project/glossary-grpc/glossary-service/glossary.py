@@ -1,8 +1,12 @@
 # glossary-service/glossary.py
 from concurrent import futures
-import json
-import os
+import asyncio
 import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import sys
 
 import grpc
 
@@ -10,141 +14,229 @@ from glossary_pb2 import (
     Term,
     GetTermsResponse,
     DeleteTermResponse,
+    BatchTermResult,
+    BatchCreateTermsResponse,
+    BatchGetTermsResponse,
+    BatchDeleteTermsResponse,
+    ImportTermsResponse,
     SearchTermsResponse,
     HealthCheckResponse,
+    CacheStatsResponse,
 )
 import glossary_pb2_grpc
+from storage import AsyncStorage, open_storage
 
+# Поля сообщения Term, допустимые в read_mask
+TERM_FIELDS = tuple(field.name for field in Term.DESCRIPTOR.fields)
+# Наибольшее число элементов в одном пакетном запросе
+BATCH_MAX_ITEMS = int(os.getenv("GLOSSARY_BATCH_MAX_ITEMS", "1000"))
+# Импорт: терминов в пачке и сколько ошибок вернуть в ответе
+IMPORT_CHUNK_SIZE = int(os.getenv("GLOSSARY_IMPORT_CHUNK_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("GLOSSARY_IMPORT_MAX_ERRORS", "100"))
+# Курсор - ID термина; больше int64 он не пройдет в параметр SQLite
+MAX_CURSOR = 2 ** 63 - 1
+# Сервер: thread (grpc.server с пулом потоков) или aio (grpc.aio в цикле событий)
+SERVER_MODE = os.getenv("GLOSSARY_GRPC_SERVER", "thread")
+# Наибольшее число одновременных RPC; сверх него сервер отвечает RESOURCE_EXHAUSTED
+MAX_CONCURRENT_RPCS = int(os.getenv("GLOSSARY_MAX_CONCURRENT_RPCS", "0")) or None
+# Процессов сервера на одном порту (SO_REUSEPORT); больше 1 - общий режим хранилища
+PROCESSES = int(os.getenv("GLOSSARY_GRPC_PROCESSES", "1"))
+# Несколько процессов слушают один порт, ядро распределяет между ними соединения
+SERVER_OPTIONS = [("grpc.so_reuseport", 1)]
 
-class Database:
-    """Простая база данных на основе JSON файла"""
-    
-    def __init__(self, file_path: str = "data/terms.json"):
-        self.file_path = file_path
-        self.ensure_data_directory()
-        self.load_data()
-        
-    def ensure_data_directory(self):
-        """Создает директорию data если её нет"""
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-    
-    def load_data(self):
-        """Загружает данные из JSON файла"""
-        if os.path.exists(self.file_path):
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
-        else:
-            self.data = []
-            self.save_data()
-    
-    def save_data(self):
-        """Сохраняет данные в JSON файл"""
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
-    
-    def get_next_id(self) -> int:
-        """Возвращает следующий доступный ID"""
-        if not self.data:
-            return 1
-        return max(term.get('id', 0) for term in self.data) + 1
-    
-    def create_term(self, term: str, definition: str, category: str = "", related_terms: list = None):
-        """Создает новый термина"""
-        term_id = self.get_next_id()
-        
-        term_dict = {
-            "id": term_id,
-            "term": term,
-            "definition": definition,
-            "category": category or None,
-            "related_terms": related_terms or []
-        }
-        
-        self.data.append(term_dict)
-        self.save_data()
-        
-        return term_dict
-    
-    def get_term(self, term_id: int):
-        """Получает термина по ID"""
-        for term_data in self.data:
-            if term_data.get('id') == term_id:
-                return term_data
+
+def term_message(term_data, fields=None):
+    """Термин в сообщении Term; с fields заполняются только эти поля"""
+    values = {
+        "id": term_data["id"],
+        "term": term_data["term"],
+        "definition": term_data["definition"],
+        "category": term_data.get("category") or "",
+        "related_terms": term_data.get("related_terms", []),
+    }
+    if fields is not None:
+        values = {name: values[name] for name in fields}
+    return Term(**values)
+
+
+def wait_commit(context):
+    """Режим фиксации из метаданных x-durability (sync/async), иначе по умолчанию"""
+    durability = dict(context.invocation_metadata()).get("x-durability")
+    if durability is None:
         return None
-    
-    def get_all_terms(self, page: int = 1, per_page: int = 10, search: str = ""):
-        """Получает все термины с пагинацией и поиском"""
-        terms = []
-        
-        for term_data in self.data:
-            if search:
-                search_lower = search.lower()
-                if (search_lower not in term_data["term"].lower() and 
-                    search_lower not in term_data["definition"].lower()):
-                    continue
-            
-            terms.append(term_data)
-        
-        # Сортировка по ID (новые термины сверху)
-        terms.sort(key=lambda x: x.get('id', 0), reverse=True)
-        
-        # Пагинация
-        total = len(terms)
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_terms = terms[start:end]
-        
-        return {
-            "terms": paginated_terms,
-            "total": total,
-            "page": page,
-            "per_page": per_page
-        }
-    
-    def update_term(self, term_id: int, term: str = None, definition: str = None, 
-                   category: str = None, related_terms: list = None):
-        """Обновляет термина"""
-        for existing_term in self.data:
-            if existing_term.get('id') == term_id:
-                if term is not None:
-                    existing_term["term"] = term
-                if definition is not None:
-                    existing_term["definition"] = definition
-                if category is not None:
-                    existing_term["category"] = category if category else None
-                if related_terms is not None:
-                    existing_term["related_terms"] = related_terms
-                
-                self.save_data()
-                return existing_term
+    return durability != "async"
+
+
+def read_mask(request):
+    """Поля Term из read_mask запроса; None - все поля, ValueError на неизвестное поле"""
+    paths = set(request.read_mask.paths)
+    if not paths:
         return None
-    
-    def delete_term(self, term_id: int) -> bool:
-        """Удаляет термина"""
-        for i, term_data in enumerate(self.data):
-            if term_data.get('id') == term_id:
-                del self.data[i]
-                self.save_data()
-                return True
-        return False
-    
-    def search_terms(self, query: str):
-        """Поиск терминов по запросу"""
-        results = []
-        query_lower = query.lower()
-        
-        for term_data in self.data:
-            if (query_lower in term_data["term"].lower() or 
-                query_lower in term_data["definition"].lower() or
-                (term_data.get("category") and query_lower in term_data.get("category", "").lower())):
-                results.append(term_data)
-        
-        return results
+    unknown = paths.difference(TERM_FIELDS)
+    if unknown:
+        raise ValueError("Неизвестные поля read_mask: " + ", ".join(sorted(unknown)))
+    return tuple(name for name in TERM_FIELDS if name in paths)
+
+
+def check_batch(size):
+    if size > BATCH_MAX_ITEMS:
+        raise ValueError(f"Слишком большой пакет: {size} > {BATCH_MAX_ITEMS}")
+
+
+def paging(request):
+    """Аргументы get_all_terms из GetTermsRequest; ValueError на некорректный page_token"""
+    # Курсор: ID последнего термина прошлой страницы, page не учитывается
+    after_id = request.after_id if request.after_id > 0 else None
+    if request.page_token:
+        token = request.page_token
+        # isdigit пропускает цифры вроде "²", которые не разбирает int
+        if not (token.isascii() and token.isdecimal()) or int(token) > MAX_CURSOR:
+            raise ValueError("Некорректный page_token")
+        after_id = int(token)
+    return {
+        "page": request.page if request.page > 0 else 1,
+        "per_page": request.per_page if request.per_page > 0 else 10,
+        "search": request.search if request.search else "",
+        "after_id": after_id,
+    }
+
+
+def terms_response(result, fields):
+    next_after_id = result["next_after_id"]
+    return GetTermsResponse(
+        terms=[term_message(term_data, fields) for term_data in result["terms"]],
+        total=result["total"],
+        page=result["page"],
+        per_page=result["per_page"],
+        next_page_token=str(next_after_id) if next_after_id is not None else ""
+    )
+
+
+def term_item(request):
+    """Новый термин из CreateTermRequest; None, если нет term или definition"""
+    if not request.term or not request.definition:
+        return None
+    return {
+        "term": request.term,
+        "definition": request.definition,
+        "category": request.category or None,
+        "related_terms": list(request.related_terms),
+    }
+
+
+def term_changes(request):
+    """Изменения из UpdateTermRequest (пустые поля запроса означают "не менять")"""
+    changes = {}
+    if request.term:
+        changes["term"] = request.term
+    if request.definition:
+        changes["definition"] = request.definition
+    if request.category:
+        changes["category"] = request.category
+    if request.related_terms:
+        changes["related_terms"] = list(request.related_terms)
+    return changes
+
+
+def batch_create_items(requests):
+    """Разбор пакета создания: результаты (с ошибками), термины и их позиции"""
+    results = [None] * len(requests)
+    items, positions = [], []
+    for i, request in enumerate(requests):
+        item = term_item(request)
+        if item is None:
+            results[i] = BatchTermResult(code=grpc.StatusCode.INVALID_ARGUMENT.value[0],
+                                         message="Поля term и definition обязательны")
+            continue
+        items.append(item)
+        positions.append(i)
+    return results, items, positions
+
+
+def batch_create_response(results, positions, created):
+    for i, term_data in zip(positions, created):
+        results[i] = BatchTermResult(term=term_message(term_data), term_id=term_data["id"])
+    return BatchCreateTermsResponse(results=results)
+
+
+def batch_get_response(term_ids, records, fields):
+    results = []
+    for term_id, term_data in zip(term_ids, records):
+        if term_data is None:
+            results.append(BatchTermResult(code=grpc.StatusCode.NOT_FOUND.value[0],
+                                           message="Термин не найден", term_id=term_id))
+        else:
+            results.append(BatchTermResult(term=term_message(term_data, fields), term_id=term_id))
+    return BatchGetTermsResponse(results=results)
+
+
+def batch_delete_response(term_ids, deleted):
+    results = []
+    for term_id, success in zip(term_ids, deleted):
+        if success:
+            results.append(BatchTermResult(message="Термин успешно удален", term_id=term_id))
+        else:
+            results.append(BatchTermResult(code=grpc.StatusCode.NOT_FOUND.value[0],
+                                           message="Термин не найден", term_id=term_id))
+    return BatchDeleteTermsResponse(results=results)
+
+
+def search_response(query, results, fields):
+    term_list = [term_message(term_data, fields) for term_data in results]
+    return SearchTermsResponse(
+        results=term_list,
+        query=query,
+        count=len(term_list)
+    )
+
+
+class TermImport:
+    """Состояние ImportTerms: текущая пачка и итоговый ответ"""
+
+    def __init__(self):
+        self.response = ImportTermsResponse()
+        self.chunk = []
+
+    def add(self, index, request):
+        """Добавляет термин потока; True, когда пачка заполнена"""
+        item = term_item(request)
+        if item is None:
+            self.response.failed += 1
+            if len(self.response.errors) < IMPORT_MAX_ERRORS:
+                self.response.errors.add(index=index, message="Поля term и definition обязательны")
+            return False
+        self.chunk.append(item)
+        return len(self.chunk) >= IMPORT_CHUNK_SIZE
+
+    def take(self):
+        chunk, self.chunk = self.chunk, []
+        return chunk
+
+    def created(self, terms):
+        self.response.created += len(terms)
+        self.response.chunks += 1
 
 
 class GlossaryService(glossary_pb2_grpc.GlossaryServiceServicer):
     def __init__(self):
-        self.db = Database()
+        # Бэкенд хранилища выбирается GLOSSARY_STORAGE (json или sqlite)
+        self.db = open_storage("data/terms.json")
+    
+    def _wait_commit(self, context):
+        return wait_commit(context)
+    
+    def _read_mask(self, request, context):
+        """Поля Term из read_mask запроса; None - все поля"""
+        try:
+            return read_mask(request)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+    
+    def _check_batch(self, size, context):
+        try:
+            check_batch(size)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
     
     def GetTerm(self, request, context):
         """Получить информацию о конкретном термине"""
@@ -162,36 +254,21 @@ class GlossaryService(glossary_pb2_grpc.GlossaryServiceServicer):
     
     def GetTerms(self, request, context):
         """Получить список всех терминов с пагинацией и поиском"""
-        page = request.page if request.page > 0 else 1
-        per_page = request.per_page if request.per_page > 0 else 10
-        search = request.search if request.search else ""
-        
-        result = self.db.get_all_terms(page=page, per_page=per_page, search=search)
-        
-        terms = []
-        for term_data in result["terms"]:
-            terms.append(Term(
-                id=term_data["id"],
-                term=term_data["term"],
-                definition=term_data["definition"],
-                category=term_data.get("category") or "",
-                related_terms=term_data.get("related_terms", [])
-            ))
-        
-        return GetTermsResponse(
-            terms=terms,
-            total=result["total"],
-            page=result["page"],
-            per_page=result["per_page"]
-        )
+        try:
+            kwargs = paging(request)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        fields = self._read_mask(request, context)
+        return terms_response(self.db.get_all_terms(**kwargs), fields)
     
     def CreateTerm(self, request, context):
         """Добавить новый термина в глоссарий"""
         term_data = self.db.create_term(
             term=request.term,
             definition=request.definition,
-            category=request.category if request.category else "",
-            related_terms=list(request.related_terms)
+            category=request.category or None,
+            related_terms=list(request.related_terms),
+            wait=self._wait_commit(context)
         )
         
         return Term(
@@ -204,13 +281,7 @@ class GlossaryService(glossary_pb2_grpc.GlossaryServiceServicer):
     
     def UpdateTerm(self, request, context):
         """Обновить существующий термина"""
-        term_data = self.db.update_term(
-            term_id=request.term_id,
-            term=request.term if request.term else None,
-            definition=request.definition if request.definition else None,
-            category=request.category if request.category else None,
-            related_terms=list(request.related_terms) if request.related_terms else None
-        )
+        term_data = self.db.update_term(request.term_id, term_changes(request), wait=self._wait_commit(context))
         
         if not term_data:
             context.abort(grpc.StatusCode.NOT_FOUND, "Термин не найден")
@@ -225,31 +296,66 @@ class GlossaryService(glossary_pb2_grpc.GlossaryServiceServicer):
     
     def DeleteTerm(self, request, context):
         """Удалить термина из глоссария"""
-        success = self.db.delete_term(request.term_id)
+        success = self.db.delete_term(request.term_id, wait=self._wait_commit(context))
         if not success:
             context.abort(grpc.StatusCode.NOT_FOUND, "Термин не найден")
         
         return DeleteTermResponse(message="Термин успешно удален")
     
-    def SearchTerms(self, request, context):
-        """Поиск терминов по запросу"""
-        results = self.db.search_terms(request.query)
+    def StreamTerms(self, request, context):
+        """Выгрузить все термины по возрастанию ID потоком
         
-        term_list = []
-        for term_data in results:
-            term_list.append(Term(
-                id=term_data["id"],
-                term=term_data["term"],
-                definition=term_data["definition"],
-                category=term_data.get("category") or "",
-                related_terms=term_data.get("related_terms", [])
-            ))
+        Термины читаются из снимка хранилища пачками по мере отправки,
+        поэтому память не зависит от размера глоссария.
+        """
+        fields = self._read_mask(request, context)
+        for chunk in self.db.iter_terms():
+            for term_data in chunk:
+                yield term_message(term_data, fields)
+    
+    def ImportTerms(self, request_iterator, context):
+        """Импортировать поток терминов пачками по IMPORT_CHUNK_SIZE
         
-        return SearchTermsResponse(
-            results=term_list,
-            query=request.query,
-            count=len(term_list)
-        )
+        Каждая пачка создается одной транзакцией с одной записью на диск, в
+        памяти держится только текущая пачка. Термины без term или
+        definition пропускаются и считаются в failed.
+        """
+        wait = self._wait_commit(context)
+        state = TermImport()
+        for index, item in enumerate(request_iterator):
+            if state.add(index, item):
+                state.created(self.db.create_terms(state.take(), wait=wait))
+        if state.chunk:
+            state.created(self.db.create_terms(state.take(), wait=wait))
+        return state.response
+    
+    def BatchCreateTerms(self, request, context):
+        """Создать пакет терминов одной транзакцией
+        
+        Элементы без term или definition не создаются и получают
+        INVALID_ARGUMENT, остальные создаются вместе.
+        """
+        self._check_batch(len(request.terms), context)
+        results, items, positions = batch_create_items(request.terms)
+        created = self.db.create_terms(items, wait=self._wait_commit(context))
+        return batch_create_response(results, positions, created)
+    
+    def BatchGetTerms(self, request, context):
+        """Получить термины по списку ID; отсутствующие - NOT_FOUND"""
+        self._check_batch(len(request.term_ids), context)
+        fields = self._read_mask(request, context)
+        return batch_get_response(request.term_ids, self.db.get_terms(list(request.term_ids)), fields)
+    
+    def BatchDeleteTerms(self, request, context):
+        """Удалить пакет терминов одной транзакцией; отсутствующие - NOT_FOUND"""
+        self._check_batch(len(request.term_ids), context)
+        deleted = self.db.delete_terms(list(request.term_ids), wait=self._wait_commit(context))
+        return batch_delete_response(request.term_ids, deleted)
+    
+    def SearchTerms(self, request, context):
+        """Поиск терминов по запросу"""
+        fields = self._read_mask(request, context)
+        return search_response(request.query, self.db.search_terms(request.query), fields)
     
     def HealthCheck(self, request, context):
         """Проверка состояния API"""
@@ -257,21 +363,242 @@ class GlossaryService(glossary_pb2_grpc.GlossaryServiceServicer):
             status="healthy",
             message="API работает корректно"
         )
+    
+    def GetCacheStats(self, request, context):
+        """Статистика кэша результатов списка и поиска"""
+        return CacheStatsResponse(**self.db.cache.stats())
+
+
+class ConcurrencyLimit(grpc.aio.ServerInterceptor):
+    """Лимит одновременных RPC сервера grpc.aio: сверх limit - RESOURCE_EXHAUSTED
+    
+    Встроенный maximum_concurrent_rpcs в grpc.aio (1.76) уменьшает счетчик
+    активных RPC и на отклоненных вызовах, поэтому после каждого отказа
+    пропускает на один RPC больше лимита. Здесь счетчик ведется в самом
+    цикле событий и учитывает только RPC, обработчик которых запущен.
+    """
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+    
+    async def _acquire(self, context):
+        if self.active >= self.limit:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Превышен лимит одновременных RPC")
+        self.active += 1
+    
+    def _unary(self, behavior):
+        async def limited(request, context):
+            await self._acquire(context)
+            try:
+                return await behavior(request, context)
+            finally:
+                self.active -= 1
+        return limited
+    
+    def _stream(self, behavior):
+        async def limited(request, context):
+            await self._acquire(context)
+            try:
+                async for response in behavior(request, context):
+                    yield response
+            finally:
+                self.active -= 1
+        return limited
+    
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        serializers = dict(request_deserializer=handler.request_deserializer,
+                           response_serializer=handler.response_serializer)
+        if handler.request_streaming and handler.response_streaming:
+            return grpc.stream_stream_rpc_method_handler(self._stream(handler.stream_stream), **serializers)
+        if handler.request_streaming:
+            return grpc.stream_unary_rpc_method_handler(self._unary(handler.stream_unary), **serializers)
+        if handler.response_streaming:
+            return grpc.unary_stream_rpc_method_handler(self._stream(handler.unary_stream), **serializers)
+        return grpc.unary_unary_rpc_method_handler(self._unary(handler.unary_unary), **serializers)
+
+
+class AsyncGlossaryService(glossary_pb2_grpc.GlossaryServiceServicer):
+    """Те же методы для сервера grpc.aio
+    
+    Обработчики - корутины в одном цикле событий, число одновременных RPC
+    не ограничено пулом потоков. Хранилище обернуто в AsyncStorage: чтения
+    JSON из памяти идут прямо в цикле, чтения SQLite - в пуле потоков,
+    мутации (запись файла, fsync, ожидание фиксации) - в пуле записи.
+    """
+    
+    def __init__(self):
+        self.db = AsyncStorage(open_storage("data/terms.json"))
+    
+    async def _read_mask(self, request, context):
+        try:
+            return read_mask(request)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+    
+    async def _check_batch(self, size, context):
+        try:
+            check_batch(size)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+    
+    async def GetTerm(self, request, context):
+        term_data = await self.db.get_term(request.term_id)
+        if not term_data:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "Термин не найден")
+        return term_message(term_data)
+    
+    async def GetTerms(self, request, context):
+        try:
+            kwargs = paging(request)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        fields = await self._read_mask(request, context)
+        return terms_response(await self.db.get_all_terms(**kwargs), fields)
+    
+    async def CreateTerm(self, request, context):
+        term_data = await self.db.create_term(
+            term=request.term,
+            definition=request.definition,
+            category=request.category or None,
+            related_terms=list(request.related_terms),
+            wait=wait_commit(context)
+        )
+        return term_message(term_data)
+    
+    async def UpdateTerm(self, request, context):
+        term_data = await self.db.update_term(request.term_id, term_changes(request), wait=wait_commit(context))
+        if not term_data:
+            await context.abort(grpc.StatusCode.NOT_FOUND, "Термин не найден")
+        return term_message(term_data)
+    
+    async def DeleteTerm(self, request, context):
+        if not await self.db.delete_term(request.term_id, wait=wait_commit(context)):
+            await context.abort(grpc.StatusCode.NOT_FOUND, "Термин не найден")
+        return DeleteTermResponse(message="Термин успешно удален")
+    
+    async def StreamTerms(self, request, context):
+        fields = await self._read_mask(request, context)
+        async for chunk in self.db.iter_terms():
+            for term_data in chunk:
+                yield term_message(term_data, fields)
+    
+    async def ImportTerms(self, request_iterator, context):
+        wait = wait_commit(context)
+        state = TermImport()
+        index = 0
+        async for item in request_iterator:
+            if state.add(index, item):
+                state.created(await self.db.create_terms(state.take(), wait=wait))
+            index += 1
+        if state.chunk:
+            state.created(await self.db.create_terms(state.take(), wait=wait))
+        return state.response
+    
+    async def BatchCreateTerms(self, request, context):
+        await self._check_batch(len(request.terms), context)
+        results, items, positions = batch_create_items(request.terms)
+        created = await self.db.create_terms(items, wait=wait_commit(context))
+        return batch_create_response(results, positions, created)
+    
+    async def BatchGetTerms(self, request, context):
+        await self._check_batch(len(request.term_ids), context)
+        fields = await self._read_mask(request, context)
+        return batch_get_response(request.term_ids, await self.db.get_terms(list(request.term_ids)), fields)
+    
+    async def BatchDeleteTerms(self, request, context):
+        await self._check_batch(len(request.term_ids), context)
+        deleted = await self.db.delete_terms(list(request.term_ids), wait=wait_commit(context))
+        return batch_delete_response(request.term_ids, deleted)
+    
+    async def SearchTerms(self, request, context):
+        fields = await self._read_mask(request, context)
+        return search_response(request.query, await self.db.search_terms(request.query), fields)
+    
+    async def HealthCheck(self, request, context):
+        return HealthCheckResponse(
+            status="healthy",
+            message="API работает корректно"
+        )
+    
+    async def GetCacheStats(self, request, context):
+        return CacheStatsResponse(**self.db.cache.stats())
 
 
 def serve():
     port = "50052"
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                         options=SERVER_OPTIONS,
+                         maximum_concurrent_rpcs=MAX_CONCURRENT_RPCS)
     glossary_pb2_grpc.add_GlossaryServiceServicer_to_server(
         GlossaryService(), server
     )
     server.add_insecure_port("[::]:" + port)
     server.start()
-    print("Glossary gRPC Server started, listening on " + port)
+    print(f"Glossary gRPC Server started, listening on {port} (pid {os.getpid()})")
     server.wait_for_termination()
 
 
+async def serve_aio():
+    port = "50052"
+    interceptors = [ConcurrencyLimit(MAX_CONCURRENT_RPCS)] if MAX_CONCURRENT_RPCS else []
+    server = grpc.aio.server(interceptors=interceptors, options=SERVER_OPTIONS)
+    service = AsyncGlossaryService()
+    glossary_pb2_grpc.add_GlossaryServiceServicer_to_server(service, server)
+    server.add_insecure_port("[::]:" + port)
+    await server.start()
+    print(f"Glossary gRPC Server (aio) started, listening on {port} (pid {os.getpid()})")
+    try:
+        await server.wait_for_termination()
+    finally:
+        service.db.close()
+
+
+def run():
+    if SERVER_MODE == "aio":
+        asyncio.run(serve_aio())
+    elif SERVER_MODE == "thread":
+        serve()
+    else:
+        raise ValueError(f"Неизвестный сервер GLOSSARY_GRPC_SERVER={SERVER_MODE!r}: ожидается thread или aio")
+
+
+def serve_processes(processes):
+    """Запускает processes серверов на одном порту и ждет их
+    
+    Каждый процесс создает свой сервер и открывает хранилище после fork, в
+    родителе нет ни одного объекта gRPC. Хранилище работает в общем режиме
+    (GLOSSARY_SHARED=1): мутации идут под межпроцессной блокировкой, чужие
+    изменения дочитываются перед чтением. Если один процесс завершился,
+    останавливаются все: сервис не работает с частью процессов.
+    """
+    os.environ["GLOSSARY_SHARED"] = "1"
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=run, name=f"glossary-grpc-{i}") for i in range(processes)]
+    for worker in workers:
+        worker.start()
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Glossary gRPC launcher: {processes} processes, pids "
+          + ", ".join(str(worker.pid) for worker in workers))
+    try:
+        multiprocessing.connection.wait([worker.sentinel for worker in workers])
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+    failed = [worker for worker in workers if worker.exitcode not in (0, -signal.SIGTERM)]
+    if failed:
+        sys.exit(f"Процесс {failed[0].name} завершился с кодом {failed[0].exitcode}")
+
+
 if __name__ == "__main__":
     logging.basicConfig()
-    serve()
-
+    if PROCESSES > 1:
+        serve_processes(PROCESSES)
+    else:
+        run()
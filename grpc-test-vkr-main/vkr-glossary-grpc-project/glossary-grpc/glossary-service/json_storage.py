@@ -0,0 +1,659 @@
+import atexit
+import gc
+import json
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from journal import Journal, JournalCompactor, read_journal, tail_journal
+from ordered import OrderedIndex
+from process_lock import ProcessLock
+from query_cache import QueryCache
+from records import StringTable, TermRecord
+from snapshot import SnapshotRecord, binary_path, open_records, write_binary
+from storage import Storage
+from trigram import TrigramIndex, search_texts
+from versioned import TermMap, Version
+from writebehind import CommitTicket, WriteBehindFlusher
+
+
+@contextmanager
+def paused_gc():
+    """Отключает сборщик мусора на время загрузки, потом замораживает загруженное
+
+    Загрузка создает миллионы долгоживущих объектов, и циклический сборщик
+    раз за разом обходит их впустую. После загрузки gc.freeze() переносит их
+    в постоянное поколение, чтобы полные сборки не обходили корпус.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.freeze()
+        if enabled:
+            gc.enable()
+
+
+class JsonStorage(Storage):
+    """Хранилище на основе JSON файла
+    
+    В режиме журнала (journal=True или GLOSSARY_JOURNAL=1) мутации не
+    переписывают terms.json, а дописываются в append-only журнал рядом с ним.
+    Фоновый компактор сворачивает журнал в снимок при превышении
+    GLOSSARY_JOURNAL_MAX_BYTES байт или GLOSSARY_JOURNAL_MAX_AGE секунд.
+    
+    В режиме отложенной записи (write_behind=True или GLOSSARY_WRITE_BEHIND=1)
+    мутации применяются в памяти сразу, а на диск попадают группой: один
+    поток-флашер собирает все изменения за GLOSSARY_FLUSH_WINDOW_MS или до
+    GLOSSARY_FLUSH_MAX_BATCH штук и делает одну запись. GLOSSARY_DURABILITY
+    задает поведение по умолчанию: sync - ждать записи группы, async - нет.
+    
+    Термины хранятся в словаре id -> запись, поэтому чтение и изменение по ID
+    выполняются за O(1). ID выдаются монотонным счетчиком, который сохраняется
+    в terms.meta.json и не переиспользует ID удаленных терминов.
+    
+    Записи в памяти - компактные TermRecord (модуль records) с интерфейсом
+    словаря: категории и названия связанных терминов хранятся один раз в
+    таблице строк self.strings, связи - номерами в ней.
+    
+    Для постраничного вывода поддерживается упорядоченный по ID индекс
+    (OrderedIndex), который обновляется при вставке и удалении, поэтому
+    страница без поиска не требует сортировки всего корпуса.
+    
+    Поиск подстроки сначала сужает кандидатов по индексу триграмм
+    (TrigramIndex), а затем проверяет их тем же сравнением, что и раньше.
+    
+    Результаты get_all_terms и search_terms кэшируются в LRU-кэше (QueryCache)
+    размером GLOSSARY_CACHE_SIZE записей; любая мутация начинает новое
+    поколение данных и сбрасывает кэш. GLOSSARY_CACHE_SIZE=0 отключает кэш.
+    
+    Конкурентный доступ: данные публикуются неизменяемыми версиями (Version).
+    Читатели берут текущую версию одной операцией присваивания и работают с
+    ней без блокировок. Писатель один: под self._lock он выделяет ID, строит
+    новую версию копированием только затронутых частей структур и атомарно
+    подменяет ею текущую. Запись файлов идет из той же критической секции
+    или из единственного потока отложенной записи, поэтому файл не рвется.
+    
+    Формат снимка задает GLOSSARY_SNAPSHOT_FORMAT: json (terms.json) или
+    binary (terms.snap, модуль snapshot). Бинарный снимок открывается через
+    mmap, записи декодируются в TermRecord при первом обращении, а индекс триграмм
+    строится в фоновом потоке; до его готовности поиск просматривает все
+    записи. При старте читается более свежий из двух файлов, поэтому
+    переключение формата конвертирует данные при следующей записи снимка.
+    
+    Общий режим (shared=True или GLOSSARY_SHARED=1) нужен, когда data/
+    делят несколько процессов, например воркеры uvicorn --workers N. Он
+    включает журнал и выключает отложенную запись. Мутация идет под
+    межпроцессной блокировкой terms.lock (flock): процесс сначала дочитывает
+    из журнала чужие мутации, затем выделяет ID из догнанного счетчика и
+    дописывает свою. Перед чтением процесс сравнивает inode и размер журнала
+    с уже прочитанными (один stat) и при расхождении дочитывает новые строки.
+    Если журнал свернули в снимок (сменился inode), хранилище перечитывается
+    целиком.
+    """
+    
+    def __init__(self, file_path: str = "data/terms.json", journal: Optional[bool] = None,
+                 write_behind: Optional[bool] = None, shared: Optional[bool] = None):
+        self.file_path = file_path
+        self.journal_path = os.path.splitext(file_path)[0] + ".journal"
+        self.meta_path = os.path.splitext(file_path)[0] + ".meta.json"
+        if journal is None:
+            journal = os.getenv("GLOSSARY_JOURNAL", "0") == "1"
+        if write_behind is None:
+            write_behind = os.getenv("GLOSSARY_WRITE_BEHIND", "0") == "1"
+        if shared is None:
+            shared = os.getenv("GLOSSARY_SHARED", "0") == "1"
+        if shared:
+            # Порядок мутаций между процессами задает журнал под flock
+            journal = True
+            write_behind = False
+        self.fsync = os.getenv("GLOSSARY_FSYNC", "0") == "1"
+        self.sync_commit = os.getenv("GLOSSARY_DURABILITY", "sync") != "async"
+        self.binary_snapshot = os.getenv("GLOSSARY_SNAPSHOT_FORMAT", "json") == "binary"
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._journal = None
+        self._compactor = None
+        self._flusher = None
+        self.cache = QueryCache(
+            max_entries=int(os.getenv("GLOSSARY_CACHE_SIZE", "256")),
+            max_items=int(os.getenv("GLOSSARY_CACHE_MAX_ITEMS", "100000")),
+        )
+        self._stale_postings = 0
+        self._trigrams_pending = None
+        self.strings = StringTable()
+        self.ensure_data_directory()
+        self._process_lock = ProcessLock(os.path.splitext(file_path)[0] + ".lock") if shared else None
+        # В общем режиме чтение может дочитывать журнал под flock
+        self.inline_reads = not shared
+        # Записи неизменяемы и живут в версии, пока термин не изменят
+        self.stable_records = True
+        with self._process_lock or nullcontext():
+            with paused_gc():
+                self.load_data()
+            if journal:
+                self.open_journal()
+        if write_behind:
+            self.start_flusher()
+        
+    def ensure_data_directory(self):
+        """Создает директорию data если её нет"""
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+    
+    def load_data(self, fold: bool = True):
+        """Загружает снимок (JSON или бинарный) и применяет к нему журнал
+        
+        fold=True сворачивает журнал в снимок сразу после загрузки.
+        """
+        snap_path = binary_path(self.file_path)
+        exists = os.path.exists(self.file_path) or os.path.exists(snap_path)
+        ids, records, snapshot_next_id = open_records(self.file_path, self.strings)
+        lazy = bool(records) and isinstance(records[0], SnapshotRecord)
+        if not lazy:
+            records = [TermRecord.pack(term_data, self.strings) for term_data in records]
+        terms = dict(zip(ids, records))
+        self.next_id = max(max(terms, default=0) + 1, snapshot_next_id,
+                           self.load_meta().get("next_id", 1))
+        
+        segments = [p for p in (self.journal_path + ".compacting", self.journal_path)
+                    if os.path.exists(p)]
+        if segments:
+            self.replay_journal(segments, terms)
+        
+        self._version = Version(
+            terms=TermMap(terms.items()),
+            ordered=OrderedIndex(terms.items()),
+            trigrams=None if lazy else self.build_trigrams(terms.items()),
+        )
+        self._stale_postings = 0
+        self._trigrams_pending = None
+        if lazy:
+            self.start_trigrams(self._version.terms)
+        if fold and (not exists or segments or (self.binary_snapshot and not lazy)):
+            # Сворачиваем хвост журнала сразу, чтобы следующий старт был быстрым
+            self.save_data()
+            for path in segments:
+                os.remove(path)
+    
+    @property
+    def terms(self) -> TermMap:
+        """Термины текущей версии (только для чтения)"""
+        return self._version.terms
+    
+    @property
+    def ordered(self) -> OrderedIndex:
+        return self._version.ordered
+    
+    @property
+    def trigrams(self) -> TrigramIndex:
+        return self._version.trigrams
+    
+    def build_trigrams(self, items) -> TrigramIndex:
+        """Строит индекс триграмм заново по парам (id, запись)"""
+        index = TrigramIndex()
+        for term_id, term_data in items:
+            if isinstance(term_data, SnapshotRecord):
+                # Не оставляем декодированные записи в памяти ради индекса
+                term_data = term_data.decode()
+            index.add(term_id, search_texts(term_data))
+        return index
+    
+    def start_trigrams(self, terms: TermMap):
+        """Запускает фоновую сборку индекса триграмм по версии terms
+        
+        Вызывается под self._lock (или до первого чтения). Пока индекс
+        строится, publish_many копит измененные ID в self._trigrams_pending.
+        """
+        self._stale_postings = 0
+        self._trigrams_pending = set()
+        threading.Thread(target=self.finish_trigrams, name="trigram-builder", daemon=True,
+                         args=(terms, self._trigrams_pending)).start()
+    
+    def finish_trigrams(self, terms: TermMap, pending: set):
+        """Строит индекс триграмм по версии terms и публикует его
+        
+        Так строится индекс для версии из бинарного снимка и новый индекс
+        взамен общего, в котором накопилось много устаревших ID. Индекс
+        строится без блокировки, писатели в это время не ждут. Термины,
+        измененные за это время, дописываются в индекс под блокировкой, и
+        индекс публикуется в текущей версии. Если хранилище успели
+        перечитать (pending уже не текущий), индекс отбрасывается.
+        """
+        index = self.build_trigrams(terms.items())
+        with self._lock:
+            if self._trigrams_pending is not pending:
+                return
+            version = self._version
+            for term_id in self._trigrams_pending:
+                term_data = version.terms.get(term_id)
+                if term_data is not None:
+                    index.add(term_id, search_texts(term_data))
+            self._trigrams_pending = None
+            self._version = version._replace(trigrams=index)
+    
+    def load_meta(self) -> Dict:
+        """Читает служебные данные хранилища (счетчик ID)"""
+        if not os.path.exists(self.meta_path):
+            return {}
+        with open(self.meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def replay_journal(self, paths: List[str], terms: Dict[int, Dict]):
+        """Применяет записи журнала к загруженному снимку"""
+        for path in paths:
+            for entry in read_journal(path):
+                if entry["op"] == "put":
+                    term = TermRecord.pack(entry["term"], self.strings)
+                    terms[term["id"]] = term
+                    self.next_id = max(self.next_id, term["id"] + 1)
+                elif entry["op"] == "delete":
+                    terms.pop(entry["id"], None)
+    
+    def mutation(self):
+        """Критическая секция мутации; в общем режиме еще и межпроцессная
+        
+        Под межпроцессной блокировкой сначала применяются чужие мутации,
+        поэтому счетчик ID и проверки существования видят все процессы.
+        """
+        if self._process_lock is None:
+            return self._lock
+        return self._shared_mutation()
+    
+    @contextmanager
+    def _shared_mutation(self):
+        with self._lock, self._process_lock:
+            self.catch_up()
+            yield
+    
+    def refresh(self):
+        """Перед чтением в общем режиме подхватывает мутации других процессов"""
+        if self._process_lock is None:
+            return
+        try:
+            stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            stat = None
+        journal = self._journal
+        if stat is not None and stat.st_ino == journal.inode and stat.st_size == journal.size:
+            return
+        with self._lock, self._process_lock:
+            self.catch_up()
+    
+    def catch_up(self):
+        """Применяет мутации, дописанные в журнал другими процессами
+        
+        Вызывается под self._lock и межпроцессной блокировкой. Прочитанная
+        часть журнала - self._journal.size. Недописанная строка в конце
+        могла остаться только от упавшего процесса и обрезается.
+        """
+        try:
+            inode = os.stat(self.journal_path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if inode != self._journal.inode:
+            self.reload()
+            return
+        entries, offset = tail_journal(self.journal_path, self._journal.size)
+        for entry in entries:
+            if entry["op"] == "put":
+                record = TermRecord.pack(entry["term"], self.strings)
+                self.next_id = max(self.next_id, record["id"] + 1)
+                self.publish(record["id"], record)
+            elif entry["op"] == "delete" and entry["id"] in self._version.terms:
+                self.publish(entry["id"], None)
+        if os.path.getsize(self.journal_path) > offset:
+            os.truncate(self.journal_path, offset)
+        self._journal.size = offset
+    
+    def reload(self):
+        """Перечитывает снимок и журнал, которые другой процесс свернул в новый снимок"""
+        next_id = self.next_id
+        self.load_data(fold=False)
+        self.next_id = max(self.next_id, next_id)
+        self._journal.reopen()
+        self.cache.invalidate()
+    
+    def open_journal(self):
+        """Включает журнальный режим и запускает фоновую компакцию"""
+        max_bytes = int(os.getenv("GLOSSARY_JOURNAL_MAX_BYTES", str(4 * 1024 * 1024)))
+        max_age = float(os.getenv("GLOSSARY_JOURNAL_MAX_AGE", "60"))
+        self._journal = Journal(self.journal_path, fsync=self.fsync)
+        self._compactor = JournalCompactor(self._journal, self.compact, max_bytes, max_age)
+        self._compactor.start()
+    
+    def start_flusher(self):
+        """Включает отложенную запись с групповой фиксацией"""
+        window = float(os.getenv("GLOSSARY_FLUSH_WINDOW_MS", "10")) / 1000
+        max_batch = int(os.getenv("GLOSSARY_FLUSH_MAX_BATCH", "100"))
+        self._flusher = WriteBehindFlusher(self.flush_batch, window, max_batch)
+        self._flusher.start()
+        atexit.register(self.close)
+    
+    def close(self):
+        """Дописывает отложенные мутации на диск"""
+        if self._flusher is not None:
+            self._flusher.close()
+            self._flusher = None
+    
+    def save_data(self):
+        """Сохраняет данные в JSON файл"""
+        with self._lock:
+            version = self._version
+            next_id = self.next_id
+        self.write_snapshot(list(version.terms.values()), next_id, durable=self.fsync)
+    
+    def write_snapshot(self, records: list, next_id: int, durable: bool = True):
+        """Атомарно заменяет снимок (terms.json или terms.snap): запись во временный файл и rename
+        
+        Счетчик ID пишется первым: он только растет, поэтому устаревший снимок
+        рядом с новым счетчиком безопасен, а наоборот - нет.
+        """
+        self.write_json(self.meta_path, {"next_id": next_id}, durable)
+        if self.binary_snapshot:
+            write_binary(binary_path(self.file_path), records, next_id, durable)
+        else:
+            self.write_json(self.file_path, records, durable, indent=2)
+    
+    def write_json(self, path: str, payload, durable: bool, indent: Optional[int] = None):
+        """Пишет JSON во временный файл и атомарно переименовывает его"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # default=dict: записи бинарного снимка сериализуются как словари
+            json.dump(payload, f, ensure_ascii=False, indent=indent, default=dict)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    def compact(self):
+        """Сворачивает журнал в снимок terms.json
+        
+        Под блокировкой только берется текущая версия и ротируется журнал:
+        версия неизменяема, поэтому сериализация и запись снимка идут без
+        блокировки мутаций и без копирования записей. В общем режиме снимок
+        пишется под межпроцессной блокировкой.
+        """
+        with self._compact_lock:
+            segment = self.journal_path + ".compacting"
+            with self.mutation():
+                if self._journal.size == 0:
+                    return
+                version = self._version
+                next_id = self.next_id
+                self._journal.rotate(segment)
+                if self._process_lock is not None:
+                    # Другие процессы ждут на блокировке, пока снимок не заменит журнал
+                    self.write_snapshot(list(version.terms.values()), next_id)
+                    os.remove(segment)
+                    return
+            self.write_snapshot(list(version.terms.values()), next_id)
+            os.remove(segment)
+    
+    def flush_batch(self, entries: List[Dict]):
+        """Записывает группу мутаций одной операцией"""
+        if self._journal is None:
+            self.save_data()
+            return
+        with self._lock:
+            self._journal.append(entries)
+        self._compactor.wake()
+    
+    def commit(self, entry: Dict) -> Optional[CommitTicket]:
+        """Фиксирует мутацию: сразу или через поток отложенной записи"""
+        return self.commit_many([entry])
+    
+    def commit_many(self, entries: List[Dict]) -> Optional[CommitTicket]:
+        """Фиксирует мутации пакета одной записью (одной группой отложенной записи)"""
+        if not entries:
+            return None
+        if self._flusher is not None:
+            return self._flusher.submit_many(entries)
+        self.flush_batch(entries)
+        return None
+    
+    def wait_commit(self, ticket: Optional[CommitTicket], wait: Optional[bool] = None):
+        """Ждет записи мутации на диск, если выбрана синхронная фиксация"""
+        if ticket is None:
+            return
+        if wait is None:
+            wait = self.sync_commit
+        if wait:
+            ticket.wait()
+    
+    def iter_candidates(self, version: Version, query_lower: str, reverse: bool = False):
+        """Термины версии, которые могут содержать запрос: по индексу триграмм или все"""
+        if version.trigrams is None:
+            candidates = None
+        else:
+            candidates = version.trigrams.candidates(query_lower)
+        if candidates is None:
+            return version.ordered.values_desc() if reverse else version.terms.values()
+        found = (version.terms.get(term_id) for term_id in sorted(candidates, reverse=reverse))
+        return [term_data for term_data in found if term_data is not None]
+    
+    def publish(self, term_id: int, term_data: Optional[Dict]):
+        """Публикует новую версию, где term_id заменен на term_data (None - удален)"""
+        self.publish_many([(term_id, term_data)])
+    
+    def publish_many(self, changes: List[Tuple[int, Optional[Dict]]]):
+        """Публикует одну новую версию со всеми изменениями (ID, запись или None)
+        
+        Вызывается под self._lock. Устаревшие ID остаются в общем индексе
+        триграмм; когда их становится больше четверти корпуса, новый индекс
+        строится в фоне (start_trigrams) и публикуется в одной из следующих
+        версий. До этого поиск идет по прежнему индексу.
+        """
+        version = self._version
+        terms = version.terms.clone()
+        ordered = version.ordered.clone()
+        trigrams = version.trigrams
+        for term_id, term_data in changes:
+            previous = terms.get(term_id)
+            if term_data is None:
+                terms.delete(term_id)
+                ordered.remove(term_id)
+            else:
+                terms.set(term_id, term_data)
+                ordered.put(term_id, term_data)
+            
+            if self._trigrams_pending is not None:
+                # Индекс строится в фоне: термин попадет в него при публикации индекса
+                self._trigrams_pending.add(term_id)
+            if trigrams is not None:
+                changed = (previous is None or term_data is None or
+                           search_texts(previous) != search_texts(term_data))
+                if previous is not None and changed:
+                    self._stale_postings += 1
+                if term_data is not None and changed:
+                    trigrams.add(term_id, search_texts(term_data))
+        
+        self._version = Version(terms=terms, ordered=ordered, trigrams=trigrams)
+        if self._trigrams_pending is None and self._stale_postings > max(1000, len(terms) // 4):
+            self.start_trigrams(terms)
+        self.cache.invalidate()
+    
+    def get_next_id(self) -> int:
+        """Выделяет следующий ID из монотонного счетчика"""
+        with self._lock:
+            term_id = self.next_id
+            self.next_id += 1
+            return term_id
+    
+    def create_term(self, term: str, definition: str, category: Optional[str] = None,
+                    related_terms: Optional[List[str]] = None, wait: Optional[bool] = None) -> Dict:
+        """Создает новый термина"""
+        with self.mutation():
+            term_id = self.get_next_id()
+            
+            term_dict = {
+                "id": term_id,
+                "term": term,
+                "definition": definition,
+                "category": category,
+                "related_terms": related_terms or []
+            }
+            
+            record = TermRecord.pack(term_dict, self.strings)
+            self.publish(term_id, record)
+            ticket = self.commit({"op": "put", "term": term_dict})
+        self.wait_commit(ticket, wait)
+        
+        return record
+    
+    def get_term(self, term_id: int) -> Optional[Dict]:
+        """Получает термина по ID"""
+        self.refresh()
+        return self.terms.get(term_id)
+    
+    def get_all_terms(self, page: int = 1, per_page: int = 10, search: str = "",
+                      after_id: Optional[int] = None) -> Dict:
+        """Получает все термины с пагинацией и поиском"""
+        self.refresh()
+        key = ("list", search or "", page, per_page, after_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        # Поколение берется до версии: результат новой версии под старым
+        # поколением будет отброшен кэшем, а не наоборот
+        generation = self.cache.generation
+        version = self._version
+        start = (page - 1) * per_page if after_id is None else 0
+        
+        # На одну запись больше страницы: есть ли следующая страница
+        if search:
+            search_lower = search.lower()
+            # Кандидаты в порядке убывания ID (новые термины сверху)
+            terms = [
+                term_data for term_data in self.iter_candidates(version, search_lower, reverse=True)
+                if (search_lower in term_data["term"].lower() or
+                    search_lower in term_data["definition"].lower())
+            ]
+            total = len(terms)
+            if after_id is not None:
+                terms = [term_data for term_data in terms if term_data["id"] < after_id]
+            window = terms[start:start + per_page + 1]
+        else:
+            total = len(version.ordered)
+            if after_id is None:
+                window = version.ordered.page_desc(start, per_page + 1)
+            else:
+                window = version.ordered.page_before(after_id, per_page + 1)
+        paginated_terms = window[:per_page]
+        
+        result = {
+            "terms": paginated_terms,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "next_after_id": paginated_terms[-1]["id"] if len(window) > per_page else None
+        }
+        self.cache.put(key, generation, result, len(paginated_terms) + 1)
+        return result
+    
+    def update_term(self, term_id: int, changes: Dict, wait: Optional[bool] = None) -> Optional[Dict]:
+        """Обновляет термина"""
+        with self.mutation():
+            existing_term = self.terms.get(term_id)
+            if existing_term is None:
+                return None
+            
+            # Записи неизменяемы: читатели старой версии видят прежнюю запись
+            updated_term = dict(existing_term)
+            updated_term.update(changes)
+            record = TermRecord.pack(updated_term, self.strings)
+            self.publish(term_id, record)
+            ticket = self.commit({"op": "put", "term": updated_term})
+        self.wait_commit(ticket, wait)
+        return record
+    
+    def delete_term(self, term_id: int, wait: Optional[bool] = None) -> bool:
+        """Удаляет термина"""
+        with self.mutation():
+            if term_id not in self.terms:
+                return False
+            self.publish(term_id, None)
+            ticket = self.commit({"op": "delete", "id": term_id})
+        self.wait_commit(ticket, wait)
+        return True
+    
+    def get_terms(self, term_ids: List[int]) -> List[Optional[Dict]]:
+        """Термины по списку ID из одной версии данных"""
+        self.refresh()
+        terms = self._version.terms
+        return [terms.get(term_id) for term_id in term_ids]
+    
+    def create_terms(self, items: List[Dict], wait: Optional[bool] = None) -> List[Dict]:
+        """Создает пакет терминов: одна новая версия и одна запись на диск"""
+        with self.mutation():
+            records, entries = [], []
+            for item in items:
+                term_dict = {
+                    "id": self.get_next_id(),
+                    "term": item["term"],
+                    "definition": item["definition"],
+                    "category": item.get("category"),
+                    "related_terms": item.get("related_terms") or []
+                }
+                records.append(TermRecord.pack(term_dict, self.strings))
+                entries.append({"op": "put", "term": term_dict})
+            if records:
+                self.publish_many([(record["id"], record) for record in records])
+            ticket = self.commit_many(entries)
+        self.wait_commit(ticket, wait)
+        return records
+    
+    def delete_terms(self, term_ids: List[int], wait: Optional[bool] = None) -> List[bool]:
+        """Удаляет пакет терминов: одна новая версия и одна запись на диск"""
+        with self.mutation():
+            terms = self.terms
+            removed, seen, deleted = [], set(), []
+            for term_id in term_ids:
+                # Повтор ID в пакете удаляет термин только один раз
+                ok = term_id in terms and term_id not in seen
+                if ok:
+                    removed.append(term_id)
+                    seen.add(term_id)
+                deleted.append(ok)
+            if removed:
+                self.publish_many([(term_id, None) for term_id in removed])
+            ticket = self.commit_many([{"op": "delete", "id": term_id} for term_id in removed])
+        self.wait_commit(ticket, wait)
+        return deleted
+    
+    def iter_terms(self, batch: int = 1000) -> Iterator[List[Dict]]:
+        """Обходит версию на момент вызова: она неизменяема, блокировка не нужна"""
+        self.refresh()
+        chunk = []
+        for term_data in self._version.ordered.values_asc():
+            if isinstance(term_data, SnapshotRecord):
+                # Не оставляем декодированные записи в памяти ради выгрузки
+                term_data = term_data.decode()
+            chunk.append(term_data)
+            if len(chunk) >= batch:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def search_terms(self, query: str) -> List[Dict]:
+        """Поиск терминов по запросу"""
+        self.refresh()
+        key = ("search", query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        generation = self.cache.generation
+        version = self._version
+        results = []
+        query_lower = query.lower()
+        
+        for term_data in self.iter_candidates(version, query_lower):
+            if (query_lower in term_data["term"].lower() or 
+                query_lower in term_data["definition"].lower() or
+                (term_data.get("category") and query_lower in term_data.get("category", "").lower())):
+                results.append(term_data)
+        
+        self.cache.put(key, generation, results, len(results) + 1)
+        return results
@@ -0,0 +1,24 @@
+import fcntl
+
+
+class ProcessLock:
+    """Межпроцессная блокировка на файле (flock) для воркеров с общим data/
+
+    flock принадлежит открытому файлу, а не потоку: потоки одного процесса
+    прошли бы ее одновременно, поэтому их сериализует вызывающий код.
+    Блокировка снимается ОС, если процесс завершился, не отпустив ее.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'ab')
+
+    def __enter__(self):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class QueryCache:
+    """LRU-кэш результатов списка и поиска с инвалидацией по поколению данных
+
+    Любая мутация увеличивает generation и сбрасывает кэш. Результат,
+    посчитанный по данным старого поколения, в кэш не попадает, даже если
+    мутация произошла во время вычисления. Память ограничена числом
+    записей и суммарным числом терминов во всех закэшированных результатах.
+    """
+
+    def __init__(self, max_entries: int = 256, max_items: int = 100_000):
+        self.max_entries = max_entries
+        self.max_items = max_items
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._items = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != self.generation:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, generation: int, value: Any, weight: int):
+        """Сохраняет результат, посчитанный по данным поколения generation"""
+        if self.max_entries <= 0 or weight > self.max_items:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._items -= previous[2]
+            self._entries[key] = (generation, value, weight)
+            self._items += weight
+            while len(self._entries) > self.max_entries or self._items > self.max_items:
+                _, (_, _, evicted_weight) = self._entries.popitem(last=False)
+                self._items -= evicted_weight
+                self.evictions += 1
+
+    def invalidate(self):
+        """Новое поколение данных: все закэшированные результаты устарели"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._items = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "items": self._items,
+                "generation": self.generation,
+            }
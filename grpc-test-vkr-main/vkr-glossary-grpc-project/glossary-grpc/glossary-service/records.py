@@ -0,0 +1,105 @@
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FIELDS = ("id", "term", "definition", "category", "related_terms")
+FIELD_SET = frozenset(FIELDS)
+
+
+class StringTable:
+    """Таблица повторяющихся строк: категорий и названий связанных терминов
+
+    Одинаковые строки хранятся одним объектом, а названия связанных терминов
+    получают целочисленные ссылки - номера в таблице. Объект числа для
+    каждого номера тоже один (он хранится в self._refs). Таблица только
+    растет: записи старых версий могут ссылаться на любой номер.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def ref(self, value: str) -> int:
+        """Номер строки в таблице (добавляет строку, если ее еще нет)"""
+        ref = self._refs.get(value)
+        if ref is None:
+            with self._lock:
+                ref = self._refs.get(value)
+                if ref is None:
+                    ref = len(self.names)
+                    # Сначала строка, потом номер: читатель не увидит номер без строки
+                    self.names.append(value)
+                    self._refs[value] = ref
+        return ref
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """Общий объект строки из таблицы"""
+        if value is None:
+            return None
+        return self.names[self.ref(value)]
+
+    def refs(self, values: Optional[Iterable[str]]) -> Tuple[int, ...]:
+        if not values:
+            return ()
+        return tuple(self.ref(value) for value in values)
+
+
+class TermRecord(Mapping):
+    """Компактная запись термина с интерфейсом словаря только для чтения
+
+    Вместо словаря и отдельного списка связанных терминов хранит поля в
+    __slots__: категория - общая строка из StringTable, связанные термины -
+    кортеж номеров в ней. Список related_terms собирается при обращении и
+    каждый раз новый, поэтому его изменение не затрагивает запись.
+    """
+
+    __slots__ = ("id", "term", "definition", "category", "_related", "_table")
+
+    def __init__(self, term_id: int, term: str, definition: str, category: Optional[str],
+                 related: Tuple[int, ...], table: StringTable):
+        self.id = term_id
+        self.term = term
+        self.definition = definition
+        self.category = category
+        self._related = related
+        self._table = table
+
+    @classmethod
+    def pack(cls, term_data, table: StringTable) -> "TermRecord":
+        """Запись из словаря (или любой записи с интерфейсом словаря)"""
+        return cls(
+            term_data["id"],
+            term_data["term"],
+            term_data["definition"],
+            table.intern(term_data.get("category")),
+            table.refs(term_data.get("related_terms")),
+            table,
+        )
+
+    @property
+    def related_terms(self) -> List[str]:
+        names = self._table.names
+        return [names[ref] for ref in self._related]
+
+    def __getitem__(self, key):
+        if key in FIELD_SET:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in FIELD_SET:
+            return getattr(self, key)
+        return default
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
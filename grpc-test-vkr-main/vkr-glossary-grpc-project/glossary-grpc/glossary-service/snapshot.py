@@ -0,0 +1,167 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from records import StringTable, TermRecord
+
+MAGIC = b"GLSNAP01"
+BYTE_ORDER_MARK = 0x01020304
+# magic, метка порядка байт, резерв, число записей, следующий ID
+HEADER = struct.Struct("=8sIIQQ")
+
+
+def binary_path(json_path: str) -> str:
+    """Путь бинарного снимка рядом с terms.json (terms.snap)"""
+    return os.path.splitext(json_path)[0] + ".snap"
+
+
+def encode_record(term_data) -> bytes:
+    """Запись в куче строк: компактный JSON в UTF-8"""
+    if isinstance(term_data, SnapshotRecord):
+        return term_data.raw()
+    if not isinstance(term_data, dict):
+        term_data = dict(term_data)
+    return json.dumps(term_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_binary(path: str, records: Iterable, next_id: int, durable: bool = True):
+    """Пишет бинарный снимок во временный файл и атомарно переименовывает его
+
+    Формат: заголовок, таблица ID (int64, по возрастанию), таблица смещений
+    (uint64, count + 1 штук) и куча строк с записями. Записи, прочитанные
+    из прежнего снимка и не измененные, копируются байтами без декодирования.
+    """
+    records = sorted(records, key=lambda term_data: term_data["id"])
+    ids = array("q", (term_data["id"] for term_data in records))
+    offsets = array("Q", [0])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, BYTE_ORDER_MARK, 0, len(records), next_id))
+        f.write(ids.tobytes())
+        heap_start = f.tell() + (len(records) + 1) * offsets.itemsize
+        f.seek(heap_start)
+        for term_data in records:
+            blob = encode_record(term_data)
+            f.write(blob)
+            offsets.append(offsets[-1] + len(blob))
+        f.seek(HEADER.size + ids.itemsize * len(ids))
+        f.write(offsets.tobytes())
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Бинарный снимок, открытый через mmap
+
+    Таблицы ID и смещений читаются из отображения без копирования
+    (memoryview.cast), записи декодируются только при обращении к ним.
+    Страницы файла подгружаются ОС по мере чтения, поэтому старт и RSS
+    не зависят от объема кучи строк.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, mark, _, count, next_id = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: не бинарный снимок глоссария")
+        if mark != BYTE_ORDER_MARK:
+            raise ValueError(f"{path}: снимок записан с другим порядком байт ({sys.byteorder} здесь)")
+        view = memoryview(self._mmap)
+        ids_start = HEADER.size
+        offsets_start = ids_start + 8 * count
+        self._heap_start = offsets_start + 8 * (count + 1)
+        self.ids = view[ids_start:offsets_start].cast("q")
+        self._offsets = view[offsets_start:self._heap_start].cast("Q")
+        self.next_id = next_id
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def raw(self, index: int) -> bytes:
+        start = self._heap_start + self._offsets[index]
+        end = self._heap_start + self._offsets[index + 1]
+        return self._mmap[start:end]
+
+    def decode(self, index: int) -> Dict:
+        return json.loads(self.raw(index))
+
+    def records(self, table: Optional[StringTable] = None) -> List["SnapshotRecord"]:
+        return [SnapshotRecord(self, index, table) for index in range(len(self.ids))]
+
+
+class SnapshotRecord(Mapping):
+    """Запись снимка с интерфейсом словаря, декодируемая при первом обращении
+
+    ID берется из таблицы без декодирования. С таблицей строк декодированная
+    запись один раз упаковывается в компактный TermRecord и остается в
+    записи: полный просмотр не возвращает RSS к уровню словарей json.load.
+    Без таблицы словарь декодируется на каждое обращение и не хранится.
+    """
+
+    __slots__ = ("_snapshot", "_index", "_table", "_data")
+
+    def __init__(self, snapshot: Snapshot, index: int, table: Optional[StringTable] = None):
+        self._snapshot = snapshot
+        self._index = index
+        self._table = table
+        self._data = None
+
+    def _decoded(self):
+        data = self._data
+        if data is None:
+            data = self._snapshot.decode(self._index)
+            if self._table is not None:
+                data = self._data = TermRecord.pack(data, self._table)
+        return data
+
+    def __getitem__(self, key):
+        if key == "id":
+            return self._snapshot.ids[self._index]
+        return self._decoded()[key]
+
+    def get(self, key, default=None):
+        return self._decoded().get(key, default)
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __len__(self) -> int:
+        return len(self._decoded())
+
+    def __repr__(self) -> str:
+        return repr(self._decoded())
+
+    def decode(self):
+        """Запись без сохранения в кэше: упакованная, если уже есть, иначе новый словарь"""
+        return self._data if self._data is not None else self._snapshot.decode(self._index)
+
+    def raw(self) -> bytes:
+        return self._snapshot.raw(self._index)
+
+
+def open_records(json_path: str, table: Optional[StringTable] = None) -> Tuple[Sequence[int], List, int]:
+    """ID, записи и счетчик ID из более свежего из terms.snap и terms.json
+
+    Бинарный снимок отдает ленивые записи SnapshotRecord (с table они
+    упаковываются в TermRecord при первом обращении), JSON - словари.
+    Если файлов нет, возвращает пустые списки.
+    """
+    snap_path = binary_path(json_path)
+    if os.path.exists(snap_path) and (
+            not os.path.exists(json_path) or os.path.getmtime(snap_path) >= os.path.getmtime(json_path)):
+        snapshot = Snapshot(snap_path)
+        return snapshot.ids, snapshot.records(table), snapshot.next_id
+    if os.path.exists(json_path):
+        with open(json_path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        return [term["id"] for term in records], records, 0
+    return [], [], 0
@@ -0,0 +1,392 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from journal import read_journal
+from query_cache import QueryCache
+from snapshot import open_records
+from storage import Storage
+
+COLUMNS = "id, term, definition, category, related_terms"
+UPDATABLE = ("term", "definition", "category", "related_terms")
+# Диапазон INTEGER в SQLite; ID вне него sqlite3 не передаст в запрос (OverflowError)
+MIN_ID, MAX_ID = -2 ** 63, 2 ** 63 - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    term TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    category TEXT,
+    related_terms TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS term_count (total INTEGER NOT NULL);
+INSERT INTO term_count (total) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM term_count);
+CREATE TABLE IF NOT EXISTS data_version (value INTEGER NOT NULL);
+INSERT INTO data_version (value) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM data_version);
+CREATE VIRTUAL TABLE IF NOT EXISTS terms_fts USING fts5(
+    term, definition, category, content='terms', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS terms_ai AFTER INSERT ON terms BEGIN
+    INSERT INTO terms_fts (rowid, term, definition, category)
+        VALUES (new.id, new.term, new.definition, new.category);
+    UPDATE term_count SET total = total + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS terms_ad AFTER DELETE ON terms BEGIN
+    INSERT INTO terms_fts (terms_fts, rowid, term, definition, category)
+        VALUES ('delete', old.id, old.term, old.definition, old.category);
+    UPDATE term_count SET total = total - 1;
+END;
+CREATE TRIGGER IF NOT EXISTS terms_au AFTER UPDATE ON terms BEGIN
+    INSERT INTO terms_fts (terms_fts, rowid, term, definition, category)
+        VALUES ('delete', old.id, old.term, old.definition, old.category);
+    INSERT INTO terms_fts (rowid, term, definition, category)
+        VALUES (new.id, new.term, new.definition, new.category);
+END;
+CREATE TRIGGER IF NOT EXISTS terms_version_ai AFTER INSERT ON terms BEGIN
+    UPDATE data_version SET value = value + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS terms_version_ad AFTER DELETE ON terms BEGIN
+    UPDATE data_version SET value = value + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS terms_version_au AFTER UPDATE ON terms BEGIN
+    UPDATE data_version SET value = value + 1;
+END;
+"""
+
+
+def row_to_term(row) -> Dict:
+    return {
+        "id": row[0],
+        "term": row[1],
+        "definition": row[2],
+        "category": row[3],
+        "related_terms": json.loads(row[4]),
+    }
+
+
+def valid_id(term_id: int) -> bool:
+    """ID помещается в INTEGER SQLite; термина с другим ID быть не может"""
+    return MIN_ID <= term_id <= MAX_ID
+
+
+def fts_phrase(query: str) -> str:
+    """Запрос как фраза FTS5: с токенизатором trigram это поиск подстроки"""
+    return '"' + query.replace('"', '""') + '"'
+
+
+class SqliteStorage(Storage):
+    """Хранилище на SQLite в режиме WAL
+
+    Поиск по ID идет по первичному ключу, страница списка - по нему же
+    в обратном порядке, число терминов поддерживается триггерами в
+    term_count. Поиск подстроки сужается полнотекстовым индексом FTS5 с
+    токенизатором trigram, а окончательная проверка делается тем же
+    сравнением через str.lower(), что и в JSON хранилище. Запросы короче
+    трех символов индекс не сужает, для них нужен полный просмотр.
+
+    У каждого потока свое соединение: в WAL читатели не ждут писателя.
+    Записи в процессе идут по одной под self._write_lock в транзакции
+    BEGIN IMMEDIATE; соединения других процессов ждут до busy_timeout.
+    Транзакция фиксируется до ответа, поэтому wait не влияет на запись;
+    GLOSSARY_FSYNC=1 включает synchronous=FULL (по умолчанию NORMAL).
+    Кэш результатов сбрасывается записями этого процесса; в общем режиме
+    (GLOSSARY_SHARED=1, несколько воркеров на одной базе) перед чтением еще
+    сверяется счетчик изменений data_version, который ведут триггеры.
+
+    При первом запуске база заполняется из seed_path (terms.json вместе
+    с журналом и счетчиком ID), дальше JSON файл не используется.
+    """
+
+    def __init__(self, file_path: str = "data/terms.db", seed_path: Optional[str] = None):
+        self.file_path = file_path
+        self.synchronous = "FULL" if os.getenv("GLOSSARY_FSYNC", "0") == "1" else "NORMAL"
+        self.busy_timeout = float(os.getenv("GLOSSARY_SQLITE_BUSY_TIMEOUT", "5"))
+        self.shared = os.getenv("GLOSSARY_SHARED", "0") == "1"
+        self._data_version = None
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.cache = QueryCache(
+            max_entries=int(os.getenv("GLOSSARY_CACHE_SIZE", "256")),
+            max_items=int(os.getenv("GLOSSARY_CACHE_MAX_ITEMS", "100000")),
+        )
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        if seed_path is not None:
+            self.seed(seed_path)
+
+    def connection(self) -> sqlite3.Connection:
+        """Соединение текущего потока (создается при первом обращении)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Автокоммит: транзакции открываются явно в transaction()
+            conn = sqlite3.connect(self.file_path, timeout=self.busy_timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Пишущая транзакция; после фиксации сбрасывает кэш результатов"""
+        with self._write_lock:
+            conn = self.connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self.cache.invalidate()
+
+    def seed(self, seed_path: str):
+        """Переносит данные из JSON хранилища, если в базе еще не было терминов
+
+        Проверка и вставка идут в одной пишущей транзакции, поэтому из
+        нескольких одновременно стартующих процессов заполняет базу один.
+        """
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM sqlite_sequence WHERE name = 'terms'").fetchone():
+                return
+            ids, records, snapshot_next_id = open_records(seed_path)
+            terms = dict(zip(ids, records))
+            journal_path = os.path.splitext(seed_path)[0] + ".journal"
+            for path in (journal_path + ".compacting", journal_path):
+                for entry in read_journal(path):
+                    if entry["op"] == "put":
+                        terms[entry["term"]["id"]] = entry["term"]
+                    elif entry["op"] == "delete":
+                        terms.pop(entry["id"], None)
+            next_id = max(max(terms, default=0) + 1, snapshot_next_id)
+            meta_path = os.path.splitext(seed_path)[0] + ".meta.json"
+            if os.path.exists(meta_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    next_id = max(next_id, json.load(f).get("next_id", 1))
+
+            conn.executemany(
+                f"INSERT INTO terms ({COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                [(term_id, t["term"], t["definition"], t.get("category"),
+                  json.dumps(t.get("related_terms") or [], ensure_ascii=False))
+                 for term_id, t in sorted(terms.items(), key=lambda item: item[0])],
+            )
+            # Счетчик ID не должен выдать ID, уже занятый удаленным термином
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'terms'")
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('terms', ?)", (next_id - 1,))
+
+    def refresh(self):
+        """В общем режиме сбрасывает кэш, если базу изменил другой процесс"""
+        if not self.shared:
+            return
+        version = self.connection().execute("SELECT value FROM data_version").fetchone()[0]
+        if version != self._data_version:
+            self._data_version = version
+            self.cache.invalidate()
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def candidates(self, query_lower: str, order: str) -> List[Dict]:
+        """Термины, которые могут содержать запрос: по FTS5 или все"""
+        conn = self.connection()
+        if len(query_lower) < 3:
+            rows = conn.execute(f"SELECT {COLUMNS} FROM terms ORDER BY id {order}")
+        else:
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM terms WHERE id IN "
+                f"(SELECT rowid FROM terms_fts WHERE terms_fts MATCH ?) ORDER BY id {order}",
+                (fts_phrase(query_lower),),
+            )
+        return [row_to_term(row) for row in rows]
+
+    def get_term(self, term_id: int) -> Optional[Dict]:
+        if not valid_id(term_id):
+            return None
+        row = self.connection().execute(
+            f"SELECT {COLUMNS} FROM terms WHERE id = ?", (term_id,)
+        ).fetchone()
+        return row_to_term(row) if row else None
+
+    def get_all_terms(self, page: int = 1, per_page: int = 10, search: str = "",
+                      after_id: Optional[int] = None) -> Dict:
+        self.refresh()
+        key = ("list", search or "", page, per_page, after_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        generation = self.cache.generation
+        start = (page - 1) * per_page if after_id is None else 0
+
+        # На одну запись больше страницы: есть ли следующая страница
+        if search:
+            search_lower = search.lower()
+            terms = [
+                term_data for term_data in self.candidates(search_lower, "DESC")
+                if (search_lower in term_data["term"].lower() or
+                    search_lower in term_data["definition"].lower())
+            ]
+            total = len(terms)
+            if after_id is not None:
+                terms = [term_data for term_data in terms if term_data["id"] < after_id]
+            window = terms[start:start + per_page + 1]
+        else:
+            conn = self.connection()
+            # Одна транзакция чтения: число и страница из одного снимка
+            conn.execute("BEGIN")
+            try:
+                total = conn.execute("SELECT total FROM term_count").fetchone()[0]
+                if after_id is None:
+                    rows = conn.execute(
+                        f"SELECT {COLUMNS} FROM terms ORDER BY id DESC LIMIT ? OFFSET ?",
+                        (per_page + 1, start),
+                    ).fetchall()
+                else:
+                    # Курсор: спуск по первичному ключу, без пропуска OFFSET строк
+                    rows = conn.execute(
+                        f"SELECT {COLUMNS} FROM terms WHERE id < ? ORDER BY id DESC LIMIT ?",
+                        (after_id, per_page + 1),
+                    ).fetchall()
+            finally:
+                conn.execute("COMMIT")
+            window = [row_to_term(row) for row in rows]
+        paginated_terms = window[:per_page]
+
+        result = {
+            "terms": paginated_terms,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "next_after_id": paginated_terms[-1]["id"] if len(window) > per_page else None
+        }
+        self.cache.put(key, generation, result, len(paginated_terms) + 1)
+        return result
+
+    def iter_terms(self, batch: int = 1000) -> Iterator[List[Dict]]:
+        """Обход в одной транзакции чтения на отдельном соединении
+
+        Пачки читаются по ключу (id > последнего), а транзакция держит снимок
+        WAL до конца обхода. Соединение свое, потому что пачки могут читаться
+        из разных потоков, а соединения потоков заняты другими запросами.
+        """
+        conn = sqlite3.connect(self.file_path, timeout=self.busy_timeout,
+                               isolation_level=None, check_same_thread=False)
+        try:
+            conn.execute("BEGIN")
+            last_id = 0
+            while True:
+                rows = conn.execute(
+                    f"SELECT {COLUMNS} FROM terms WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch)
+                ).fetchall()
+                if not rows:
+                    return
+                last_id = rows[-1][0]
+                yield [row_to_term(row) for row in rows]
+        finally:
+            conn.close()
+
+    def search_terms(self, query: str) -> List[Dict]:
+        self.refresh()
+        key = ("search", query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        generation = self.cache.generation
+        query_lower = query.lower()
+        results = [
+            term_data for term_data in self.candidates(query_lower, "ASC")
+            if (query_lower in term_data["term"].lower() or
+                query_lower in term_data["definition"].lower() or
+                (term_data.get("category") and query_lower in term_data["category"].lower()))
+        ]
+        self.cache.put(key, generation, results, len(results) + 1)
+        return results
+
+    def create_term(self, term: str, definition: str, category: Optional[str] = None,
+                    related_terms: Optional[List[str]] = None, wait: Optional[bool] = None) -> Dict:
+        related_terms = related_terms or []
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO terms (term, definition, category, related_terms) VALUES (?, ?, ?, ?)",
+                (term, definition, category, json.dumps(related_terms, ensure_ascii=False)),
+            )
+            term_id = cursor.lastrowid
+        return {
+            "id": term_id,
+            "term": term,
+            "definition": definition,
+            "category": category,
+            "related_terms": related_terms
+        }
+
+    def update_term(self, term_id: int, changes: Dict, wait: Optional[bool] = None) -> Optional[Dict]:
+        if not valid_id(term_id):
+            return None
+        changes = {field: value for field, value in changes.items() if field in UPDATABLE}
+        with self.transaction() as conn:
+            if changes:
+                values = [
+                    json.dumps(value or [], ensure_ascii=False) if field == "related_terms" else value
+                    for field, value in changes.items()
+                ]
+                assignments = ", ".join(f"{field} = ?" for field in changes)
+                conn.execute(f"UPDATE terms SET {assignments} WHERE id = ?", (*values, term_id))
+            row = conn.execute(f"SELECT {COLUMNS} FROM terms WHERE id = ?", (term_id,)).fetchone()
+        return row_to_term(row) if row else None
+
+    def delete_term(self, term_id: int, wait: Optional[bool] = None) -> bool:
+        if not valid_id(term_id):
+            return False
+        with self.transaction() as conn:
+            cursor = conn.execute("DELETE FROM terms WHERE id = ?", (term_id,))
+        return cursor.rowcount > 0
+
+    def get_terms(self, term_ids: List[int]) -> List[Optional[Dict]]:
+        conn = self.connection()
+        found = {}
+        unique = [term_id for term_id in dict.fromkeys(term_ids) if valid_id(term_id)]
+        # Кусками: число параметров запроса SQLite ограничено
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM terms WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            for row in rows:
+                found[row[0]] = row_to_term(row)
+        return [found.get(term_id) for term_id in term_ids]
+
+    def create_terms(self, items: List[Dict], wait: Optional[bool] = None) -> List[Dict]:
+        created = []
+        with self.transaction() as conn:
+            for item in items:
+                related_terms = item.get("related_terms") or []
+                cursor = conn.execute(
+                    "INSERT INTO terms (term, definition, category, related_terms) VALUES (?, ?, ?, ?)",
+                    (item["term"], item["definition"], item.get("category"),
+                     json.dumps(related_terms, ensure_ascii=False)),
+                )
+                created.append({
+                    "id": cursor.lastrowid,
+                    "term": item["term"],
+                    "definition": item["definition"],
+                    "category": item.get("category"),
+                    "related_terms": related_terms
+                })
+        return created
+
+    def delete_terms(self, term_ids: List[int], wait: Optional[bool] = None) -> List[bool]:
+        with self.transaction() as conn:
+            return [valid_id(term_id) and conn.execute("DELETE FROM terms WHERE id = ?", (term_id,)).rowcount > 0
+                    for term_id in term_ids]
@@ -0,0 +1,197 @@
+import asyncio
+import functools
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from query_cache import QueryCache
+
+
+class Storage(ABC):
+    """Интерфейс хранилища терминов, общий для REST и gRPC сервисов
+
+    Записи - словари {"id", "term", "definition", "category", "related_terms"};
+    возвращенные записи нельзя изменять. Мутации принимают wait: None - режим
+    фиксации по умолчанию, True - ответить после записи на диск, False - сразу.
+    Результаты списка и поиска кэшируются в self.cache. inline_reads - чтения
+    идут только по памяти и не ждут диска или блокировок. stable_records -
+    пока термин не изменен, чтения отдают один и тот же объект записи (на
+    этом держится кэш JSON-фрагментов REST сервиса).
+    """
+
+    cache: QueryCache
+    inline_reads: bool = False
+    stable_records: bool = False
+
+    @abstractmethod
+    def get_term(self, term_id: int) -> Optional[Dict]:
+        """Термин по ID или None"""
+
+    @abstractmethod
+    def get_all_terms(self, page: int = 1, per_page: int = 10, search: str = "",
+                      after_id: Optional[int] = None) -> Dict:
+        """Страница терминов по убыванию ID: {"terms", "total", "page", "per_page", "next_after_id"}
+
+        search фильтрует по вхождению подстроки в term или definition
+        без учета регистра. after_id - курсор: страница начинается с
+        термина с ID меньше after_id, page при этом не учитывается.
+        next_after_id - курсор следующей страницы или None, если она пуста.
+        """
+
+    @abstractmethod
+    def search_terms(self, query: str) -> List[Dict]:
+        """Термины по возрастанию ID, где query входит в term, definition или category"""
+
+    @abstractmethod
+    def create_term(self, term: str, definition: str, category: Optional[str] = None,
+                    related_terms: Optional[List[str]] = None, wait: Optional[bool] = None) -> Dict:
+        """Создает термин с новым ID из монотонного счетчика"""
+
+    @abstractmethod
+    def update_term(self, term_id: int, changes: Dict, wait: Optional[bool] = None) -> Optional[Dict]:
+        """Заменяет переданные поля термина; None, если термина нет"""
+
+    @abstractmethod
+    def delete_term(self, term_id: int, wait: Optional[bool] = None) -> bool:
+        """Удаляет термин; False, если его не было"""
+
+    @abstractmethod
+    def get_terms(self, term_ids: List[int]) -> List[Optional[Dict]]:
+        """Термины по списку ID в том же порядке; None на месте отсутствующих"""
+
+    @abstractmethod
+    def create_terms(self, items: List[Dict], wait: Optional[bool] = None) -> List[Dict]:
+        """Создает термины из словарей {"term", "definition", "category", "related_terms"}
+
+        Все термины создаются в одной транзакции и фиксируются одной записью
+        на диск; читатели видят либо ни одного, либо все.
+        """
+
+    @abstractmethod
+    def delete_terms(self, term_ids: List[int], wait: Optional[bool] = None) -> List[bool]:
+        """Удаляет термины одной транзакцией; для каждого ID - был ли он удален"""
+
+    @abstractmethod
+    def iter_terms(self, batch: int = 1000) -> Iterator[List[Dict]]:
+        """Все термины по возрастанию ID пачками по batch записей
+
+        Обход идет по одному снимку данных (изменения во время обхода в него
+        не попадают) и читает записи лениво: память не зависит от размера
+        глоссария.
+        """
+
+    def refresh(self):
+        """Подхватывает мутации других процессов (общий режим)"""
+
+    def generation(self) -> int:
+        """Поколение данных: растет после каждой мутации, в том числе чужой
+
+        Берется до чтения: данные, прочитанные после, не старее поколения.
+        """
+        self.refresh()
+        return self.cache.generation
+
+    def close(self):
+        """Дописывает отложенные изменения и освобождает ресурсы"""
+
+
+class AsyncStorage:
+    """Асинхронный интерфейс хранилища для приложений на asyncio
+
+    Мутации выполняются в отдельном пуле из GLOSSARY_WRITE_THREADS потоков:
+    запись файла, fsync и ожидание групповой фиксации не останавливают цикл
+    событий. Чтения хранилища с inline_reads выполняются прямо в цикле
+    событий, остальные (SQLite, общий режим) - в пуле потоков по умолчанию.
+    """
+
+    def __init__(self, storage: Storage, write_threads: Optional[int] = None):
+        if write_threads is None:
+            write_threads = int(os.getenv("GLOSSARY_WRITE_THREADS", "4"))
+        self.storage = storage
+        self._writer = ThreadPoolExecutor(write_threads, thread_name_prefix="storage-writer")
+
+    @property
+    def cache(self) -> QueryCache:
+        return self.storage.cache
+
+    async def _read(self, func, *args, **kwargs):
+        if self.storage.inline_reads:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def _write(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, functools.partial(func, *args, **kwargs))
+
+    async def get_term(self, term_id: int) -> Optional[Dict]:
+        return await self._read(self.storage.get_term, term_id)
+
+    async def get_all_terms(self, page: int = 1, per_page: int = 10, search: str = "",
+                            after_id: Optional[int] = None) -> Dict:
+        return await self._read(self.storage.get_all_terms, page=page, per_page=per_page, search=search,
+                                after_id=after_id)
+
+    async def search_terms(self, query: str) -> List[Dict]:
+        return await self._read(self.storage.search_terms, query)
+
+    async def generation(self) -> int:
+        return await self._read(self.storage.generation)
+
+    async def create_term(self, term: str, definition: str, category: Optional[str] = None,
+                          related_terms: Optional[List[str]] = None, wait: Optional[bool] = None) -> Dict:
+        return await self._write(self.storage.create_term, term, definition, category, related_terms, wait=wait)
+
+    async def update_term(self, term_id: int, changes: Dict, wait: Optional[bool] = None) -> Optional[Dict]:
+        return await self._write(self.storage.update_term, term_id, changes, wait=wait)
+
+    async def delete_term(self, term_id: int, wait: Optional[bool] = None) -> bool:
+        return await self._write(self.storage.delete_term, term_id, wait=wait)
+
+    async def get_terms(self, term_ids: List[int]) -> List[Optional[Dict]]:
+        return await self._read(self.storage.get_terms, term_ids)
+
+    async def create_terms(self, items: List[Dict], wait: Optional[bool] = None) -> List[Dict]:
+        return await self._write(self.storage.create_terms, items, wait=wait)
+
+    async def delete_terms(self, term_ids: List[int], wait: Optional[bool] = None) -> List[bool]:
+        return await self._write(self.storage.delete_terms, term_ids, wait=wait)
+
+    async def iter_terms(self, batch: int = 1000) -> AsyncIterator[List[Dict]]:
+        """Пачки терминов iter_terms; каждая читается отдельным вызовом _read"""
+        iterator = self.storage.iter_terms(batch)
+        try:
+            while True:
+                chunk = await self._read(next, iterator, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            try:
+                iterator.close()
+            except ValueError:
+                # Обход отменен во время чтения пачки: генератор закроется сборщиком мусора
+                pass
+
+    def close(self):
+        """Дожидается начатых мутаций и закрывает хранилище"""
+        self._writer.shutdown(wait=True)
+        self.storage.close()
+
+
+def open_storage(file_path: str = "data/terms.json", backend: Optional[str] = None) -> Storage:
+    """Создает хранилище, выбранное GLOSSARY_STORAGE (json или sqlite)
+
+    SQLite база лежит рядом с JSON файлом (data/terms.db) и при первом
+    запуске заполняется из него.
+    """
+    if backend is None:
+        backend = os.getenv("GLOSSARY_STORAGE", "json")
+    if backend == "json":
+        from json_storage import JsonStorage
+        return JsonStorage(file_path)
+    if backend == "sqlite":
+        from sqlite_storage import SqliteStorage
+        return SqliteStorage(os.path.splitext(file_path)[0] + ".db", seed_path=file_path)
+    raise ValueError(f"Неизвестное хранилище GLOSSARY_STORAGE={backend!r}: ожидается json или sqlite")
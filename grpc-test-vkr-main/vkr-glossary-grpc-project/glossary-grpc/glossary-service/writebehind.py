@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class CommitTicket:
+    """Подтверждение фиксации группы мутаций на диске"""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def resolve(self, error: Optional[BaseException] = None):
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Ждет записи группы; пробрасывает ошибку записи вызывающему"""
+        if not self._done.wait(timeout):
+            raise TimeoutError("Группа мутаций не записана за отведенное время")
+        if self.error is not None:
+            raise self.error
+
+
+class WriteBehindFlusher(threading.Thread):
+    """Поток отложенной записи с групповой фиксацией (group commit)
+
+    Мутации копятся в окне window секунд или до max_batch штук и
+    записываются на диск одним вызовом flush. Все мутации окна получают
+    общий CommitTicket.
+    """
+
+    def __init__(self, flush: Callable[[List[Dict]], None], window: float, max_batch: int):
+        super().__init__(name="write-behind-flusher", daemon=True)
+        self.flush = flush
+        self.window = window
+        self.max_batch = max_batch
+        self.flushes = 0
+        self.flushed_entries = 0
+        self._cond = threading.Condition()
+        self._pending: List[Dict] = []
+        self._ticket = CommitTicket()
+        self._closed = False
+
+    def submit(self, entry: Dict) -> CommitTicket:
+        """Ставит мутацию в очередь и возвращает подтверждение ее группы"""
+        return self.submit_many([entry])
+
+    def submit_many(self, entries: List[Dict]) -> CommitTicket:
+        """Ставит мутации пакета в очередь целиком: они попадут в одну группу"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Поток отложенной записи остановлен")
+            self._pending.extend(entries)
+            self._cond.notify()
+            return self._ticket
+
+    def close(self):
+        """Записывает оставшиеся мутации и останавливает поток"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.join()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending, []
+                ticket, self._ticket = self._ticket, CommitTicket()
+
+            error = None
+            try:
+                self.flush(batch)
+            except Exception as e:
+                print(f"Ошибка отложенной записи: {e}")
+                error = e
+            self.flushes += 1
+            self.flushed_entries += len(batch)
+            ticket.resolve(error)
@@ -1,10 +1,13 @@
 # web-service/web.py
+import json
 import os
-from typing import Optional
+from typing import Annotated, List, Optional
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import grpc
+from pydantic import BaseModel, Field
 
 from glossary_pb2 import (
     GetTermRequest,
@@ -12,8 +15,13 @@ from glossary_pb2 import (
     CreateTermRequest,
     UpdateTermRequest,
     DeleteTermRequest,
+    BatchCreateTermsRequest,
+    BatchGetTermsRequest,
+    BatchDeleteTermsRequest,
     SearchTermsRequest,
+    StreamTermsRequest,
     HealthCheckRequest,
+    CacheStatsRequest,
 )
 from glossary_pb2_grpc import GlossaryServiceStub
 
@@ -39,15 +47,82 @@ glossary_channel = grpc.insecure_channel(f"{glossary_host}:50052")
 glossary_client = GlossaryServiceStub(glossary_channel)
 
 
-def term_to_dict(term):
-    """Преобразует protobuf Term в словарь"""
-    return {
+def term_to_dict(term, fields=None):
+    """Преобразует protobuf Term в словарь (только поля fields, если заданы)"""
+    result = {
         "id": term.id,
         "term": term.term,
         "definition": term.definition,
         "category": term.category if term.category else None,
         "related_terms": list(term.related_terms)
     }
+    if fields:
+        return {name: value for name, value in result.items() if name in fields}
+    return result
+
+
+def ndjson_line(term, fields=None):
+    """Строка NDJSON выгрузки с термином"""
+    return json.dumps(term_to_dict(term, fields), ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def read_mask(fields):
+    """Поля из параметра fields=id,term,... для read_mask"""
+    if not fields:
+        return []
+    return [name.strip() for name in fields.split(",") if name.strip()]
+
+
+# Наибольшее число элементов в одном пакетном запросе (как в glossary-service)
+BATCH_MAX_ITEMS = int(os.getenv("GLOSSARY_BATCH_MAX_ITEMS", "1000"))
+# ID терминов в glossary.proto - int32
+TermId = Annotated[int, Field(ge=-2 ** 31, le=2 ** 31 - 1)]
+
+
+class TermCreate(BaseModel):
+    """Термин для создания"""
+    term: str
+    definition: str
+    category: Optional[str] = None
+    related_terms: Optional[List[str]] = []
+
+
+class BatchCreateRequest(BaseModel):
+    """Пакет терминов для создания"""
+    terms: List[TermCreate] = Field(max_length=BATCH_MAX_ITEMS)
+
+
+class BatchIdsRequest(BaseModel):
+    """Список ID для пакетного чтения или удаления"""
+    ids: List[TermId] = Field(max_length=BATCH_MAX_ITEMS)
+
+
+# HTTP статус элемента пакета по коду gRPC из BatchTermResult
+BATCH_STATUS = {
+    grpc.StatusCode.OK.value[0]: 200,
+    grpc.StatusCode.INVALID_ARGUMENT.value[0]: 422,
+    grpc.StatusCode.NOT_FOUND.value[0]: 404,
+}
+
+
+def batch_results(results, ok_status=200, fields=None):
+    """Результаты пакета gRPC в формат REST: status, id, term, detail"""
+    items = []
+    for result in results:
+        status = BATCH_STATUS.get(result.code, 500)
+        items.append({
+            "status": ok_status if status == 200 else status,
+            "id": result.term_id or None,
+            "term": term_to_dict(result.term, fields) if result.HasField("term") else None,
+            "detail": result.message or None
+        })
+    return {"results": items}
+
+
+def batch_error(e):
+    if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+        raise HTTPException(status_code=400, detail=e.details())
+    raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/")
@@ -64,31 +139,68 @@ async def read_root():
 async def get_terms(
     page: int = Query(1, ge=1, description="Номер страницы"),
     per_page: int = Query(10, ge=1, le=100, description="Количество терминов на странице"),
-    search: Optional[str] = Query(None, description="Поисковый запрос")
+    search: Optional[str] = Query(None, description="Поисковый запрос"),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor прошлой страницы; "
+                                                    "пустой - первая страница, page игнорируется"),
+    fields: Optional[str] = Query(None, description="Поля терминов через запятую: "
+                                                    "id,term,definition,category,related_terms (по умолчанию все)")
 ):
     """Получить список всех терминов с пагинацией и поиском"""
     try:
         request = GetTermsRequest(
-            page=page,
+            page=page if cursor is None else 1,
             per_page=per_page,
-            search=search if search else ""
+            search=search if search else "",
+            page_token=cursor or "",
+            read_mask={"paths": read_mask(fields)}
         )
         response = glossary_client.GetTerms(request)
         
-        terms = [term_to_dict(term) for term in response.terms]
+        terms = [term_to_dict(term, request.read_mask.paths) for term in response.terms]
         
-        return {
+        result = {
             "terms": terms,
             "total": response.total,
             "page": response.page,
             "per_page": response.per_page
         }
+        if cursor is not None:
+            result["next_cursor"] = response.next_page_token or None
+        return result
     except grpc.RpcError as e:
         if e.code() == grpc.StatusCode.NOT_FOUND:
             raise HTTPException(status_code=404, detail=str(e))
+        if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+            raise HTTPException(status_code=400, detail=e.details())
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/terms/export")
+async def export_terms(
+    fields: Optional[str] = Query(None, description="Поля терминов через запятую: "
+                                                    "id,term,definition,category,related_terms (по умолчанию все)")
+):
+    """Выгрузить все термины по возрастанию ID в NDJSON (поток StreamTerms)"""
+    request = StreamTermsRequest(read_mask={"paths": read_mask(fields)})
+    stream = glossary_client.StreamTerms(request)
+    try:
+        # Первое сообщение до ответа: ошибка read_mask становится кодом 400, а не обрывом тела
+        first = next(stream, None)
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+            raise HTTPException(status_code=400, detail=e.details())
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def lines():
+        if first is None:
+            return
+        yield ndjson_line(first, request.read_mask.paths)
+        for term in stream:
+            yield ndjson_line(term, request.read_mask.paths)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.get("/api/terms/{term_id}")
 async def get_term(term_id: int):
     """Получить информацию о конкретном термине"""
@@ -150,14 +262,61 @@ async def delete_term(term_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/terms:batchCreate")
+async def batch_create_terms(batch: BatchCreateRequest):
+    """Создать пакет терминов одной транзакцией"""
+    try:
+        request = BatchCreateTermsRequest(terms=[
+            CreateTermRequest(
+                term=item.term,
+                definition=item.definition,
+                category=item.category or "",
+                related_terms=item.related_terms or []
+            )
+            for item in batch.terms
+        ])
+        return batch_results(glossary_client.BatchCreateTerms(request).results, ok_status=201)
+    except grpc.RpcError as e:
+        batch_error(e)
+
+
+@app.post("/api/terms:batchGet")
+async def batch_get_terms(
+    batch: BatchIdsRequest,
+    fields: Optional[str] = Query(None, description="Поля терминов через запятую: "
+                                                    "id,term,definition,category,related_terms (по умолчанию все)")
+):
+    """Получить термины по списку ID"""
+    try:
+        request = BatchGetTermsRequest(term_ids=batch.ids, read_mask={"paths": read_mask(fields)})
+        response = glossary_client.BatchGetTerms(request)
+        return batch_results(response.results, fields=request.read_mask.paths)
+    except grpc.RpcError as e:
+        batch_error(e)
+
+
+@app.post("/api/terms:batchDelete")
+async def batch_delete_terms(batch: BatchIdsRequest):
+    """Удалить пакет терминов одной транзакцией"""
+    try:
+        request = BatchDeleteTermsRequest(term_ids=batch.ids)
+        return batch_results(glossary_client.BatchDeleteTerms(request).results)
+    except grpc.RpcError as e:
+        batch_error(e)
+
+
 @app.get("/api/terms/search/{query}")
-async def search_terms(query: str):
+async def search_terms(
+    query: str,
+    fields: Optional[str] = Query(None, description="Поля терминов через запятую: "
+                                                    "id,term,definition,category,related_terms (по умолчанию все)")
+):
     """Поиск терминов по запросу"""
     try:
-        request = SearchTermsRequest(query=query)
+        request = SearchTermsRequest(query=query, read_mask={"paths": read_mask(fields)})
         response = glossary_client.SearchTerms(request)
         
-        results = [term_to_dict(term) for term in response.results]
+        results = [term_to_dict(term, request.read_mask.paths) for term in response.results]
         
         return {
             "results": results,
@@ -165,6 +324,8 @@ async def search_terms(query: str):
             "count": response.count
         }
     except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+            raise HTTPException(status_code=400, detail=e.details())
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -182,6 +343,23 @@ async def health_check():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Статистика кэша результатов списка и поиска"""
+    try:
+        response = glossary_client.GetCacheStats(CacheStatsRequest())
+        return {
+            "hits": response.hits,
+            "misses": response.misses,
+            "evictions": response.evictions,
+            "entries": response.entries,
+            "items": response.items,
+            "generation": response.generation
+        }
+    except grpc.RpcError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,165 @@
+"""
+Бенчмарк выгрузки всего глоссария: поток из снимка против сборки целиком
+
+Каждый замер идет в отдельном процессе. После открытия хранилища пик RSS
+процесса сбрасывается (/proc/self/clear_refs), поэтому "peak MB" - прирост
+памяти за время выгрузки сверх уже загруженного хранилища. "file MB" - его
+часть из страниц файлов: прочитанный mmap бинарного снимка JSON хранилища,
+который ядро может вытеснить в любой момент. "first ms" - время до первой
+готовой части тела (первого байта ответа). Тело не передается по сети:
+части только считаются по байтам. Режимы:
+- json list     - все термины списком и одно тело JSON (как ответ страницы без лимита);
+- ndjson        - GET /api/terms/export: пачки iter_terms в NDJSON;
+- ndjson gzip   - то же с потоковым gzip;
+- pb message    - все термины в одном SearchTermsResponse;
+- pb stream     - StreamTerms: сообщение Term на термин.
+
+JSON хранилище открывается из бинарного снимка (GLOSSARY_SNAPSHOT_FORMAT=binary),
+индекс триграмм не строится: на 1M терминов он занимает несколько ГБ и
+к выгрузке отношения не имеет.
+
+Запуск: python loadtest/bench/bench_export.py --size 1000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+from common import print_table, use_rest_backend, write_terms_file
+
+os.environ["GLOSSARY_SNAPSHOT_FORMAT"] = "binary"
+use_rest_backend()
+from app import glossary_pb2  # noqa: E402
+from app.formats import term_message  # noqa: E402
+from app.fragments import encode_term, ndjson  # noqa: E402
+from app.json_storage import JsonStorage  # noqa: E402
+from app.snapshot import binary_path, write_binary  # noqa: E402
+from app.storage import open_storage  # noqa: E402
+
+MODES = ["json list", "ndjson", "ndjson gzip", "pb message", "pb stream"]
+
+
+def current_rss_mb():
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def file_rss_mb():
+    """Резидентные страницы файлов: у JSON хранилища это mmap бинарного снимка"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssFile:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def reset_peak_rss():
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def export_parts(storage, mode):
+    """Части тела ответа в режиме mode"""
+    if mode == "json list":
+        records = [term_data for chunk in storage.iter_terms() for term_data in chunk]
+        yield b"[" + b",".join([encode_term(term_data) for term_data in records]) + b"]"
+    elif mode == "pb message":
+        records = [term_data for chunk in storage.iter_terms() for term_data in chunk]
+        yield glossary_pb2.SearchTermsResponse(
+            results=[term_message(term_data) for term_data in records], count=len(records)
+        ).SerializeToString()
+    elif mode == "pb stream":
+        for chunk in storage.iter_terms():
+            for term_data in chunk:
+                yield term_message(term_data).SerializeToString()
+    elif mode == "ndjson gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in storage.iter_terms():
+            yield compressor.compress(ndjson(chunk))
+        yield compressor.flush()
+    else:
+        for chunk in storage.iter_terms():
+            yield ndjson(chunk)
+
+
+def child(path, backend, mode):
+    """Один замер в текущем процессе; результат печатается как JSON"""
+    JsonStorage.finish_trigrams = lambda self, terms, pending: None
+    storage = open_storage(path, backend)
+    # Первая пачка открывает соединение SQLite вне замера
+    for _ in storage.iter_terms():
+        break
+    rss = current_rss_mb()
+    file_rss = file_rss_mb()
+    reset_peak_rss()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for part in export_parts(storage, mode):
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(part)
+    total = time.perf_counter() - start
+    print(json.dumps({"rss": rss, "peak": peak_rss_mb() - rss, "file": file_rss_mb() - file_rss,
+                      "first": first, "total": total, "bytes": size}))
+    storage.close()
+
+
+def run_child(path, backend, mode):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", path, backend, mode],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def prepare(path, size, backend):
+    """Готовит данные хранилища вне замеряемого процесса"""
+    if backend == "json":
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        write_binary(binary_path(path), records, size + 1, durable=False)
+    else:
+        open_storage(path, "sqlite").close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--backends", nargs="+", choices=["json", "sqlite"], default=["json", "sqlite"])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--child", nargs=3, metavar=("PATH", "BACKEND", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data", "terms.json")
+        write_terms_file(path, args.size, indent=None)
+        for backend in args.backends:
+            prepare(path, args.size, backend)
+            for mode in args.modes:
+                r = run_child(path, backend, mode)
+                rows.append([backend, mode, f"{r['rss']:.0f}", f"{r['peak']:.0f}", f"{r['file']:.0f}",
+                             f"{r['first'] * 1000:.1f}", f"{r['total']:.2f}", f"{r['bytes'] / 2**20:.0f}"])
+    print_table(["storage", "mode", "storage MB", "peak MB", "of it file MB", "first ms", "total s", "body MB"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
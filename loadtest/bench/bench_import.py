@@ -0,0 +1,164 @@
+"""
+Бенчмарк потокового импорта: ImportTerms и POST /api/terms:import против создания по одному
+
+Каждый замер поднимает сервис отдельным процессом на пустом хранилище и
+передает ему --size синтетических терминов. Клиент создает термины лениво
+(генератором), поэтому ни одна из сторон не держит весь набор. Режимы:
+- grpc import  - client-streaming ImportTerms: поток CreateTermRequest;
+- rest import  - POST /api/terms:import: тело NDJSON с chunked передачей;
+- grpc create  - цикл CreateTerm (--loop-size терминов);
+- rest create  - цикл POST /api/terms на одном соединении (--loop-size терминов).
+
+"peak MB" - прирост пика RSS процесса сервиса за время импорта (VmHWM
+сбрасывается через /proc/<pid>/clear_refs), "after MB" - сколько из него
+осталось после импорта. У SQLite оба числа не зависят от --size: в памяти
+только текущая пачка. JSON хранилище держит все термины и индекс триграмм
+в памяти, поэтому его память растет вместе с корпусом.
+
+Запуск: python loadtest/bench/bench_import.py --size 1000000 --backends sqlite
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import GRPC_SERVICE_DIR, REST_BACKEND_DIR, make_term, print_table, write_terms_file
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import grpc  # noqa: E402
+from grpc_gen import glossary_pb2, glossary_pb2_grpc  # noqa: E402
+
+MODES = ["grpc import", "rest import", "grpc create", "rest create"]
+GRPC_PORT = 50052
+REST_PORT = 8765
+
+
+def proc_status_mb(pid, field):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def reset_peak_rss(pid):
+    with open(f"/proc/{pid}/clear_refs", "w") as f:
+        f.write("5")
+
+
+def wait_port(port, timeout=60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("localhost", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Сервис не поднялся на порту {port}")
+
+
+def start_service(tmp, backend, transport):
+    """Процесс сервиса в каталоге tmp с пустым data/terms.json"""
+    write_terms_file(os.path.join(tmp, "data", "terms.json"), 0, indent=None)
+    env = dict(os.environ, GLOSSARY_STORAGE=backend, GLOSSARY_JOURNAL="1")
+    if transport == "grpc":
+        command = [sys.executable, os.path.join(GRPC_SERVICE_DIR, "glossary.py")]
+        port = GRPC_PORT
+    else:
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--app-dir", REST_BACKEND_DIR,
+                   "--port", str(REST_PORT), "--log-level", "warning"]
+        port = REST_PORT
+    process = subprocess.Popen(command, cwd=tmp, env=env, stdout=subprocess.DEVNULL)
+    wait_port(port)
+    return process
+
+
+def terms(count):
+    for i in range(1, count + 1):
+        term = make_term(i)
+        del term["id"]
+        yield term
+
+
+def ndjson_body(count, lines_per_chunk=1000):
+    """Тело NDJSON частями по lines_per_chunk строк"""
+    lines = []
+    for term in terms(count):
+        lines.append(json.dumps(term, ensure_ascii=False))
+        if len(lines) == lines_per_chunk:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def run_mode(mode, count):
+    """Выполняет импорт count терминов; возвращает число созданных"""
+    if mode.startswith("grpc"):
+        with grpc.insecure_channel(f"localhost:{GRPC_PORT}") as channel:
+            stub = glossary_pb2_grpc.GlossaryServiceStub(channel)
+            requests = (glossary_pb2.CreateTermRequest(**term) for term in terms(count))
+            if mode == "grpc import":
+                return stub.ImportTerms(requests).created
+            for request in requests:
+                stub.CreateTerm(request)
+            return count
+    connection = http.client.HTTPConnection("localhost", REST_PORT)
+    try:
+        if mode == "rest import":
+            # Тело-генератор без Content-Length передается chunked
+            connection.request("POST", "/api/terms:import", body=ndjson_body(count),
+                               headers={"Content-Type": "application/x-ndjson"})
+            response = connection.getresponse()
+            return json.loads(response.read())["created"]
+        for term in terms(count):
+            connection.request("POST", "/api/terms", body=json.dumps(term),
+                               headers={"Content-Type": "application/json"})
+            connection.getresponse().read()
+        return count
+    finally:
+        connection.close()
+
+
+def bench(backend, mode, count):
+    with tempfile.TemporaryDirectory() as tmp:
+        process = start_service(tmp, backend, mode.split()[0])
+        try:
+            rss = proc_status_mb(process.pid, "VmRSS")
+            reset_peak_rss(process.pid)
+            start = time.perf_counter()
+            created = run_mode(mode, count)
+            elapsed = time.perf_counter() - start
+            peak = proc_status_mb(process.pid, "VmHWM") - rss
+            after = proc_status_mb(process.pid, "VmRSS") - rss
+        finally:
+            process.kill()
+            process.wait()
+    return created, elapsed, peak, after
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000, help="терминов в потоковом импорте")
+    parser.add_argument("--loop-size", type=int, default=5000, help="терминов в цикле создания по одному")
+    parser.add_argument("--backends", nargs="+", choices=["json", "sqlite"], default=["json", "sqlite"])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    args = parser.parse_args()
+
+    rows = []
+    for backend in args.backends:
+        for mode in args.modes:
+            count = args.size if mode.endswith("import") else args.loop_size
+            created, elapsed, peak, after = bench(backend, mode, count)
+            rows.append([backend, mode, created, f"{elapsed:.1f}", f"{created / elapsed:.0f}",
+                         f"{peak:.0f}", f"{after:.0f}"])
+    print_table(["storage", "mode", "terms", "total s", "terms/s", "peak MB", "after MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Микробенчмарк операций по первичному ключу
+
+Сравнивает хеш-индекс id -> запись и монотонный счетчик ID с прежними
+алгоритмами (линейный поиск по списку, max() по всем ID, удаление со
+сдвигом списка). Чтобы мерить именно индекс, хранилище работает в режиме
+журнала без компакции.
+
+Запуск: python loadtest/bench/bench_index.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+
+from common import measure, print_table, use_grpc_service, write_terms_file
+
+use_grpc_service()
+from json_storage import JsonStorage  # noqa: E402
+
+
+def linear_get(records, term_id):
+    for term_data in records:
+        if term_data.get('id') == term_id:
+            return term_data
+    return None
+
+
+def linear_delete(records, term_id):
+    for i, term_data in enumerate(records):
+        if term_data.get('id') == term_id:
+            del records[i]
+            return True
+    return False
+
+
+def bench_size(size, ops):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data", "terms.json")
+        write_terms_file(path, size, indent=None)
+        db = JsonStorage(path, journal=True, write_behind=False)
+        db._compactor.max_bytes = float("inf")
+        db._compactor.max_age = float("inf")
+        records = list(db.terms.values())
+        ids = [random.randint(1, size) for _ in range(ops)]
+        # Удаляем из второй половины, чтобы прежний алгоритм не попадал в лучший случай
+        victims = iter(random.sample(range(size // 2, size + 1), ops * 2))
+
+        results = {
+            "get": (measure(lambda: db.get_term(random.choice(ids)), ops),
+                    measure(lambda: linear_get(records, random.choice(ids)), ops)),
+            # Прежний update_term тоже начинался с линейного поиска записи
+            "update": (measure(lambda: db.update_term(random.choice(ids), {"definition": "updated"}), ops),
+                       measure(lambda: linear_get(records, random.choice(ids)), ops)),
+            "delete": (measure(lambda: db.delete_term(next(victims)), ops),
+                       measure(lambda: linear_delete(records, next(victims)), ops)),
+            "next id": (measure(db.get_next_id, ops),
+                        measure(lambda: max(t.get('id', 0) for t in records) + 1, ops)),
+        }
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        for operation, (indexed, linear) in bench_size(size, args.ops).items():
+            rows.append([size, operation, f"{statistics.mean(indexed) * 1000:.1f}",
+                         f"{statistics.mean(linear) * 1000:.1f}"])
+    print_table(["terms", "operation", "index us", "linear us"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Бенчмарк латентности записи: полная перезапись terms.json против журнала
+
+Запуск: python loadtest/bench/bench_journal.py --sizes 1000 10000 50000 --ops 200
+"""
+import argparse
+import os
+import statistics
+import tempfile
+
+from common import make_term, measure, percentile, print_table, use_grpc_service, write_terms_file
+
+use_grpc_service()
+from json_storage import JsonStorage  # noqa: E402
+
+
+def bench_mode(size, ops, journal):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data", "terms.json")
+        write_terms_file(path, size)
+        db = JsonStorage(path, journal=journal)
+        # Компакция не должна попадать в замер латентности записи
+        if db._compactor is not None:
+            db._compactor.max_bytes = float("inf")
+            db._compactor.max_age = float("inf")
+        sample = make_term(0)
+        # Только фиксация мутации (то, что меняет журнал), без выдачи ID и публикации версии
+        commit = measure(lambda: db.commit({"op": "put", "term": sample}), ops)
+        # Полный create_term: ID из счетчика за O(1), новая версия в памяти и фиксация
+        create = measure(
+            lambda: db.create_term(sample["term"], sample["definition"], sample["category"],
+                                   sample["related_terms"]),
+            ops,
+        )
+        return commit, create
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        for journal in (False, True):
+            commit, create = bench_mode(size, args.ops, journal)
+            rows.append([
+                size, "journal" if journal else "rewrite",
+                f"{statistics.mean(commit):.3f}", f"{percentile(commit, 95):.3f}",
+                f"{statistics.mean(create):.3f}", f"{percentile(create, 95):.3f}",
+            ])
+    print_table(["terms", "mode", "commit mean ms", "commit p95 ms", "create mean ms", "create p95 ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
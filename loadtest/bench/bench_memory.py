@@ -0,0 +1,83 @@
+"""
+Бенчмарк памяти на термин: словари из json.load против компактных TermRecord
+
+Память меряется через tracemalloc: корпус читается из terms.json, после
+чего считается прирост отслеживаемой памяти на один термин. Для TermRecord
+в замер входит и таблица строк (StringTable). Корпуса:
+- locust    - термины, которые создают сценарии Locust (категория loadtest,
+              связанные термины test1..test3) - повторяющиеся строки;
+- synthetic - make_term из common: пять категорий и уникальные названия
+              связанных терминов, худший случай для интернирования.
+
+Запуск: python loadtest/bench/bench_memory.py --sizes 10000 100000
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import tracemalloc
+
+from common import make_term, print_table, use_grpc_service
+
+use_grpc_service()
+from records import StringTable, TermRecord  # noqa: E402
+
+
+def locust_term(term_id):
+    term_data = make_term(term_id)
+    term_data["category"] = "loadtest"
+    term_data["related_terms"] = ["test1", "test2", "test3"]
+    return term_data
+
+
+CORPORA = {"locust": locust_term, "synthetic": make_term}
+
+
+def load_dicts(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return {term_data["id"]: term_data for term_data in json.load(f)}
+
+
+def load_records(path):
+    table = StringTable()
+    with open(path, 'r', encoding='utf-8') as f:
+        terms = {term_data["id"]: TermRecord.pack(term_data, table) for term_data in json.load(f)}
+    return terms, table
+
+
+def traced_bytes(load, path):
+    """Прирост памяти, которую удерживает результат load(path)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = load(path)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--corpora", nargs="+", choices=list(CORPORA), default=list(CORPORA))
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        for corpus in args.corpora:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "terms.json")
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump([CORPORA[corpus](i) for i in range(1, size + 1)], f, ensure_ascii=False)
+                dict_bytes = traced_bytes(load_dicts, path)
+                record_bytes = traced_bytes(load_records, path)
+            rows.append([size, corpus, f"{dict_bytes / size:.0f}", f"{record_bytes / size:.0f}",
+                         f"{(1 - record_bytes / dict_bytes) * 100:.0f}%"])
+    print_table(["terms", "corpus", "dict B/term", "TermRecord B/term", "saved"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Бенчмарк постраничного вывода без поиска
+
+Сравнивает страницу по номеру (offset) и по курсору (after_id) в обоих
+бэкендах хранилища на разной глубине, а для JSON - еще и с прежним
+алгоритмом (список всех терминов, сортировка по ID, срез страницы). Кэш
+результатов выключен, чтобы мерить само хранилище.
+
+Запуск: python loadtest/bench/bench_pagination.py --sizes 10000 100000 --per-page 50
+"""
+import argparse
+import os
+import statistics
+import tempfile
+
+from common import measure, print_table, use_grpc_service, write_terms_file
+
+use_grpc_service()
+os.environ["GLOSSARY_CACHE_SIZE"] = "0"
+from storage import open_storage  # noqa: E402
+
+
+def sorted_page(records, page, per_page):
+    terms = list(records)
+    terms.sort(key=lambda x: x.get('id', 0), reverse=True)
+    start = (page - 1) * per_page
+    return terms[start:start + per_page]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--ops", type=int, default=100)
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data", "terms.json")
+            write_terms_file(path, size, indent=None)
+            last_page = max(1, size // args.per_page)
+            for backend in ("json", "sqlite"):
+                db = open_storage(path, backend)
+                for page in (1, 10, last_page):
+                    # Курсор страницы page - ID последнего термина предыдущей
+                    previous = db.get_all_terms(page=page - 1, per_page=args.per_page) if page > 1 else None
+                    after_id = previous["terms"][-1]["id"] if previous else None
+                    offset = measure(lambda: db.get_all_terms(page=page, per_page=args.per_page), args.ops)
+                    cursor = measure(lambda: db.get_all_terms(per_page=args.per_page, after_id=after_id), args.ops)
+                    baseline = "-"
+                    if backend == "json":
+                        timings = measure(lambda: sorted_page(db.terms.values(), page, args.per_page), args.ops)
+                        baseline = f"{statistics.mean(timings) * 1000:.1f}"
+                    rows.append([size, backend, page, f"{statistics.mean(offset) * 1000:.1f}",
+                                 f"{statistics.mean(cursor) * 1000:.1f}", baseline])
+                db.close()
+    print_table(["terms", "backend", "page", "offset us", "cursor us", "sort us"], rows)
+
+if __name__ == "__main__":
+    main()
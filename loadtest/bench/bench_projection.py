@@ -0,0 +1,58 @@
+"""
+Бенчмарк проекции полей в списке терминов REST сервиса
+
+Тело страницы GET /api/terms собирается целиком и только с полями из
+--fields в форматах JSON, protobuf и msgpack теми же функциями, что в
+приложении. Для каждого варианта выводятся байты тела и время сборки:
+для JSON - с прогретым кэшем фрагментов и без него (каждый термин
+кодируется заново), бинарные форматы кодируются на каждый запрос.
+
+Запуск: python loadtest/bench/bench_projection.py --size 10000 --per-page 100
+"""
+import argparse
+import os
+import statistics
+import tempfile
+
+from common import measure, print_table, use_rest_backend, write_terms_file
+
+use_rest_backend()
+from app.formats import BINARY, JSON, encode_list  # noqa: E402
+from app.fragments import FragmentCache, parse_fields  # noqa: E402
+from app.storage import open_storage  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--fields", nargs="+", default=["id,term,related_terms", "id,term"])
+    parser.add_argument("--ops", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data", "terms.json")
+        write_terms_file(path, args.size, indent=None)
+        storage = open_storage(path, "json")
+        result = storage.get_all_terms(page=2, per_page=args.per_page)
+        storage.close()
+
+    rows = []
+    for fields in (None, *args.fields):
+        projected = parse_fields(fields)
+        name = fields or "все"
+        warm, cold = FragmentCache(), FragmentCache(0)
+        body = warm.term_list(result, fields=projected)
+        cached = measure(lambda: warm.term_list(result, fields=projected), args.ops)
+        uncached = measure(lambda: cold.term_list(result, fields=projected), args.ops)
+        rows.append([JSON, name, len(body), f"{statistics.mean(cached) * 1000:.0f}",
+                     f"{statistics.mean(uncached) * 1000:.0f}"])
+        for media in BINARY:
+            body = encode_list(result, media, fields=projected)
+            timings = measure(lambda: encode_list(result, media, fields=projected), args.ops)
+            rows.append([media, name, len(body), "-", f"{statistics.mean(timings) * 1000:.0f}"])
+    print_table(["format", "fields", "bytes", "cached us", "encode us"], rows)
+
+
+if __name__ == "__main__":
+    main()
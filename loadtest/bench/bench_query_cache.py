@@ -0,0 +1,62 @@
+"""
+Бенчмарк кэша результатов на смеси запросов из сценария Locust
+
+Чтения повторяют сценарий: 8 поисковых запросов и страницы 1-3 по
+10/20/50 терминов; доля записей задается --write-ratio. Сравнивается
+хранилище с кэшем и с GLOSSARY_CACHE_SIZE=0.
+
+Запуск: python loadtest/bench/bench_query_cache.py --size 10000 --ops 5000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from common import make_term, print_table, use_grpc_service, write_terms_file
+
+use_grpc_service()
+from json_storage import JsonStorage  # noqa: E402
+
+QUERIES = ["vue", "dom", "api", "react", "data", "json", "component", "state"]
+
+
+def run_mix(db, ops, write_ratio):
+    sample = make_term(0)
+    rng = random.Random(42)
+    start = time.perf_counter()
+    for _ in range(ops):
+        r = rng.random()
+        if r < write_ratio:
+            db.create_term(sample["term"], sample["definition"], sample["category"], sample["related_terms"])
+        elif r < 0.5:
+            db.search_terms(rng.choice(QUERIES))
+        else:
+            db.get_all_terms(page=rng.randint(1, 3), per_page=rng.choice([10, 20, 50]))
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    rows = []
+    for cache_size in ("256", "0"):
+        os.environ["GLOSSARY_CACHE_SIZE"] = cache_size
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data", "terms.json")
+            write_terms_file(path, args.size, indent=None)
+            db = JsonStorage(path, journal=True, write_behind=False)
+            us_per_op = run_mix(db, args.ops, args.write_ratio)
+            stats = db.cache.stats()
+            lookups = stats["hits"] + stats["misses"]
+            hit_rate = stats["hits"] / lookups if lookups and cache_size != "0" else 0.0
+            rows.append([cache_size, f"{us_per_op:.1f}", f"{hit_rate:.1%}", stats["evictions"]])
+    print_table(["cache size", "us/op", "hit rate", "evictions"], rows)
+
+
+if __name__ == "__main__":
+    main()
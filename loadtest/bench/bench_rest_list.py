@@ -0,0 +1,126 @@
+"""
+Бенчмарк CPU на запрос списка, поиска и чтения по ID в REST сервисе
+
+Сравниваются три схемы:
+- eager     - pydantic модель TermResponse строится для каждого подходящего
+              термина до сортировки и среза страницы;
+- models    - фильтрация, сортировка и пагинация по сырым записям, модели
+              строит FastAPI по response_model только для страницы;
+- fragments - текущее приложение: тело ответа склеивается из закэшированных
+              JSON-фрагментов терминов без валидации моделей.
+Запросы идут через TestClient, время - process_time на запрос. Кэш
+результатов выключен, кэш фрагментов прогревается первым запросом.
+
+Запуск: python loadtest/bench/bench_rest_list.py --sizes 1000 10000 100000
+"""
+import argparse
+import atexit
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from common import print_table, use_rest_backend, write_terms_file
+
+use_rest_backend()
+os.environ["GLOSSARY_CACHE_SIZE"] = "0"
+BENCH_DIR = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, BENCH_DIR, True)
+os.chdir(BENCH_DIR)
+from fastapi import FastAPI, Query  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.main as rest  # noqa: E402
+from app.database import Database  # noqa: E402
+from app.models import SearchResponse, TermListResponse, TermResponse  # noqa: E402
+from app.storage import open_storage  # noqa: E402
+
+QUERIES = ["vue", "dom", "api", "state"]
+
+
+def eager_app(storage):
+    """Маршруты с прежней материализацией моделей для всех совпадений"""
+    app = FastAPI()
+
+    @app.get("/api/terms", response_model=TermListResponse)
+    def get_terms(page: int = Query(1), per_page: int = Query(10), search: str = Query(None)):
+        terms = [TermResponse(**term_data) for term_data in storage.terms.values()]
+        if search:
+            needle = search.lower()
+            terms = [t for t in terms if needle in t.term.lower() or needle in t.definition.lower()]
+        terms.sort(key=lambda t: t.id, reverse=True)
+        start = (page - 1) * per_page
+        return TermListResponse(terms=terms[start:start + per_page], total=len(terms),
+                                page=page, per_page=per_page)
+
+    @app.get("/api/terms/search/{query}")
+    def search_terms(query: str):
+        results = [TermResponse(**term_data) for term_data in storage.search_terms(query)]
+        return {"results": results, "query": query, "count": len(results)}
+
+    @app.get("/api/terms/{term_id}", response_model=TermResponse)
+    def get_term(term_id: int):
+        return TermResponse(**storage.get_term(term_id))
+
+    return app
+
+
+def models_app(storage):
+    """Маршруты с моделями только для отдаваемых записей (response_model)"""
+    app = FastAPI()
+
+    @app.get("/api/terms", response_model=TermListResponse)
+    def get_terms(page: int = Query(1), per_page: int = Query(10), search: str = Query(None)):
+        return storage.get_all_terms(page=page, per_page=per_page, search=search or "")
+
+    @app.get("/api/terms/search/{query}", response_model=SearchResponse)
+    def search_terms(query: str):
+        results = storage.search_terms(query)
+        return {"results": results, "query": query, "count": len(results)}
+
+    @app.get("/api/terms/{term_id}", response_model=TermResponse)
+    def get_term(term_id: int):
+        return storage.get_term(term_id)
+
+    return app
+
+
+def cpu_per_request(client, url, params, ops):
+    """Среднее процессорное время на запрос, мс"""
+    timings = []
+    for _ in range(ops):
+        start = time.process_time()
+        client.get(url, params=params).raise_for_status()
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--per-page", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--ops", type=int, default=30)
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        path = os.path.join(BENCH_DIR, f"terms-{size}", "terms.json")
+        write_terms_file(path, size, indent=None)
+        storage = open_storage(path, "json")
+        rest.db = Database(storage)
+        clients = {"eager": TestClient(eager_app(storage)), "models": TestClient(models_app(storage)),
+                   "fragments": TestClient(rest.app)}
+        cases = [(f"list per_page={n}", "/api/terms", {"page": 2, "per_page": n}) for n in args.per_page]
+        cases.append(("list search", "/api/terms", {"per_page": 10, "search": QUERIES[0]}))
+        cases += [(f"search {q}", f"/api/terms/search/{q}", None) for q in QUERIES[1:3]]
+        cases.append(("get by id", f"/api/terms/{size // 2}", None))
+        for name, url, params in cases:
+            timings = [cpu_per_request(clients[mode], url, params, args.ops) for mode in clients]
+            rows.append([size, name, *(f"{t:.2f}" for t in timings)])
+        storage.close()
+    print_table(["terms", "request", "eager ms", "models ms", "fragments ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Бенчмарк поиска подстроки: индекс триграмм против полного просмотра
+
+Запросы совпадают с запросами сценария Locust. Для каждого размера корпуса
+печатается среднее время search_terms и get_all_terms(search=...) и время
+прежнего полного просмотра с .lower() каждого поля.
+
+Запуск: python loadtest/bench/bench_search.py --sizes 10000 100000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+
+from common import measure, print_table, use_grpc_service, write_terms_file
+
+use_grpc_service()
+# Повторные запросы иначе отдает кэш результатов, а не индекс
+os.environ["GLOSSARY_CACHE_SIZE"] = "0"
+from json_storage import JsonStorage  # noqa: E402
+
+QUERIES = ["vue", "dom", "api", "react", "data", "json", "component", "state"]
+
+
+def linear_search(records, query):
+    query_lower = query.lower()
+    return [
+        term_data for term_data in records
+        if (query_lower in term_data["term"].lower() or
+            query_lower in term_data["definition"].lower() or
+            (term_data.get("category") and query_lower in term_data["category"].lower()))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--ops", type=int, default=20, help="повторов на запрос")
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data", "terms.json")
+            write_terms_file(path, size, indent=None)
+            db = JsonStorage(path, journal=False, write_behind=False)
+            for query in QUERIES:
+                assert db.search_terms(query) == linear_search(db.terms.values(), query)
+                search = measure(lambda: db.search_terms(query), args.ops)
+                listing = measure(lambda: db.get_all_terms(page=1, per_page=10, search=query), args.ops)
+                linear = measure(lambda: linear_search(db.terms.values(), query), args.ops)
+                rows.append([size, query, len(db.search_terms(query)),
+                             f"{statistics.mean(search):.2f}", f"{statistics.mean(listing):.2f}",
+                             f"{statistics.mean(linear):.2f}"])
+    print_table(["terms", "query", "hits", "trigram ms", "list+search ms", "linear ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Бенчмарк холодного старта: terms.json (json.load) против бинарного снимка (mmap)
+
+Каждый замер идет в отдельном процессе, чтобы RSS не смешивался между
+режимами. Режимы:
+- json.load      - только чтение terms.json, без построения хранилища;
+- json           - JsonStorage из terms.json (GLOSSARY_SNAPSHOT_FORMAT=json);
+- binary convert - первый старт в binary: чтение terms.json и запись terms.snap;
+- binary mmap    - повторный старт из terms.snap с ленивым декодированием.
+
+Для хранилища дополнительно меряются первое чтение по ID, первая страница
+и время до готовности индекса триграмм (в binary он строится в фоне).
+
+Индекс триграмм на 1M терминов занимает несколько ГБ, поэтому для больших
+корпусов удобно ограничить режимы и не ждать индекс:
+
+Запуск: python loadtest/bench/bench_startup.py --sizes 100000
+        python loadtest/bench/bench_startup.py --sizes 1000000 --modes json.load "binary mmap" --no-index
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import print_table, use_grpc_service, write_terms_file
+
+MODES = ["json.load", "json", "binary convert", "binary mmap"]
+
+
+def current_rss_mb():
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def peak_rss_mb():
+    # VmHWM сбрасывается при exec, в отличие от ru_maxrss, который
+    # унаследовал бы пик родителя, прочитавшего terms.json в convert()
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def child(path, mode, wait_index):
+    """Один замер в текущем процессе; результат печатается как JSON"""
+    result = {}
+    start = time.perf_counter()
+    if mode == "json.load":
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        result["start"] = time.perf_counter() - start
+        result["terms"] = len(records)
+    else:
+        os.environ["GLOSSARY_SNAPSHOT_FORMAT"] = "json" if mode == "json" else "binary"
+        use_grpc_service()
+        from json_storage import JsonStorage
+        db = JsonStorage(path, journal=False, write_behind=False)
+        result["start"] = time.perf_counter() - start
+        result["terms"] = len(db.terms)
+        result["rss_start"] = current_rss_mb()
+        result["peak_rss_start"] = peak_rss_mb()
+
+        t = time.perf_counter()
+        db.get_term(len(db.terms) // 2)
+        result["first_get"] = time.perf_counter() - t
+        t = time.perf_counter()
+        db.get_all_terms(page=1, per_page=50)
+        result["first_page"] = time.perf_counter() - t
+        if wait_index:
+            while db.trigrams is None:
+                time.sleep(0.01)
+            result["index_ready"] = time.perf_counter() - start
+    result["rss"] = current_rss_mb()
+    result["peak_rss"] = peak_rss_mb()
+    print(json.dumps(result))
+
+
+def convert(path, size):
+    """Готовит terms.snap рядом с terms.json вне замеряемого процесса"""
+    use_grpc_service()
+    from snapshot import binary_path, write_binary
+    with open(path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    write_binary(binary_path(path), records, size + 1, durable=False)
+
+
+def run_child(path, mode, wait_index):
+    command = [sys.executable, os.path.abspath(__file__), "--child", path, mode]
+    if not wait_index:
+        command.append("--no-index")
+    output = subprocess.run(
+        command,
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--no-index", action="store_true", help="Не ждать готовности индекса триграмм")
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child, wait_index=not args.no_index)
+        return
+
+    rows = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "source", "terms.json")
+            write_terms_file(source, size)
+            for mode in args.modes:
+                data_dir = os.path.join(tmp, "data")
+                shutil.rmtree(data_dir, ignore_errors=True)
+                os.makedirs(data_dir)
+                shutil.copy(source, data_dir)
+                path = os.path.join(data_dir, "terms.json")
+                if mode == "binary mmap":
+                    convert(path, size)
+                r = run_child(path, mode, not args.no_index)
+
+                def ms(key):
+                    return f"{r[key] * 1000:.1f}" if key in r else "-"
+
+                rows.append([size, mode, f"{r['start']:.2f}", f"{r.get('rss_start', r['rss']):.0f}",
+                             f"{r.get('peak_rss_start', r['peak_rss']):.0f}", ms("first_get"), ms("first_page"),
+                             f"{r['index_ready']:.2f}" if "index_ready" in r else "-"])
+    print_table(["terms", "mode", "start s", "rss MB", "peak rss MB", "first get ms",
+                 "first page ms", "search ready s"], rows)
+
+
+if __name__ == "__main__":
+    main()
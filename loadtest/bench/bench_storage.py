@@ -0,0 +1,66 @@
+"""
+Бенчмарк бэкендов хранилища: JSON файл (журнал) против SQLite (WAL + FTS5)
+
+Для каждого размера корпуса меряются чтение по ID, страница списка, поиск
+подстроки, создание и изменение термина. Кэш результатов выключен, чтобы
+мерить само хранилище.
+
+Запуск: python loadtest/bench/bench_storage.py --sizes 10000 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+
+from common import make_term, measure, percentile, print_table, use_grpc_service, write_terms_file
+
+use_grpc_service()
+os.environ["GLOSSARY_CACHE_SIZE"] = "0"
+from storage import open_storage  # noqa: E402
+
+QUERIES = ["vue", "dom", "api", "react", "data", "json", "component", "state"]
+
+
+def bench_backend(backend, path, size, ops):
+    db = open_storage(path, backend)
+    sample = make_term(0)
+    rng = random.Random(42)
+    operations = {
+        "get": lambda: db.get_term(rng.randint(1, size)),
+        "page": lambda: db.get_all_terms(page=rng.randint(1, 3), per_page=rng.choice([10, 20, 50])),
+        "search": lambda: db.search_terms(rng.choice(QUERIES)),
+        "list search": lambda: db.get_all_terms(page=1, per_page=10, search=rng.choice(QUERIES)),
+        "create": lambda: db.create_term(sample["term"], sample["definition"], sample["category"],
+                                         sample["related_terms"]),
+        "update": lambda: db.update_term(rng.randint(1, size), {"definition": "updated"}),
+    }
+    results = {name: measure(func, ops) for name, func in operations.items()}
+    db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["GLOSSARY_JOURNAL"] = "1"
+    rows = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data", "terms.json")
+            write_terms_file(path, size, indent=None)
+            results = {backend: bench_backend(backend, path, size, args.ops) for backend in ("json", "sqlite")}
+        for operation in results["json"]:
+            row = [size, operation]
+            for backend in ("json", "sqlite"):
+                timings = results[backend][operation]
+                row += [f"{statistics.mean(timings):.3f}", f"{percentile(timings, 95):.3f}"]
+            rows.append(row)
+    print_table(["terms", "operation", "json ms", "json p95", "sqlite ms", "sqlite p95"], rows)
+
+
+if __name__ == "__main__":
+    main()
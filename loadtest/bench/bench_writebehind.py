@@ -0,0 +1,70 @@
+"""
+Бенчмарк групповой фиксации: пропускная способность конкурентных записей
+
+Несколько потоков одновременно создают термины (как пул gRPC сервера).
+Сравниваются синхронная запись на каждую мутацию и отложенная запись
+с sync/async подтверждением.
+
+Запуск: python loadtest/bench/bench_writebehind.py --size 5000 --threads 10 --ops 50
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from common import make_term, print_table, use_grpc_service, write_terms_file
+
+use_grpc_service()
+from json_storage import JsonStorage  # noqa: E402
+
+MODES = [
+    ("rewrite", False, False, None),
+    ("rewrite + write-behind sync", False, True, True),
+    ("rewrite + write-behind async", False, True, False),
+    ("journal", True, False, None),
+    ("journal + write-behind sync", True, True, True),
+]
+
+
+def bench_mode(size, threads, ops, journal, write_behind, wait):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data", "terms.json")
+        write_terms_file(path, size)
+        db = JsonStorage(path, journal=journal, write_behind=write_behind)
+        sample = make_term(0)
+
+        def worker():
+            for _ in range(ops):
+                db.create_term(sample["term"], sample["definition"], sample["category"],
+                               sample["related_terms"], wait=wait)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+        flusher = db._flusher
+        db.close()
+        flushes = flusher.flushes if flusher is not None else threads * ops
+        return threads * ops / elapsed, flushes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=10)
+    parser.add_argument("--ops", type=int, default=50, help="мутаций на поток")
+    args = parser.parse_args()
+
+    rows = []
+    for name, journal, write_behind, wait in MODES:
+        ops_per_sec, writes = bench_mode(args.size, args.threads, args.ops, journal, write_behind, wait)
+        rows.append([name, f"{ops_per_sec:.0f}", writes])
+    print_table(["mode", "ops/s", "disk writes"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Общие утилиты микробенчмарков хранилища глоссария
+"""
+import json
+import os
+import random
+import string
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+GRPC_SERVICE_DIR = os.path.join(
+    PROJECT_ROOT, "grpc-test-vkr-main", "vkr-glossary-grpc-project", "glossary-grpc", "glossary-service"
+)
+REST_BACKEND_DIR = os.path.join(PROJECT_ROOT, "mindmap-vkr-main", "backend")
+
+CATEGORIES = ["Фреймворки", "Рендеринг", "Архитектура", "Протоколы", "loadtest"]
+VOCABULARY = [
+    "компонент", "реактивность", "состояние", "рендеринг", "виртуальный", "DOM", "Vue", "React",
+    "API", "JSON", "данные", "component", "state", "маршрутизация", "хранилище", "сервер",
+    "протокол", "сериализация", "кэш", "индекс", "запрос", "ответ", "клиент", "поток",
+    "очередь", "журнал", "транзакция", "схема", "модуль", "сборка", "шаблон", "директива",
+    "событие", "обработчик", "контекст", "сессия", "токен", "маршрут", "прокси", "балансировка",
+]
+
+
+def use_grpc_service():
+    """Делает модули gRPC сервиса импортируемыми (glossary, journal, ...)"""
+    if GRPC_SERVICE_DIR not in sys.path:
+        sys.path.insert(0, GRPC_SERVICE_DIR)
+
+
+def use_rest_backend():
+    """Делает пакет app REST сервиса импортируемым (app.main, app.database, ...)"""
+    if REST_BACKEND_DIR not in sys.path:
+        sys.path.insert(0, REST_BACKEND_DIR)
+
+
+def random_string(length=8):
+    """Генерирует случайную строку"""
+    return ''.join(random.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def make_term(term_id):
+    """Синтетический термин, похожий по размеру на записи terms.json"""
+    return {
+        "id": term_id,
+        "term": f"term-{term_id}-{random_string(6)}",
+        "definition": " ".join(random.sample(VOCABULARY, 2)) + f" {random_string(30)}",
+        "category": random.choice(CATEGORIES),
+        "related_terms": [random_string(6) for _ in range(3)],
+    }
+
+
+def write_terms_file(path, count, indent=2):
+    """Создает terms.json с count синтетическими терминами"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([make_term(i) for i in range(1, count + 1)], f, ensure_ascii=False, indent=indent)
+
+
+def measure(func, repeat):
+    """Выполняет func repeat раз и возвращает список длительностей в миллисекундах"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(values, p):
+    """Перцентиль p (0-100) по отсортированной выборке"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_table(headers, rows):
+    """Печатает результаты в виде выровненной таблицы"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
@@ -22,39 +22,64 @@ _runtime_version.ValidateProtobufRuntimeVersion(
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import field_mask_pb2 as google_dot_protobuf_dot_field__mask__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0eglossary.proto\"]\n\x04Term\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04term\x18\x02 \x01(\t\x12\x12\n\ndefinition\x18\x03 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\t\x12\x15\n\rrelated_terms\x18\x05 \x03(\t\"!\n\x0eGetTermRequest\x12\x0f\n\x07term_id\x18\x01 \x01(\x05\"A\n\x0fGetTermsRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\x10\n\x08per_page\x18\x02 \x01(\x05\x12\x0e\n\x06search\x18\x03 \x01(\t\"W\n\x10GetTermsResponse\x12\x14\n\x05terms\x18\x01 \x03(\x0b\x32\x05.Term\x12\r\n\x05total\x18\x02 \x01(\x05\x12\x0c\n\x04page\x18\x03 \x01(\x05\x12\x10\n\x08per_page\x18\x04 \x01(\x05\"^\n\x11\x43reateTermRequest\x12\x0c\n\x04term\x18\x01 \x01(\t\x12\x12\n\ndefinition\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x15\n\rrelated_terms\x18\x04 \x03(\t\"o\n\x11UpdateTermRequest\x12\x0f\n\x07term_id\x18\x01 \x01(\x05\x12\x0c\n\x04term\x18\x02 \x01(\t\x12\x12\n\ndefinition\x18\x03 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\t\x12\x15\n\rrelated_terms\x18\x05 \x03(\t\"$\n\x11\x44\x65leteTermRequest\x12\x0f\n\x07term_id\x18\x01 \x01(\x05\"%\n\x12\x44\x65leteTermResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\"#\n\x12SearchTermsRequest\x12\r\n\x05query\x18\x01 \x01(\t\"K\n\x13SearchTermsResponse\x12\x16\n\x07results\x18\x01 \x03(\x0b\x32\x05.Term\x12\r\n\x05query\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"\x14\n\x12HealthCheckRequest\"6\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t2\xe2\x02\n\x0fGlossaryService\x12!\n\x07GetTerm\x12\x0f.GetTermRequest\x1a\x05.Term\x12/\n\x08GetTerms\x12\x10.GetTermsRequest\x1a\x11.GetTermsResponse\x12\'\n\nCreateTerm\x12\x12.CreateTermRequest\x1a\x05.Term\x12\'\n\nUpdateTerm\x12\x12.UpdateTermRequest\x1a\x05.Term\x12\x35\n\nDeleteTerm\x12\x12.DeleteTermRequest\x1a\x13.DeleteTermResponse\x12\x38\n\x0bSearchTerms\x12\x13.SearchTermsRequest\x1a\x14.SearchTermsResponse\x12\x38\n\x0bHealthCheck\x12\x13.HealthCheckRequest\x1a\x14.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0eglossary.proto\x1a google/protobuf/field_mask.proto\"]\n\x04Term\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04term\x18\x02 \x01(\t\x12\x12\n\ndefinition\x18\x03 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\t\x12\x15\n\rrelated_terms\x18\x05 \x03(\t\"!\n\x0eGetTermRequest\x12\x0f\n\x07term_id\x18\x01 \x01(\x05\"\x96\x01\n\x0fGetTermsRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\x10\n\x08per_page\x18\x02 \x01(\x05\x12\x0e\n\x06search\x18\x03 \x01(\t\x12\x10\n\x08\x61\x66ter_id\x18\x04 \x01(\x05\x12\x12\n\npage_token\x18\x05 \x01(\t\x12-\n\tread_mask\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"p\n\x10GetTermsResponse\x12\x14\n\x05terms\x18\x01 \x03(\x0b\x32\x05.Term\x12\r\n\x05total\x18\x02 \x01(\x05\x12\x0c\n\x04page\x18\x03 \x01(\x05\x12\x10\n\x08per_page\x18\x04 \x01(\x05\x12\x17\n\x0fnext_page_token\x18\x05 \x01(\t\"^\n\x11\x43reateTermRequest\x12\x0c\n\x04term\x18\x01 \x01(\t\x12\x12\n\ndefinition\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x15\n\rrelated_terms\x18\x04 \x03(\t\"o\n\x11UpdateTermRequest\x12\x0f\n\x07term_id\x18\x01 \x01(\x05\x12\x0c\n\x04term\x18\x02 \x01(\t\x12\x12\n\ndefinition\x18\x03 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x04 \x01(\t\x12\x15\n\rrelated_terms\x18\x05 \x03(\t\"$\n\x11\x44\x65leteTermRequest\x12\x0f\n\x07term_id\x18\x01 \x01(\x05\"%\n\x12\x44\x65leteTermResponse\x12\x0f\n\x07message\x18\x01 \x01(\t\"R\n\x12SearchTermsRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12-\n\tread_mask\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"K\n\x13SearchTermsResponse\x12\x16\n\x07results\x18\x01 \x03(\x0b\x32\x05.Term\x12\r\n\x05query\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"C\n\x12StreamTermsRequest\x12-\n\tread_mask\x18\x01 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"-\n\x0bImportError\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x0f\n\x07message\x18\x02 \x01(\t\"d\n\x13ImportTermsResponse\x12\x0f\n\x07\x63reated\x18\x01 \x01(\x05\x12\x0e\n\x06\x66\x61iled\x18\x02 \x01(\x05\x12\x0e\n\x06\x63hunks\x18\x03 \x01(\x05\x12\x1c\n\x06\x65rrors\x18\x04 \x03(\x0b\x32\x0c.ImportError\"V\n\x0f\x42\x61tchTermResult\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x05\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x04term\x18\x03 \x01(\x0b\x32\x05.Term\x12\x0f\n\x07term_id\x18\x04 \x01(\x05\"<\n\x17\x42\x61tchCreateTermsRequest\x12!\n\x05terms\x18\x01 \x03(\x0b\x32\x12.CreateTermRequest\"=\n\x18\x42\x61tchCreateTermsResponse\x12!\n\x07results\x18\x01 \x03(\x0b\x32\x10.BatchTermResult\"W\n\x14\x42\x61tchGetTermsRequest\x12\x10\n\x08term_ids\x18\x01 \x03(\x05\x12-\n\tread_mask\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\":\n\x15\x42\x61tchGetTermsResponse\x12!\n\x07results\x18\x01 \x03(\x0b\x32\x10.BatchTermResult\"+\n\x17\x42\x61tchDeleteTermsRequest\x12\x10\n\x08term_ids\x18\x01 \x03(\x05\"=\n\x18\x42\x61tchDeleteTermsResponse\x12!\n\x07results\x18\x01 \x03(\x0b\x32\x10.BatchTermResult\"\x14\n\x12HealthCheckRequest\"6\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x13\n\x11\x43\x61\x63heStatsRequest\"y\n\x12\x43\x61\x63heStatsResponse\x12\x0c\n\x04hits\x18\x01 \x01(\x03\x12\x0e\n\x06misses\x18\x02 \x01(\x03\x12\x11\n\tevictions\x18\x03 \x01(\x03\x12\x0f\n\x07\x65ntries\x18\x04 \x01(\x05\x12\r\n\x05items\x18\x05 \x01(\x05\x12\x12\n\ngeneration\x18\x06 \x01(\x03\x32\xd6\x05\n\x0fGlossaryService\x12!\n\x07GetTerm\x12\x0f.GetTermRequest\x1a\x05.Term\x12/\n\x08GetTerms\x12\x10.GetTermsRequest\x1a\x11.GetTermsResponse\x12\'\n\nCreateTerm\x12\x12.CreateTermRequest\x1a\x05.Term\x12\'\n\nUpdateTerm\x12\x12.UpdateTermRequest\x1a\x05.Term\x12\x35\n\nDeleteTerm\x12\x12.DeleteTermRequest\x1a\x13.DeleteTermResponse\x12+\n\x0bStreamTerms\x12\x13.StreamTermsRequest\x1a\x05.Term0\x01\x12\x39\n\x0bImportTerms\x12\x12.CreateTermRequest\x1a\x14.ImportTermsResponse(\x01\x12G\n\x10\x42\x61tchCreateTerms\x12\x18.BatchCreateTermsRequest\x1a\x19.BatchCreateTermsResponse\x12>\n\rBatchGetTerms\x12\x15.BatchGetTermsRequest\x1a\x16.BatchGetTermsResponse\x12G\n\x10\x42\x61tchDeleteTerms\x12\x18.BatchDeleteTermsRequest\x1a\x19.BatchDeleteTermsResponse\x12\x38\n\x0bSearchTerms\x12\x13.SearchTermsRequest\x1a\x14.SearchTermsResponse\x12\x38\n\x0bHealthCheck\x12\x13.HealthCheckRequest\x1a\x14.HealthCheckResponse\x12\x38\n\rGetCacheStats\x12\x12.CacheStatsRequest\x1a\x13.CacheStatsResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'glossary_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_TERM']._serialized_start=18
-  _globals['_TERM']._serialized_end=111
-  _globals['_GETTERMREQUEST']._serialized_start=113
-  _globals['_GETTERMREQUEST']._serialized_end=146
-  _globals['_GETTERMSREQUEST']._serialized_start=148
-  _globals['_GETTERMSREQUEST']._serialized_end=213
-  _globals['_GETTERMSRESPONSE']._serialized_start=215
-  _globals['_GETTERMSRESPONSE']._serialized_end=302
-  _globals['_CREATETERMREQUEST']._serialized_start=304
-  _globals['_CREATETERMREQUEST']._serialized_end=398
-  _globals['_UPDATETERMREQUEST']._serialized_start=400
-  _globals['_UPDATETERMREQUEST']._serialized_end=511
-  _globals['_DELETETERMREQUEST']._serialized_start=513
-  _globals['_DELETETERMREQUEST']._serialized_end=549
-  _globals['_DELETETERMRESPONSE']._serialized_start=551
-  _globals['_DELETETERMRESPONSE']._serialized_end=588
-  _globals['_SEARCHTERMSREQUEST']._serialized_start=590
-  _globals['_SEARCHTERMSREQUEST']._serialized_end=625
-  _globals['_SEARCHTERMSRESPONSE']._serialized_start=627
-  _globals['_SEARCHTERMSRESPONSE']._serialized_end=702
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=704
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=724
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=726
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=780
-  _globals['_GLOSSARYSERVICE']._serialized_start=783
-  _globals['_GLOSSARYSERVICE']._serialized_end=1137
+  _globals['_TERM']._serialized_start=52
+  _globals['_TERM']._serialized_end=145
+  _globals['_GETTERMREQUEST']._serialized_start=147
+  _globals['_GETTERMREQUEST']._serialized_end=180
+  _globals['_GETTERMSREQUEST']._serialized_start=183
+  _globals['_GETTERMSREQUEST']._serialized_end=333
+  _globals['_GETTERMSRESPONSE']._serialized_start=335
+  _globals['_GETTERMSRESPONSE']._serialized_end=447
+  _globals['_CREATETERMREQUEST']._serialized_start=449
+  _globals['_CREATETERMREQUEST']._serialized_end=543
+  _globals['_UPDATETERMREQUEST']._serialized_start=545
+  _globals['_UPDATETERMREQUEST']._serialized_end=656
+  _globals['_DELETETERMREQUEST']._serialized_start=658
+  _globals['_DELETETERMREQUEST']._serialized_end=694
+  _globals['_DELETETERMRESPONSE']._serialized_start=696
+  _globals['_DELETETERMRESPONSE']._serialized_end=733
+  _globals['_SEARCHTERMSREQUEST']._serialized_start=735
+  _globals['_SEARCHTERMSREQUEST']._serialized_end=817
+  _globals['_SEARCHTERMSRESPONSE']._serialized_start=819
+  _globals['_SEARCHTERMSRESPONSE']._serialized_end=894
+  _globals['_STREAMTERMSREQUEST']._serialized_start=896
+  _globals['_STREAMTERMSREQUEST']._serialized_end=963
+  _globals['_IMPORTERROR']._serialized_start=965
+  _globals['_IMPORTERROR']._serialized_end=1010
+  _globals['_IMPORTTERMSRESPONSE']._serialized_start=1012
+  _globals['_IMPORTTERMSRESPONSE']._serialized_end=1112
+  _globals['_BATCHTERMRESULT']._serialized_start=1114
+  _globals['_BATCHTERMRESULT']._serialized_end=1200
+  _globals['_BATCHCREATETERMSREQUEST']._serialized_start=1202
+  _globals['_BATCHCREATETERMSREQUEST']._serialized_end=1262
+  _globals['_BATCHCREATETERMSRESPONSE']._serialized_start=1264
+  _globals['_BATCHCREATETERMSRESPONSE']._serialized_end=1325
+  _globals['_BATCHGETTERMSREQUEST']._serialized_start=1327
+  _globals['_BATCHGETTERMSREQUEST']._serialized_end=1414
+  _globals['_BATCHGETTERMSRESPONSE']._serialized_start=1416
+  _globals['_BATCHGETTERMSRESPONSE']._serialized_end=1474
+  _globals['_BATCHDELETETERMSREQUEST']._serialized_start=1476
+  _globals['_BATCHDELETETERMSREQUEST']._serialized_end=1519
+  _globals['_BATCHDELETETERMSRESPONSE']._serialized_start=1521
+  _globals['_BATCHDELETETERMSRESPONSE']._serialized_end=1582
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=1584
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=1604
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=1606
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=1660
+  _globals['_CACHESTATSREQUEST']._serialized_start=1662
+  _globals['_CACHESTATSREQUEST']._serialized_end=1681
+  _globals['_CACHESTATSRESPONSE']._serialized_start=1683
+  _globals['_CACHESTATSRESPONSE']._serialized_end=1804
+  _globals['_GLOSSARYSERVICE']._serialized_start=1807
+  _globals['_GLOSSARYSERVICE']._serialized_end=2533
 # @@protoc_insertion_point(module_scope)
@@ -60,6 +60,31 @@ class GlossaryServiceStub(object):
                 request_serializer=glossary__pb2.DeleteTermRequest.SerializeToString,
                 response_deserializer=glossary__pb2.DeleteTermResponse.FromString,
                 _registered_method=True)
+        self.StreamTerms = channel.unary_stream(
+                '/GlossaryService/StreamTerms',
+                request_serializer=glossary__pb2.StreamTermsRequest.SerializeToString,
+                response_deserializer=glossary__pb2.Term.FromString,
+                _registered_method=True)
+        self.ImportTerms = channel.stream_unary(
+                '/GlossaryService/ImportTerms',
+                request_serializer=glossary__pb2.CreateTermRequest.SerializeToString,
+                response_deserializer=glossary__pb2.ImportTermsResponse.FromString,
+                _registered_method=True)
+        self.BatchCreateTerms = channel.unary_unary(
+                '/GlossaryService/BatchCreateTerms',
+                request_serializer=glossary__pb2.BatchCreateTermsRequest.SerializeToString,
+                response_deserializer=glossary__pb2.BatchCreateTermsResponse.FromString,
+                _registered_method=True)
+        self.BatchGetTerms = channel.unary_unary(
+                '/GlossaryService/BatchGetTerms',
+                request_serializer=glossary__pb2.BatchGetTermsRequest.SerializeToString,
+                response_deserializer=glossary__pb2.BatchGetTermsResponse.FromString,
+                _registered_method=True)
+        self.BatchDeleteTerms = channel.unary_unary(
+                '/GlossaryService/BatchDeleteTerms',
+                request_serializer=glossary__pb2.BatchDeleteTermsRequest.SerializeToString,
+                response_deserializer=glossary__pb2.BatchDeleteTermsResponse.FromString,
+                _registered_method=True)
         self.SearchTerms = channel.unary_unary(
                 '/GlossaryService/SearchTerms',
                 request_serializer=glossary__pb2.SearchTermsRequest.SerializeToString,
@@ -70,6 +95,11 @@ class GlossaryServiceStub(object):
                 request_serializer=glossary__pb2.HealthCheckRequest.SerializeToString,
                 response_deserializer=glossary__pb2.HealthCheckResponse.FromString,
                 _registered_method=True)
+        self.GetCacheStats = channel.unary_unary(
+                '/GlossaryService/GetCacheStats',
+                request_serializer=glossary__pb2.CacheStatsRequest.SerializeToString,
+                response_deserializer=glossary__pb2.CacheStatsResponse.FromString,
+                _registered_method=True)
 
 
 class GlossaryServiceServicer(object):
@@ -111,6 +141,41 @@ class GlossaryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamTerms(self, request, context):
+        """Выгрузить все термины по возрастанию ID потоком из одного снимка данных
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ImportTerms(self, request_iterator, context):
+        """Импортировать поток терминов пачками: одна транзакция и запись на диск на пачку
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchCreateTerms(self, request, context):
+        """Создать пакет терминов одной транзакцией
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetTerms(self, request, context):
+        """Получить термины по списку ID
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchDeleteTerms(self, request, context):
+        """Удалить пакет терминов одной транзакцией
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SearchTerms(self, request, context):
         """Поиск терминов по запросу
         """
@@ -125,6 +190,13 @@ class GlossaryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetCacheStats(self, request, context):
+        """Статистика кэша результатов списка и поиска
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GlossaryServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -153,6 +225,31 @@ def add_GlossaryServiceServicer_to_server(servicer, server):
                     request_deserializer=glossary__pb2.DeleteTermRequest.FromString,
                     response_serializer=glossary__pb2.DeleteTermResponse.SerializeToString,
             ),
+            'StreamTerms': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamTerms,
+                    request_deserializer=glossary__pb2.StreamTermsRequest.FromString,
+                    response_serializer=glossary__pb2.Term.SerializeToString,
+            ),
+            'ImportTerms': grpc.stream_unary_rpc_method_handler(
+                    servicer.ImportTerms,
+                    request_deserializer=glossary__pb2.CreateTermRequest.FromString,
+                    response_serializer=glossary__pb2.ImportTermsResponse.SerializeToString,
+            ),
+            'BatchCreateTerms': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchCreateTerms,
+                    request_deserializer=glossary__pb2.BatchCreateTermsRequest.FromString,
+                    response_serializer=glossary__pb2.BatchCreateTermsResponse.SerializeToString,
+            ),
+            'BatchGetTerms': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetTerms,
+                    request_deserializer=glossary__pb2.BatchGetTermsRequest.FromString,
+                    response_serializer=glossary__pb2.BatchGetTermsResponse.SerializeToString,
+            ),
+            'BatchDeleteTerms': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchDeleteTerms,
+                    request_deserializer=glossary__pb2.BatchDeleteTermsRequest.FromString,
+                    response_serializer=glossary__pb2.BatchDeleteTermsResponse.SerializeToString,
+            ),
             'SearchTerms': grpc.unary_unary_rpc_method_handler(
                     servicer.SearchTerms,
                     request_deserializer=glossary__pb2.SearchTermsRequest.FromString,
@@ -163,6 +260,11 @@ def add_GlossaryServiceServicer_to_server(servicer, server):
                     request_deserializer=glossary__pb2.HealthCheckRequest.FromString,
                     response_serializer=glossary__pb2.HealthCheckResponse.SerializeToString,
             ),
+            'GetCacheStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCacheStats,
+                    request_deserializer=glossary__pb2.CacheStatsRequest.FromString,
+                    response_serializer=glossary__pb2.CacheStatsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'GlossaryService', rpc_method_handlers)
@@ -310,6 +412,141 @@ class GlossaryService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StreamTerms(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/GlossaryService/StreamTerms',
+            glossary__pb2.StreamTermsRequest.SerializeToString,
+            glossary__pb2.Term.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ImportTerms(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/GlossaryService/ImportTerms',
+            glossary__pb2.CreateTermRequest.SerializeToString,
+            glossary__pb2.ImportTermsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchCreateTerms(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GlossaryService/BatchCreateTerms',
+            glossary__pb2.BatchCreateTermsRequest.SerializeToString,
+            glossary__pb2.BatchCreateTermsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchGetTerms(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GlossaryService/BatchGetTerms',
+            glossary__pb2.BatchGetTermsRequest.SerializeToString,
+            glossary__pb2.BatchGetTermsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchDeleteTerms(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GlossaryService/BatchDeleteTerms',
+            glossary__pb2.BatchDeleteTermsRequest.SerializeToString,
+            glossary__pb2.BatchDeleteTermsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def SearchTerms(request,
             target,
@@ -363,3 +600,30 @@ class GlossaryService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetCacheStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/GlossaryService/GetCacheStats',
+            glossary__pb2.CacheStatsRequest.SerializeToString,
+            glossary__pb2.CacheStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,6 +1,26 @@
 """
 Locust тесты для gRPC API глоссария
 Тестирует gRPC сервис на порту 50052
+
+GRPC_WALK=cursor|offset - вместо смешанной нагрузки каждый пользователь
+обходит весь корпус страницами по GRPC_WALK_PER_PAGE (50) терминов: по
+next_page_token или по номеру страницы. Запросы группируются по глубине
+страницы (1-10, 11-100, ...): при курсоре задержка не зависит от глубины.
+
+GRPC_PROJECTION=1 - вместо смешанной нагрузки пользователи поровну
+запрашивают страницу из 100 терминов целиком и только с полями
+PROJECTION_FIELDS (read_mask id, term, related_terms), как нужно MindMap.
+
+GRPC_BATCH=1,10,100 - вместо смешанной нагрузки пользователи создают,
+читают и удаляют термины пакетами (BatchCreateTerms, BatchGetTerms,
+BatchDeleteTerms) случайного размера из списка. Размер пакета входит в
+имя запроса: терминов в секунду = RPS запроса * размер.
+
+GRPC_CHANNEL_PER_USER=1 - у каждого пользователя свое TCP соединение.
+По умолчанию каналы с одинаковым адресом делят одно соединение, и при
+нескольких процессах сервера (GLOSSARY_GRPC_PROCESSES) вся нагрузка
+Locust уходит в один процесс: SO_REUSEPORT распределяет соединения, а
+не запросы.
 """
 import os
 import random
@@ -21,23 +41,49 @@ from grpc_gen.glossary_pb2 import (
     GetTermsRequest,
     GetTermRequest,
     CreateTermRequest,
-    SearchTermsRequest
+    SearchTermsRequest,
+    BatchCreateTermsRequest,
+    BatchGetTermsRequest,
+    BatchDeleteTermsRequest
 )
 from grpc_gen.glossary_pb2_grpc import GlossaryServiceStub
 
+WALK = os.getenv("GRPC_WALK")
+WALK_PER_PAGE = int(os.getenv("GRPC_WALK_PER_PAGE", "50"))
+PROJECTION = os.getenv("GRPC_PROJECTION", "0") == "1"
+PROJECTION_FIELDS = ["id", "term", "related_terms"]
+BATCH_SIZES = [int(size) for size in os.getenv("GRPC_BATCH", "").split(",") if size.strip()]
+CHANNEL_PER_USER = os.getenv("GRPC_CHANNEL_PER_USER", "0") == "1"
+
+
+def open_channel():
+    """Канал к GRPC_TARGET; с GRPC_CHANNEL_PER_USER - на своем соединении"""
+    target = os.getenv("GRPC_TARGET", "127.0.0.1:50052")
+    options = [("grpc.use_local_subchannel_pool", 1)] if CHANNEL_PER_USER else None
+    return grpc.insecure_channel(target, options=options)
+
+
+def depth_bucket(page):
+    """Группа глубины страницы для статистики: 1-10, 11-100, 101-1000, ..."""
+    upper = 10
+    while page > upper:
+        upper *= 10
+    return f"{upper // 10 + 1 if upper > 10 else 1}-{upper}"
+
 
 class GlossaryGrpcUser(User):
     """
     Класс пользователя для тестирования gRPC API глоссария
     Моделирует реалистичное поведение: чтение терминов, поиск, создание
     """
+    # При обходе корпуса, сравнении проекции и пакетах работают отдельные пользователи ниже
+    abstract = WALK is not None or PROJECTION or bool(BATCH_SIZES)
     wait_time = between(0.2, 1.2)  # Пауза между запросами 0.2-1.2 секунды
     
     def on_start(self):
         """Инициализация при старте пользователя"""
-        # Получаем адрес gRPC сервера из переменной окружения или используем по умолчанию
-        target = os.getenv("GRPC_TARGET", "127.0.0.1:50052")
-        self.channel = grpc.insecure_channel(target)
+        # Адрес gRPC сервера берется из переменной окружения GRPC_TARGET
+        self.channel = open_channel()
         self.stub = GlossaryServiceStub(self.channel)
         self.term_ids = []
         self.created_ids = []
@@ -185,3 +231,122 @@ class GlossaryGrpcUser(User):
         except Exception as e:
             self._fire_request("CreateTerm", start_time, exception=e)
 
+
+
+class GlossaryGrpcWalkUser(User):
+    """
+    Пользователь, который обходит весь корпус страница за страницей
+    (GRPC_WALK=cursor - по next_page_token, GRPC_WALK=offset - по номеру страницы)
+    """
+    abstract = WALK is None
+    wait_time = between(0.05, 0.1)
+    _fire_request = GlossaryGrpcUser._fire_request
+    on_stop = GlossaryGrpcUser.on_stop
+    
+    def on_start(self):
+        self.channel = open_channel()
+        self.stub = GlossaryServiceStub(self.channel)
+        self.restart()
+    
+    def restart(self):
+        self.page = 1
+        self.page_token = ""
+    
+    @task
+    def next_page(self):
+        name = f"GetTerms [{WALK} pages {depth_bucket(self.page)}]"
+        start_time = time.perf_counter()
+        try:
+            if WALK == "cursor":
+                request = GetTermsRequest(per_page=WALK_PER_PAGE, page_token=self.page_token)
+            else:
+                request = GetTermsRequest(page=self.page, per_page=WALK_PER_PAGE)
+            response = self.stub.GetTerms(request, timeout=3.0)
+            self._fire_request(name, start_time, response=response)
+        except Exception as e:
+            self._fire_request(name, start_time, exception=e)
+            self.restart()
+            return
+        self.page += 1
+        if WALK == "cursor":
+            self.page_token = response.next_page_token
+            if not self.page_token:
+                self.restart()
+        elif not response.terms or (self.page - 1) * WALK_PER_PAGE >= response.total:
+            self.restart()
+
+
+class GlossaryGrpcProjectionUser(User):
+    """
+    Пользователь для сравнения полного списка и проекции (GRPC_PROJECTION=1)
+    """
+    abstract = not PROJECTION
+    wait_time = between(0.2, 1.2)
+    _fire_request = GlossaryGrpcUser._fire_request
+    on_stop = GlossaryGrpcUser.on_stop
+    
+    def on_start(self):
+        self.channel = open_channel()
+        self.stub = GlossaryServiceStub(self.channel)
+    
+    def _get_terms(self, name, request):
+        start_time = time.perf_counter()
+        try:
+            response = self.stub.GetTerms(request, timeout=3.0)
+            self._fire_request(name, start_time, response=response)
+        except Exception as e:
+            self._fire_request(name, start_time, exception=e)
+    
+    @task
+    def list_full(self):
+        self._get_terms("GetTerms [full]", GetTermsRequest(page=1, per_page=100))
+    
+    @task
+    def list_projected(self):
+        request = GetTermsRequest(page=1, per_page=100, read_mask={"paths": PROJECTION_FIELDS})
+        self._get_terms("GetTerms [read_mask]", request)
+
+
+class GlossaryGrpcBatchUser(User):
+    """
+    Пользователь пакетных операций (GRPC_BATCH=1,10,100): создает пакет
+    терминов, читает его по ID и удаляет
+    """
+    abstract = not BATCH_SIZES
+    wait_time = between(0.05, 0.1)
+    _fire_request = GlossaryGrpcUser._fire_request
+    on_stop = GlossaryGrpcUser.on_stop
+    
+    def on_start(self):
+        self.channel = open_channel()
+        self.stub = GlossaryServiceStub(self.channel)
+    
+    def _call(self, name, method, request):
+        start_time = time.perf_counter()
+        try:
+            response = method(request, timeout=10.0)
+            self._fire_request(name, start_time, response=response)
+            return response
+        except Exception as e:
+            self._fire_request(name, start_time, exception=e)
+            return None
+    
+    @task
+    def batch_cycle(self):
+        size = random.choice(BATCH_SIZES)
+        request = BatchCreateTermsRequest(terms=[
+            CreateTermRequest(
+                term=f"Batch {random_string(6)}",
+                definition=f"Тестовое определение {random_string(20)}",
+                category="Тестовая категория",
+                related_terms=[random_string(5)]
+            )
+            for _ in range(size)
+        ])
+        response = self._call(f"BatchCreateTerms [n={size}]", self.stub.BatchCreateTerms, request)
+        if response is None:
+            return
+        ids = [result.term_id for result in response.results if result.code == 0]
+        self._call(f"BatchGetTerms [n={size}]", self.stub.BatchGetTerms, BatchGetTermsRequest(term_ids=ids))
+        self._call(f"BatchDeleteTerms [n={size}]", self.stub.BatchDeleteTerms,
+                   BatchDeleteTermsRequest(term_ids=ids))
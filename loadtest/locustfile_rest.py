@@ -1,10 +1,76 @@
 """
 Locust тесты для REST API глоссария
 Тестирует FastAPI сервис на порту 8000
+
+REST_CONDITIONAL=1 - условные запросы: пользователь запоминает ETag и тело
+ответа по каждому URL и отправляет If-None-Match; на 304 сервис не читает
+хранилище и не сериализует ответ, а тело не передается по сети.
+
+REST_ACCEPT_ENCODING - заголовок Accept-Encoding всех запросов (identity,
+gzip, br); по умолчанию - как у requests. REST_WIRE_FILE - JSON файл, куда
+после теста пишутся байты тел ответов на проводе (до распаковки) по
+каждому запросу: Locust считает размер уже распакованного тела.
+
+REST_FORMAT - формат ответов чтения через заголовок Accept: json (по
+умолчанию), protobuf (сообщения glossary.proto, как в gRPC) или msgpack.
+
+REST_WALK=cursor|offset - вместо смешанной нагрузки каждый пользователь
+обходит весь корпус страницами по REST_WALK_PER_PAGE (50) терминов: по
+курсору next_cursor или по номеру страницы. Запросы группируются по глубине
+страницы (1-10, 11-100, ...): при курсоре задержка не зависит от глубины.
+
+REST_PROJECTION=1 - вместо смешанной нагрузки пользователи поровну
+запрашивают страницу из 100 терминов целиком и только с полями
+PROJECTION_FIELDS (fields=id,term,related_terms), как нужно MindMap.
+
+REST_BATCH=1,10,100 - вместо смешанной нагрузки пользователи создают,
+читают и удаляют термины пакетами (POST /api/terms:batchCreate,
+:batchGet, :batchDelete) случайного размера из списка. Размер пакета
+входит в имя запроса: терминов в секунду = RPS запроса * размер.
 """
+import json
+import os
 import random
 import string
-from locust import HttpUser, task, between
+import msgpack
+from locust import HttpUser, task, between, events
+
+from grpc_gen.glossary_pb2 import GetTermsResponse
+
+FORMATS = {
+    "json": "application/json",
+    "protobuf": "application/x-protobuf",
+    "msgpack": "application/msgpack",
+}
+ACCEPT = FORMATS[os.getenv("REST_FORMAT", "json")]
+CONDITIONAL = os.getenv("REST_CONDITIONAL", "0") == "1"
+ACCEPT_ENCODING = os.getenv("REST_ACCEPT_ENCODING")
+WIRE_FILE = os.getenv("REST_WIRE_FILE")
+WALK = os.getenv("REST_WALK")
+WALK_PER_PAGE = int(os.getenv("REST_WALK_PER_PAGE", "50"))
+PROJECTION = os.getenv("REST_PROJECTION", "0") == "1"
+PROJECTION_FIELDS = "id,term,related_terms"
+BATCH_SIZES = [int(size) for size in os.getenv("REST_BATCH", "").split(",") if size.strip()]
+wire_bytes = {}  # имя запроса -> [запросов, байт на проводе]
+
+
+@events.request.add_listener
+def count_wire_bytes(name, response=None, **kwargs):
+    """Размер тела ответа до распаковки (Content-Length)"""
+    if response is None or not WIRE_FILE:
+        return
+    size = int(response.headers.get("Content-Length", len(response.content or b"")))
+    stats = wire_bytes.setdefault(name, [0, 0])
+    stats[0] += 1
+    stats[1] += size
+
+
+@events.quitting.add_listener
+def save_wire_bytes(**kwargs):
+    if WIRE_FILE:
+        with open(WIRE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({name: {"requests": n, "wire_bytes": size} for name, (n, size) in wire_bytes.items()},
+                      f, ensure_ascii=False, indent=2)
 
 
 def random_string(length=8):
@@ -12,32 +78,68 @@ def random_string(length=8):
     return ''.join(random.choice(string.ascii_lowercase) for _ in range(length))
 
 
+def term_ids_from(body, content_type):
+    """ID терминов из ответа GET /api/terms в любом из форматов"""
+    if content_type.startswith(FORMATS["protobuf"]):
+        return [term.id for term in GetTermsResponse.FromString(body).terms]
+    data = msgpack.unpackb(body) if content_type.startswith(FORMATS["msgpack"]) else json.loads(body)
+    return [term["id"] for term in data.get("terms", []) if "id" in term]
+
+
+def depth_bucket(page):
+    """Группа глубины страницы для статистики: 1-10, 11-100, 101-1000, ..."""
+    upper = 10
+    while page > upper:
+        upper *= 10
+    return f"{upper // 10 + 1 if upper > 10 else 1}-{upper}"
+
+
 class GlossaryRestUser(HttpUser):
     """
     Класс пользователя для тестирования REST API глоссария
     Моделирует реалистичное поведение: чтение терминов, поиск, создание
     """
+    # При обходе корпуса, сравнении проекции и пакетах работают отдельные пользователи ниже
+    abstract = WALK is not None or PROJECTION or bool(BATCH_SIZES)
     wait_time = between(0.2, 1.2)  # Пауза между запросами 0.2-1.2 секунды
     
     def on_start(self):
         """Инициализация при старте пользователя"""
         self.term_ids = []
         self.created_ids = []
+        self.etags = {}  # (url, params) -> (ETag, тело ответа, Content-Type)
+        self.client.headers["Accept"] = ACCEPT
+        if ACCEPT_ENCODING:
+            self.client.headers["Accept-Encoding"] = ACCEPT_ENCODING
         self.search_queries = ["vue", "dom", "api", "react", "data", "json", "component", "state"]
         # Загружаем список ID терминов для использования в тестах
         self.refresh_term_ids()
     
+    def get(self, url, name, params=None):
+        """GET запрос; (тело ответа, Content-Type) или None при ошибке
+        
+        В условном режиме отправляет сохраненный ETag и на 304 берет тело
+        из локальной копии.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        cached = self.etags.get(key) if CONDITIONAL else None
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = self.client.get(url, params=params, headers=headers, name=name)
+        if response.status_code == 304 and cached:
+            return cached[1:]
+        if response.status_code != 200:
+            return None
+        content_type = response.headers.get("Content-Type", "")
+        if CONDITIONAL and "ETag" in response.headers:
+            self.etags[key] = (response.headers["ETag"], response.content, content_type)
+        return response.content, content_type
+    
     def refresh_term_ids(self):
         """Обновляет список доступных ID терминов"""
         try:
-            response = self.client.get(
-                "/api/terms",
-                params={"page": 1, "per_page": 100},
-                name="GET /api/terms [refresh_ids]"
-            )
-            if response.status_code == 200:
-                data = response.json()
-                self.term_ids = [term["id"] for term in data.get("terms", []) if "id" in term]
+            response = self.get("/api/terms", "GET /api/terms [refresh_ids]", params={"page": 1, "per_page": 100})
+            if response is not None:
+                self.term_ids = term_ids_from(*response)
         except Exception as e:
             print(f"Ошибка при обновлении списка терминов: {e}")
     
@@ -57,11 +159,7 @@ class GlossaryRestUser(HttpUser):
         """
         page = random.randint(1, 3)
         per_page = random.choice([10, 20, 50])
-        self.client.get(
-            "/api/terms",
-            params={"page": page, "per_page": per_page},
-            name="GET /api/terms"
-        )
+        self.get("/api/terms", "GET /api/terms", params={"page": page, "per_page": per_page})
     
     @task(3)
     def get_term(self):
@@ -74,7 +172,7 @@ class GlossaryRestUser(HttpUser):
             return
         
         term_id = random.choice(self.term_ids)
-        self.client.get(f"/api/terms/{term_id}", name="GET /api/terms/{id}")
+        self.get(f"/api/terms/{term_id}", "GET /api/terms/{id}")
     
     @task(2)
     def search_terms(self):
@@ -83,7 +181,7 @@ class GlossaryRestUser(HttpUser):
         Вес: 2 (10% нагрузки)
         """
         query = random.choice(self.search_queries)
-        self.client.get(f"/api/terms/search/{query}", name="GET /api/terms/search/{query}")
+        self.get(f"/api/terms/search/{query}", "GET /api/terms/search/{query}")
     
     @task(1)
     def create_term(self):
@@ -110,3 +208,92 @@ class GlossaryRestUser(HttpUser):
                 if data["id"] not in self.term_ids:
                     self.term_ids.append(data["id"])
 
+
+
+class GlossaryRestWalkUser(HttpUser):
+    """
+    Пользователь, который обходит весь корпус страница за страницей
+    (REST_WALK=cursor - по курсору, REST_WALK=offset - по номеру страницы)
+    """
+    abstract = WALK is None
+    wait_time = between(0.05, 0.1)
+    
+    def on_start(self):
+        self.client.headers["Accept"] = FORMATS["json"]
+        self.restart()
+    
+    def restart(self):
+        self.page = 1
+        self.cursor = ""
+    
+    @task
+    def next_page(self):
+        params = {"per_page": WALK_PER_PAGE}
+        if WALK == "cursor":
+            params["cursor"] = self.cursor
+        else:
+            params["page"] = self.page
+        name = f"GET /api/terms [{WALK} pages {depth_bucket(self.page)}]"
+        response = self.client.get("/api/terms", params=params, name=name)
+        if response.status_code != 200:
+            self.restart()
+            return
+        data = response.json()
+        self.page += 1
+        if WALK == "cursor":
+            self.cursor = data.get("next_cursor")
+            if self.cursor is None:
+                self.restart()
+        elif not data["terms"] or (self.page - 1) * WALK_PER_PAGE >= data["total"]:
+            self.restart()
+
+
+class GlossaryRestProjectionUser(HttpUser):
+    """
+    Пользователь для сравнения полного списка и проекции (REST_PROJECTION=1)
+    """
+    abstract = not PROJECTION
+    wait_time = between(0.2, 1.2)
+    
+    def on_start(self):
+        self.client.headers["Accept"] = ACCEPT
+        if ACCEPT_ENCODING:
+            self.client.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    
+    @task
+    def list_full(self):
+        self.client.get("/api/terms", params={"page": 1, "per_page": 100},
+                        name="GET /api/terms [full]")
+    
+    @task
+    def list_projected(self):
+        self.client.get("/api/terms", params={"page": 1, "per_page": 100, "fields": PROJECTION_FIELDS},
+                        name="GET /api/terms [fields]")
+
+
+class GlossaryRestBatchUser(HttpUser):
+    """
+    Пользователь пакетных операций (REST_BATCH=1,10,100): создает пакет
+    терминов, читает его по ID и удаляет
+    """
+    abstract = not BATCH_SIZES
+    wait_time = between(0.05, 0.1)
+    
+    @task
+    def batch_cycle(self):
+        size = random.choice(BATCH_SIZES)
+        terms = [{
+            "term": f"Batch {random_string(6)}",
+            "definition": f"Тестовое определение {random_string(20)}",
+            "category": "Тестовая категория",
+            "related_terms": [random_string(5)]
+        } for _ in range(size)]
+        response = self.client.post("/api/terms:batchCreate", json={"terms": terms},
+                                    name=f"POST /api/terms:batchCreate [n={size}]")
+        if response.status_code != 200:
+            return
+        ids = [item["id"] for item in response.json()["results"] if item["status"] == 201]
+        self.client.post("/api/terms:batchGet", json={"ids": ids},
+                         name=f"POST /api/terms:batchGet [n={size}]")
+        self.client.post("/api/terms:batchDelete", json={"ids": ids},
+                         name=f"POST /api/terms:batchDelete [n={size}]")
@@ -0,0 +1,103 @@
+"""
+Стресс-тест HealthCheck под потоком записей в gRPC сервисе глоссария
+
+Проба раз в --interval секунд вызывает HealthCheck и меряет задержку.
+Сначала проба работает без нагрузки, затем параллельно с ней писатели
+непрерывно создают термины (CreateTerm). Сервер с пулом потоков
+(GLOSSARY_GRPC_SERVER=thread) выполняет не больше 10 RPC одновременно:
+когда писателей больше, все потоки пула ждут записи, и HealthCheck стоит
+в очереди за ними. Сервер grpc.aio (GLOSSARY_GRPC_SERVER=aio) отвечает на
+HealthCheck в цикле событий, пока записи ждут в пуле записи хранилища.
+Отказы RESOURCE_EXHAUSTED (лимит GLOSSARY_MAX_CONCURRENT_RPCS) считаются
+в rejected.
+
+Запуск (сервис уже запущен, из директории loadtest):
+    python stress_grpc_health.py --writers 32 --duration 20
+"""
+import argparse
+import threading
+import time
+import uuid
+
+import grpc
+
+from bench.common import percentile, print_table
+from grpc_gen.glossary_pb2 import CreateTermRequest, HealthCheckRequest
+from grpc_gen.glossary_pb2_grpc import GlossaryServiceStub
+
+
+def probe(stub, interval, stop, samples, errors):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            stub.HealthCheck(HealthCheckRequest())
+            samples.append((time.perf_counter() - start) * 1000)
+        except grpc.RpcError as e:
+            errors.append(e.code())
+        time.sleep(interval)
+
+
+def writer(stub, marker, stop, latencies, errors):
+    n = 0
+    while not stop.is_set():
+        n += 1
+        start = time.perf_counter()
+        try:
+            stub.CreateTerm(CreateTermRequest(
+                term=f"{marker}-{threading.get_ident()}-{n}",
+                definition="health isolation stress",
+                category="stress",
+            ))
+        except grpc.RpcError as e:
+            errors.append(e.code())
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+def run_phase(target, writers, duration, interval, marker):
+    stop = threading.Event()
+    samples, write_latencies, probe_errors, errors = [], [], [], []
+    with grpc.insecure_channel(target) as probe_channel, grpc.insecure_channel(target) as write_channel:
+        threads = [threading.Thread(target=probe, args=(GlossaryServiceStub(probe_channel), interval, stop,
+                                                        samples, probe_errors))]
+        threads += [threading.Thread(target=writer, args=(GlossaryServiceStub(write_channel), marker, stop,
+                                                          write_latencies, errors))
+                    for _ in range(writers)]
+        for t in threads:
+            t.start()
+        time.sleep(duration)
+        stop.set()
+        for t in threads:
+            t.join()
+    return samples, write_latencies, probe_errors, errors
+
+
+def summary(values):
+    if not values:
+        return ["-"] * 4
+    return [f"{percentile(values, 50):.1f}", f"{percentile(values, 95):.1f}",
+            f"{percentile(values, 99):.1f}", f"{max(values):.1f}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка HealthCheck под потоком записей")
+    parser.add_argument("--target", default="127.0.0.1:50052")
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20, help="Длительность каждой фазы, с")
+    parser.add_argument("--interval", type=float, default=0.02, help="Пауза между пробами, с")
+    args = parser.parse_args()
+
+    marker = f"health-{uuid.uuid4().hex[:8]}"
+    rows = []
+    for name, writers in (("idle", 0), (f"{args.writers} writers", args.writers)):
+        samples, write_latencies, probe_errors, errors = run_phase(args.target, writers, args.duration,
+                                                                   args.interval, marker)
+        rows.append([name, len(samples), len(probe_errors), *summary(samples),
+                     f"{len(write_latencies) / args.duration:.1f}", summary(write_latencies)[1], len(errors)])
+
+    print_table(["phase", "probes", "rejected", "health p50", "p95", "p99", "max", "writes/s", "write p95",
+                 "writes rejected"], rows)
+
+
+if __name__ == "__main__":
+    main()
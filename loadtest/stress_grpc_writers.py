@@ -0,0 +1,226 @@
+"""
+Стресс-тест конкурентных записей в gRPC сервис глоссария
+
+Писатели параллельно создают, изменяют и удаляют свои термины, читатели в
+это время листают страницы, ищут и читают термины по ID. Проверяется:
+- все выданные ID уникальны;
+- страницы GetTerms упорядочены по убыванию ID и без повторов;
+- поиск и GetTerm видят только целые записи (без смеси полей разных версий);
+- после теста каждый термин находится в последнем записанном состоянии,
+  удаленные возвращают NOT_FOUND;
+- с --data-file: файл данных (и журнал рядом с ним) читается и совпадает
+  с итоговым состоянием.
+
+Запуск (сервис уже запущен, из директории loadtest):
+    python stress_grpc_writers.py --writers 8 --readers 4 --ops 200
+    python stress_grpc_writers.py --data-file ../grpc-test-vkr-main/.../glossary-service/data/terms.json
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import uuid
+
+import grpc
+
+from grpc_gen.glossary_pb2 import (
+    CreateTermRequest,
+    DeleteTermRequest,
+    GetTermRequest,
+    GetTermsRequest,
+    SearchTermsRequest,
+    UpdateTermRequest,
+)
+from grpc_gen.glossary_pb2_grpc import GlossaryServiceStub
+
+
+class StressRun:
+    """Общее состояние прогона: ожидаемые записи и найденные нарушения"""
+
+    def __init__(self, stub, marker):
+        self.stub = stub
+        self.marker = marker
+        self.lock = threading.Lock()
+        self.expected = {}  # id -> (term, definition) или None для удаленных
+        self.errors = []
+        self.done = threading.Event()
+        self.reads = 0
+
+    def fail(self, message):
+        with self.lock:
+            self.errors.append(message)
+
+
+def writer(run, index, ops, seed):
+    rng = random.Random(seed)
+    own = []
+    for n in range(ops):
+        r = rng.random()
+        if r < 0.6 or not own:
+            text = f"{run.marker} w{index} n{n}"
+            term = run.stub.CreateTerm(CreateTermRequest(
+                term=text, definition=f"def {text}", category="stress"))
+            with run.lock:
+                if term.id in run.expected:
+                    run.errors.append(f"ID {term.id} выдан повторно")
+                run.expected[term.id] = (term.term, term.definition)
+            own.append(term.id)
+        elif r < 0.85:
+            term_id = rng.choice(own)
+            text = f"{run.marker} w{index} n{n} upd"
+            term = run.stub.UpdateTerm(UpdateTermRequest(
+                term_id=term_id, term=text, definition=f"def {text}"))
+            with run.lock:
+                run.expected[term_id] = (term.term, term.definition)
+        else:
+            term_id = own.pop(rng.randrange(len(own)))
+            run.stub.DeleteTerm(DeleteTermRequest(term_id=term_id))
+            with run.lock:
+                run.expected[term_id] = None
+
+
+def check_consistent(run, term, where):
+    """Поля одной записи должны относиться к одной версии"""
+    if term.term.startswith(run.marker) and term.definition != f"def {term.term}":
+        run.fail(f"{where}: термин {term.id} собран из разных версий: {term.term!r} / {term.definition!r}")
+
+
+def reader(run, seed):
+    rng = random.Random(seed)
+    while not run.done.is_set():
+        r = rng.random()
+        if r < 0.4:
+            response = run.stub.GetTerms(GetTermsRequest(
+                page=rng.randint(1, 3), per_page=rng.choice([10, 20, 50])))
+            ids = [term.id for term in response.terms]
+            if ids != sorted(set(ids), reverse=True):
+                run.fail(f"GetTerms: порядок или повторы в странице {ids}")
+            for term in response.terms:
+                check_consistent(run, term, "GetTerms")
+        elif r < 0.7:
+            response = run.stub.SearchTerms(SearchTermsRequest(query=run.marker))
+            ids = [term.id for term in response.results]
+            if len(ids) != len(set(ids)):
+                run.fail("SearchTerms: повторяющиеся ID в результатах")
+            for term in response.results:
+                if run.marker not in term.term and run.marker not in term.definition:
+                    run.fail(f"SearchTerms: термин {term.id} не содержит запрос")
+                check_consistent(run, term, "SearchTerms")
+        else:
+            with run.lock:
+                known = list(run.expected)
+            if not known:
+                continue
+            try:
+                term = run.stub.GetTerm(GetTermRequest(term_id=rng.choice(known)))
+                check_consistent(run, term, "GetTerm")
+            except grpc.RpcError as e:
+                if e.code() != grpc.StatusCode.NOT_FOUND:
+                    raise
+        run.reads += 1
+
+
+def guarded(run, target, *args):
+    """Ошибка RPC в потоке - тоже нарушение, а не только трассировка в stderr"""
+    try:
+        target(run, *args)
+    except grpc.RpcError as e:
+        run.fail(f"{target.__name__}: {e.code()} {e.details()}")
+
+
+def verify_final(run):
+    """Итоговое состояние через API совпадает с последними записями писателей"""
+    for term_id, expected in run.expected.items():
+        try:
+            term = run.stub.GetTerm(GetTermRequest(term_id=term_id))
+            if expected is None:
+                run.fail(f"Удаленный термин {term_id} все еще читается")
+            elif (term.term, term.definition) != expected:
+                run.fail(f"Термин {term_id}: ожидалось {expected}, получено {(term.term, term.definition)}")
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.NOT_FOUND or expected is not None:
+                run.fail(f"Термин {term_id}: {e.code()} {e.details()}")
+
+    alive = {term_id for term_id, expected in run.expected.items() if expected is not None}
+    found = [term.id for term in run.stub.SearchTerms(SearchTermsRequest(query=run.marker)).results]
+    if sorted(found) != sorted(alive):
+        run.fail(f"SearchTerms после теста: {len(found)} терминов вместо {len(alive)}")
+
+
+def load_data_file(path):
+    """Снимок terms.json с примененным журналом terms.journal (если он есть)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        terms = {term["id"]: term for term in json.load(f)}
+    journal_path = os.path.splitext(path)[0] + ".journal"
+    for segment in (journal_path + ".compacting", journal_path):
+        if not os.path.exists(segment):
+            continue
+        with open(segment, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                entry = json.loads(line)
+                if entry["op"] == "put":
+                    terms[entry["term"]["id"]] = entry["term"]
+                elif entry["op"] == "delete":
+                    terms.pop(entry["id"], None)
+    return terms
+
+
+def verify_data_file(run, path):
+    """Файл данных не порван и содержит итоговое состояние"""
+    try:
+        terms = load_data_file(path)
+    except ValueError as e:
+        run.fail(f"{path} не читается как JSON: {e}")
+        return
+    for term_id, expected in run.expected.items():
+        stored = terms.get(term_id)
+        if expected is None:
+            if stored is not None:
+                run.fail(f"Удаленный термин {term_id} остался в {path}")
+        elif stored is None or (stored["term"], stored["definition"]) != expected:
+            run.fail(f"Термин {term_id} в {path} не совпадает с последней записью")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стресс-тест конкурентных записей в gRPC сервис")
+    parser.add_argument("--target", default=os.getenv("GRPC_TARGET", "127.0.0.1:50052"))
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=200, help="Операций на одного писателя")
+    parser.add_argument("--data-file", help="Путь к terms.json сервиса для проверки файла после теста")
+    args = parser.parse_args()
+
+    channel = grpc.insecure_channel(args.target)
+    run = StressRun(GlossaryServiceStub(channel), marker=f"stress-{uuid.uuid4().hex[:8]}")
+
+    writers = [threading.Thread(target=guarded, args=(run, writer, i, args.ops, i)) for i in range(args.writers)]
+    readers = [threading.Thread(target=guarded, args=(run, reader, 1000 + i)) for i in range(args.readers)]
+    start = time.perf_counter()
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    run.done.set()
+    for thread in readers:
+        thread.join()
+
+    verify_final(run)
+    if args.data_file:
+        verify_data_file(run, args.data_file)
+
+    writes = args.writers * args.ops
+    print(f"Записей: {writes} за {elapsed:.2f} с ({writes / elapsed:.0f}/с), чтений: {run.reads}")
+    print(f"Терминов создано: {len(run.expected)}, нарушений: {len(run.errors)}")
+    for message in run.errors[:20]:
+        print("  " + message)
+    channel.close()
+    raise SystemExit(1 if run.errors else 0)
+
+
+if __name__ == "__main__":
+    main()
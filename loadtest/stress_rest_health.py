@@ -0,0 +1,91 @@
+"""
+Стресс-тест изоляции health-check от записей в REST сервисе глоссария
+
+Проба раз в --interval секунд запрашивает GET /api/health и меряет задержку.
+Сначала проба работает без нагрузки, затем параллельно с ней писатели
+непрерывно создают термины (POST /api/terms). Если запись на диск идет в
+цикле событий, задержка health-check во второй фазе растет вместе с
+длительностью записи; если запись вынесена из цикла событий - почти нет.
+
+Запуск (сервис уже запущен, из директории loadtest):
+    python stress_rest_health.py --writers 8 --duration 20
+"""
+import argparse
+import threading
+import time
+import uuid
+
+import requests
+
+from bench.common import percentile, print_table
+
+
+def probe(host, interval, stop, samples):
+    session = requests.Session()
+    while not stop.is_set():
+        start = time.perf_counter()
+        session.get(f"{host}/api/health").raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+        time.sleep(interval)
+
+
+def writer(host, marker, stop, latencies, errors):
+    session = requests.Session()
+    n = 0
+    while not stop.is_set():
+        n += 1
+        start = time.perf_counter()
+        response = session.post(f"{host}/api/terms", json={
+            "term": f"{marker}-{threading.get_ident()}-{n}",
+            "definition": "health isolation stress",
+            "category": "stress",
+            "related_terms": [],
+        })
+        if response.status_code == 200:
+            latencies.append((time.perf_counter() - start) * 1000)
+        else:
+            errors.append(response.status_code)
+
+
+def run_phase(host, writers, duration, interval, marker):
+    stop = threading.Event()
+    samples, write_latencies, errors = [], [], []
+    threads = [threading.Thread(target=probe, args=(host, interval, stop, samples))]
+    threads += [threading.Thread(target=writer, args=(host, marker, stop, write_latencies, errors))
+                for _ in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return samples, write_latencies, errors
+
+
+def summary(values):
+    if not values:
+        return ["-"] * 4
+    return [f"{percentile(values, 50):.1f}", f"{percentile(values, 95):.1f}",
+            f"{percentile(values, 99):.1f}", f"{max(values):.1f}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка health-check под потоком записей")
+    parser.add_argument("--host", default="http://127.0.0.1:8000")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="Длительность каждой фазы, с")
+    parser.add_argument("--interval", type=float, default=0.02, help="Пауза между пробами, с")
+    args = parser.parse_args()
+
+    marker = f"health-{uuid.uuid4().hex[:8]}"
+    rows = []
+    for name, writers in (("idle", 0), (f"{args.writers} writers", args.writers)):
+        samples, write_latencies, errors = run_phase(args.host, writers, args.duration, args.interval, marker)
+        rows.append([name, len(samples), *summary(samples), f"{len(write_latencies) / args.duration:.1f}",
+                     summary(write_latencies)[1], len(errors)])
+
+    print_table(["phase", "probes", "health p50", "p95", "p99", "max", "writes/s", "write p95", "errors"], rows)
+
+
+if __name__ == "__main__":
+    main()
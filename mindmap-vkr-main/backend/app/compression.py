@@ -0,0 +1,116 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Hashable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+
+def header_weights(value: str) -> Dict[str, float]:
+    """Веса q из заголовка вида Accept/Accept-Encoding: {"gzip": 1.0, "br": 0.5}"""
+    weights = {}
+    for part in value.split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    return weights
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Потоковое сжатие gzip: части тела сжимаются по мере поступления"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def gunzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Потоковая распаковка gzip тела запроса; ValueError на поврежденных данных"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        try:
+            data = decompressor.decompress(chunk)
+        except zlib.error as e:
+            raise ValueError(f"Некорректный gzip: {e}")
+        if data:
+            yield data
+    if not decompressor.eof:
+        raise ValueError("Некорректный gzip: поток оборван")
+
+
+class CompressionCache:
+    """LRU-кэш сжатых тел ответов REST API
+
+    Ключ включает ETag ответа, поэтому сжатая копия живет, пока не изменились
+    данные, и сжатие выполняется один раз на поколение данных, а не на
+    каждый запрос. Тела короче min_size не сжимаются. brotli используется,
+    если установлен пакет brotli; при равном весе в Accept-Encoding он
+    предпочтительнее gzip. max_entries=0 - сжатие на каждый запрос без кэша.
+    """
+
+    def __init__(self, max_entries: int = 256, min_size: int = 1024):
+        self.max_entries = max_entries
+        self.min_size = min_size
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Кодирование из Accept-Encoding (с учетом q) или None"""
+        if not accept_encoding:
+            return None
+        weights = header_weights(accept_encoding)
+        best = max(self.encodings, key=lambda e: weights.get(e, weights.get("*", 0.0)))
+        return best if weights.get(best, weights.get("*", 0.0)) > 0 else None
+
+    def get(self, key: Hashable, encoding: Optional[str]) -> Optional[bytes]:
+        """Закэшированное сжатое тело ответа key или None"""
+        if encoding is None:
+            return None
+        with self._lock:
+            body = self._entries.get((key, encoding))
+            if body is None:
+                return None
+            self._entries.move_to_end((key, encoding))
+            self.hits += 1
+            return body
+
+    def compress(self, key: Hashable, body: bytes, encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        """Сжатое тело и его кодирование; короткое тело или без encoding - как есть"""
+        if encoding is None or len(body) < self.min_size:
+            return None, body
+        cached = self.get(key, encoding)
+        if cached is not None:
+            return encoding, cached
+        compressed = compress(body, encoding)
+        with self._lock:
+            self.misses += 1
+            if self.max_entries > 0:
+                self._entries[(key, encoding)] = compressed
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return encoding, compressed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
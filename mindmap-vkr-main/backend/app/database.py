@@ -1,129 +1,111 @@
-import json
 import os
-from typing import Dict, List, Optional
-from app.models import TermCreate, TermUpdate, TermResponse
+import uuid
+from typing import AsyncIterator, Dict, List, Optional
+from app.compression import CompressionCache
+from app.fragments import FragmentCache
+from app.models import TermCreate, TermUpdate
+from app.query_cache import QueryCache
+from app.storage import AsyncStorage, Storage, open_storage
 
 
 class Database:
-    """Простая база данных на основе JSON файла"""
-    
-    def __init__(self, file_path: str = "data/terms.json"):
-        self.file_path = file_path
-        self.ensure_data_directory()
-        self.load_data()
-        
-    def ensure_data_directory(self):
-        """Создает директорию data если её нет"""
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-    
-    def load_data(self):
-        """Загружает данные из JSON файла"""
-        if os.path.exists(self.file_path):
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
-        else:
-            self.data = []
-            self.save_data()
-    
-    def save_data(self):
-        """Сохраняет данные в JSON файл"""
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
-    
-    def get_next_id(self) -> int:
-        """Возвращает следующий доступный ID"""
-        if not self.data:
-            return 1
-        return max(term.get('id', 0) for term in self.data) + 1
-    
-    def create_term(self, term_data: TermCreate) -> TermResponse:
+    """Доступ к глоссарию для REST API поверх выбранного хранилища
+
+    Хранилище (JSON файл или SQLite) выбирается переменной GLOSSARY_STORAGE.
+    Методы асинхронные (AsyncStorage): мутации уходят в пул потоков записи,
+    поэтому запись на диск не останавливает цикл событий.
+
+    Фильтрация, сортировка и пагинация идут в хранилище по сырым записям, а
+    наружу отдаются записи только нужной страницы. Тела ответов чтения
+    собираются из JSON-фрагментов терминов (fragments), размер кэша
+    фрагментов задается GLOSSARY_FRAGMENT_CACHE_SIZE. Кэш фрагментов
+    работает только с хранилищем stable_records (JSON).
+
+    ETag списка и поиска - поколение данных хранилища вместе со случайным
+    идентификатором экземпляра: поколения разных процессов и разных
+    запусков не совпадут, даже если равны их номера.
+
+    Сжатые тела больших ответов хранятся по ключу запроса и ETag
+    (compressed): GLOSSARY_COMPRESS_CACHE_SIZE записей, тела короче
+    GLOSSARY_COMPRESS_MIN_BYTES не сжимаются.
+    """
+
+    def __init__(self, storage: Optional[Storage] = None):
+        self.storage = AsyncStorage(storage if storage is not None else open_storage("data/terms.json"))
+        # Фрагмент действителен, пока хранилище отдает тот же объект записи:
+        # SQLite собирает новый словарь на каждый запрос, и кэш только промахивался бы
+        fragment_cache_size = int(os.getenv("GLOSSARY_FRAGMENT_CACHE_SIZE", "100000"))
+        self.fragments = FragmentCache(fragment_cache_size if self.storage.storage.stable_records else 0)
+        self.instance = uuid.uuid4().hex[:12]
+        self.compressed = CompressionCache(
+            max_entries=int(os.getenv("GLOSSARY_COMPRESS_CACHE_SIZE", "256")),
+            min_size=int(os.getenv("GLOSSARY_COMPRESS_MIN_BYTES", "1024")),
+        )
+
+    @property
+    def cache(self) -> QueryCache:
+        return self.storage.cache
+
+    async def etag(self) -> str:
+        """Слабый ETag текущего поколения данных"""
+        return f'W/"{self.instance}-{await self.storage.generation()}"'
+
+    async def create_term(self, term_data: TermCreate, wait: Optional[bool] = None) -> Dict:
         """Создает новый термина"""
-        term_id = self.get_next_id()
-        
-        term_dict = {
-            "id": term_id,
-            "term": term_data.term,
-            "definition": term_data.definition,
-            "category": term_data.category,
-            "related_terms": term_data.related_terms or []
-        }
-        
-        self.data.append(term_dict)
-        self.save_data()
-        
-        return TermResponse(**term_dict)
-    
-    def get_term(self, term_id: int) -> Optional[TermResponse]:
+        return await self.storage.create_term(
+            term=term_data.term,
+            definition=term_data.definition,
+            category=term_data.category,
+            related_terms=term_data.related_terms,
+            wait=wait,
+        )
+
+    async def get_term(self, term_id: int) -> Optional[Dict]:
         """Получает термина по ID"""
-        for term_data in self.data:
-            if term_data.get('id') == term_id:
-                return TermResponse(**term_data)
-        return None
-    
-    def get_all_terms(self, page: int = 1, per_page: int = 10, 
-                     search: Optional[str] = None) -> Dict:
-        """Получает все термины с пагинацией и поиском"""
-        terms = []
-        
-        for term_data in self.data:
-            if search:
-                search_lower = search.lower()
-                if (search_lower not in term_data["term"].lower() and 
-                    search_lower not in term_data["definition"].lower()):
-                    continue
-            
-            terms.append(TermResponse(**term_data))
-        
-        # Сортировка по ID (новые термины сверху)
-        terms.sort(key=lambda x: x.id, reverse=True)
-        
-        # Пагинация
-        total = len(terms)
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_terms = terms[start:end]
-        
-        return {
-            "terms": paginated_terms,
-            "total": total,
-            "page": page,
-            "per_page": per_page
-        }
-    
-    def update_term(self, term_id: int, term_data: TermUpdate) -> Optional[TermResponse]:
+        return await self.storage.get_term(term_id)
+
+    async def get_all_terms(self, page: int = 1, per_page: int = 10,
+                            search: Optional[str] = None, after_id: Optional[int] = None) -> Dict:
+        """Получает все термины с пагинацией (по номеру страницы или курсору) и поиском"""
+        return await self.storage.get_all_terms(page=page, per_page=per_page, search=search or "",
+                                                after_id=after_id)
+
+    async def update_term(self, term_id: int, term_data: TermUpdate,
+                          wait: Optional[bool] = None) -> Optional[Dict]:
         """Обновляет термина"""
-        for i, existing_term in enumerate(self.data):
-            if existing_term.get('id') == term_id:
-                # Обновляем только переданные поля
-                update_data = term_data.dict(exclude_unset=True)
-                for field, value in update_data.items():
-                    existing_term[field] = value
-                
-                self.save_data()
-                return TermResponse(**existing_term)
-        return None
-    
-    def delete_term(self, term_id: int) -> bool:
+        # Обновляем только переданные поля
+        updated = await self.storage.update_term(term_id, term_data.dict(exclude_unset=True), wait=wait)
+        self.fragments.invalidate(term_id)
+        return updated
+
+    async def delete_term(self, term_id: int, wait: Optional[bool] = None) -> bool:
         """Удаляет термина"""
-        for i, term_data in enumerate(self.data):
-            if term_data.get('id') == term_id:
-                del self.data[i]
-                self.save_data()
-                return True
-        return False
-    
-    def search_terms(self, query: str) -> List[TermResponse]:
+        deleted = await self.storage.delete_term(term_id, wait=wait)
+        self.fragments.invalidate(term_id)
+        return deleted
+
+    async def create_terms(self, items: List[TermCreate], wait: Optional[bool] = None) -> List[Dict]:
+        """Создает пакет терминов одной транзакцией"""
+        return await self.storage.create_terms([item.dict() for item in items], wait=wait)
+
+    async def get_terms(self, term_ids: List[int]) -> List[Optional[Dict]]:
+        """Получает термины по списку ID; None на месте отсутствующих"""
+        return await self.storage.get_terms(term_ids)
+
+    async def delete_terms(self, term_ids: List[int], wait: Optional[bool] = None) -> List[bool]:
+        """Удаляет пакет терминов одной транзакцией"""
+        deleted = await self.storage.delete_terms(term_ids, wait=wait)
+        for term_id in term_ids:
+            self.fragments.invalidate(term_id)
+        return deleted
+
+    def iter_terms(self, batch: int = 1000) -> AsyncIterator[List[Dict]]:
+        """Все термины по возрастанию ID пачками из одного снимка хранилища"""
+        return self.storage.iter_terms(batch)
+
+    async def search_terms(self, query: str) -> List[Dict]:
         """Поиск терминов по запросу"""
-        results = []
-        query_lower = query.lower()
-        
-        for term_data in self.data:
-            if (query_lower in term_data["term"].lower() or 
-                query_lower in term_data["definition"].lower() or
-                (term_data.get("category") and query_lower in term_data["category"].lower())):
-                results.append(TermResponse(**term_data))
-        
-        return results
+        return await self.storage.search_terms(query)
 
 
 # Глобальный экземпляр базы данных
@@ -0,0 +1,101 @@
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from app import glossary_pb2
+from app.compression import header_weights
+from app.fragments import FIELD_GETTERS, Fields, next_cursor, term_dict
+
+try:
+    import msgpack
+except ImportError:  # msgpack - необязательная зависимость
+    msgpack = None
+
+JSON = "application/json"
+PROTOBUF = "application/x-protobuf"
+MSGPACK = "application/msgpack"
+# Бинарные форматы, которые сервис умеет отдавать, и суффиксы их ETag
+BINARY = {PROTOBUF: "pb"}
+if msgpack is not None:
+    BINARY[MSGPACK] = "mp"
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Формат ответа по Accept
+
+    Бинарный формат выбирается, только если клиент назвал его явно и с весом
+    не меньше JSON; */* и application/* означают JSON, как и неизвестные
+    форматы, поэтому браузеры и прежние клиенты получают JSON.
+    """
+    if not accept:
+        return JSON
+    weights = header_weights(accept)
+    best = JSON
+    best_q = weights.get(JSON, weights.get("application/*", weights.get("*/*", 0.0)))
+    for media in BINARY:
+        q = weights.get(media, 0.0)
+        if q > 0 and q >= best_q:
+            best, best_q = media, q
+    return best
+
+
+def representation_etag(etag: str, media: str) -> str:
+    """ETag конкретного формата: у JSON и бинарных представлений он разный"""
+    if media == JSON:
+        return etag
+    return f'{etag[:-1]}-{BINARY[media]}"'
+
+
+def term_message(record: Mapping, fields: Fields = None) -> glossary_pb2.Term:
+    """Термин в сообщении Term из glossary.proto (как в gRPC сервисе), только поля fields"""
+    if fields is not None:
+        # В protobuf нет null: пустые category и related_terms просто не передаются
+        return glossary_pb2.Term(**{name: FIELD_GETTERS[name](record) or None for name in fields})
+    return glossary_pb2.Term(
+        id=record["id"],
+        term=record["term"],
+        definition=record["definition"],
+        category=record.get("category") or "",
+        related_terms=record.get("related_terms") or [],
+    )
+
+
+def encode_term(record: Mapping, media: str) -> bytes:
+    if media == PROTOBUF:
+        return term_message(record).SerializeToString()
+    return msgpack.packb(term_dict(record))
+
+
+def encode_list(result: Dict, media: str, cursor: bool = False, fields: Fields = None) -> bytes:
+    """Страница терминов: GetTermsResponse или словарь TermListResponse"""
+    if media == PROTOBUF:
+        return glossary_pb2.GetTermsResponse(
+            terms=[term_message(record, fields) for record in result["terms"]],
+            total=result["total"],
+            page=result["page"],
+            per_page=result["per_page"],
+            next_page_token=next_cursor(result) or "",
+        ).SerializeToString()
+    body = {
+        "terms": [term_dict(record, fields) for record in result["terms"]],
+        "total": result["total"],
+        "page": result["page"],
+        "per_page": result["per_page"],
+    }
+    if cursor:
+        body["next_cursor"] = next_cursor(result)
+    return msgpack.packb(body)
+
+
+def encode_search(results: Iterable[Mapping], query: str, media: str, fields: Fields = None) -> bytes:
+    """Результаты поиска: SearchTermsResponse или словарь SearchResponse"""
+    results: List[Mapping] = list(results)
+    if media == PROTOBUF:
+        return glossary_pb2.SearchTermsResponse(
+            results=[term_message(record, fields) for record in results],
+            query=query,
+            count=len(results),
+        ).SerializeToString()
+    return msgpack.packb({
+        "results": [term_dict(record, fields) for record in results],
+        "query": query,
+        "count": len(results),
+    })
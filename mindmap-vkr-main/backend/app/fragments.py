@@ -0,0 +1,154 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Кодирование как у JSONResponse FastAPI: байты ответа совпадают с response_model
+_encode = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+
+# detail элемента пакета, для которого нет термина
+NOT_FOUND = _encode("Термин не найден").encode("utf-8")
+# Поля термина в порядке TermResponse
+TERM_FIELDS = ("term", "definition", "category", "related_terms", "id")
+# Набор полей проекции в порядке TERM_FIELDS; None - все поля
+Fields = Optional[Tuple[str, ...]]
+
+
+def parse_fields(value: Optional[str]) -> Fields:
+    """Поля из параметра fields=id,term,...; ValueError на неизвестное поле"""
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names.difference(TERM_FIELDS)
+    if unknown:
+        raise ValueError(", ".join(sorted(unknown)))
+    fields = tuple(name for name in TERM_FIELDS if name in names)
+    return None if not fields or fields == TERM_FIELDS else fields
+
+
+# Значение поля TermResponse из записи хранилища
+FIELD_GETTERS = {
+    "term": lambda record: record["term"],
+    "definition": lambda record: record["definition"],
+    "category": lambda record: record.get("category"),
+    "related_terms": lambda record: record.get("related_terms", []),
+    "id": lambda record: record["id"],
+}
+
+
+def term_dict(record: Mapping, fields: Fields = None) -> Dict:
+    """Термин словарем в порядке полей TermResponse, только поля fields"""
+    if fields is not None:
+        return {name: FIELD_GETTERS[name](record) for name in fields}
+    return {
+        "term": record["term"],
+        "definition": record["definition"],
+        "category": record.get("category"),
+        "related_terms": record.get("related_terms", []),
+        "id": record["id"],
+    }
+
+
+def encode_term(record: Mapping, fields: Fields = None) -> bytes:
+    """JSON термина в порядке полей TermResponse"""
+    return _encode(term_dict(record, fields)).encode("utf-8")
+
+
+def ndjson(records: Iterable[Mapping], fields: Fields = None) -> bytes:
+    """Термины в NDJSON: JSON термина на строку, без кэша фрагментов"""
+    return b"".join([encode_term(record, fields) + b"\n" for record in records])
+
+
+def term_etag(fragment: bytes) -> str:
+    """Слабый ETag термина по его JSON: одинаков во всех процессах"""
+    return f'W/"{hashlib.blake2b(fragment, digest_size=8).hexdigest()}"'
+
+
+def next_cursor(result: Mapping) -> Optional[str]:
+    """Курсор следующей страницы (ID последнего термина) или None"""
+    after_id = result.get("next_after_id")
+    return str(after_id) if after_id is not None else None
+
+
+class FragmentCache:
+    """Кэш закодированного JSON каждого термина для ответов REST API
+
+    Ответы списка, поиска и чтения по ID собираются склейкой готовых
+    фрагментов вместо валидации моделей и кодирования всех терминов на
+    каждый запрос. Для проекции (параметр fields) рядом с полным фрагментом
+    хранится JSON только запрошенных полей. Запись хранилища неизменяема
+    (изменение публикует новую запись), поэтому фрагмент действителен, пока
+    хранилище отдает тот же объект: изменение термина, в том числе в другом
+    воркере, сразу дает промах. Изменение и удаление через этот процесс к
+    тому же явно удаляют фрагмент. Число терминов в кэше ограничено
+    max_entries (старейшие вытесняются), max_entries=0 отключает кэш.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # ID -> (запись, {набор полей: JSON}); проекции живут вместе с полным фрагментом
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fragment(self, record: Mapping, fields: Fields = None) -> bytes:
+        entry = self._entries.get(record["id"])
+        if entry is not None and entry[0] is record:
+            fragment = entry[1].get(fields)
+            if fragment is not None:
+                self.hits += 1
+                return fragment
+        else:
+            entry = None
+        self.misses += 1
+        fragment = encode_term(record, fields)
+        if self.max_entries > 0:
+            if entry is None:
+                entry = self._entries[record["id"]] = (record, {})
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            entry[1][fields] = fragment
+        return fragment
+
+    def term(self, record: Mapping) -> bytes:
+        with self._lock:
+            return self._fragment(record)
+
+    def array(self, records: Iterable[Mapping], fields: Fields = None) -> bytes:
+        """JSON массив терминов (только поля fields)"""
+        with self._lock:
+            return b"[" + b",".join([self._fragment(record, fields) for record in records]) + b"]"
+
+    def term_list(self, result: Dict, cursor: bool = False, fields: Fields = None) -> bytes:
+        """Тело ответа TermListResponse; next_cursor - только в курсорном режиме"""
+        body = b'{"terms":%s,"total":%d,"page":%d,"per_page":%d' % (
+            self.array(result["terms"], fields), result["total"], result["page"], result["per_page"])
+        if cursor:
+            body += b',"next_cursor":' + _encode(next_cursor(result)).encode("utf-8")
+        return body + b"}"
+
+    def search(self, results: Iterable[Mapping], query: str, fields: Fields = None) -> bytes:
+        """Тело ответа SearchResponse"""
+        results = list(results)
+        return b'{"results":%s,"query":%s,"count":%d}' % (
+            self.array(results, fields), _encode(query).encode("utf-8"), len(results))
+
+    def batch(self, term_ids: List[int], records: List[Optional[Mapping]], fields: Fields = None) -> bytes:
+        """Тело ответа BatchResponse пакетного чтения: термин или 404 на каждый ID"""
+        with self._lock:
+            items = [
+                b'{"status":200,"id":%d,"term":%s,"detail":null}' % (term_id, self._fragment(record, fields))
+                if record is not None else b'{"status":404,"id":%d,"term":null,"detail":%s}' % (term_id, NOT_FOUND)
+                for term_id, record in zip(term_ids, records)
+            ]
+        return b'{"results":[' + b",".join(items) + b"]}"
+
+    def invalidate(self, term_id: int):
+        with self._lock:
+            self._entries.pop(term_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
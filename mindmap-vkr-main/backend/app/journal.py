@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+
+class Journal:
+    """Append-only журнал изменений в формате JSON Lines.
+
+    Каждая строка - одна мутация: {"op": "put", "term": {...}} или
+    {"op": "delete", "id": N}. Записи идемпотентны, поэтому повторное
+    применение журнала к снимку, который уже содержит эти изменения,
+    ничего не портит.
+    """
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self.open()
+
+    def open(self):
+        """Открывает файл журнала на дозапись; size - текущий размер файла"""
+        self._file = open(self.path, 'ab')
+        self.inode = os.fstat(self._file.fileno()).st_ino
+        self.size = self._file.tell()
+        self.started_at = time.monotonic()
+
+    def append(self, entries: List[Dict]):
+        """Дописывает записи в конец журнала одной операцией write"""
+        data = b''.join(
+            json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+            for entry in entries
+        )
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.size += len(data)
+
+    def rotate(self, segment_path: str):
+        """Переносит текущий журнал в сегмент для компакции и открывает новый"""
+        self._file.close()
+        os.replace(self.path, segment_path)
+        self.open()
+
+    def reopen(self):
+        """Открывает журнал заново, если файл заменил другой процесс"""
+        self._file.close()
+        self.open()
+
+    def age(self) -> float:
+        """Время в секундах с момента последней ротации"""
+        return time.monotonic() - self.started_at
+
+    def close(self):
+        self._file.close()
+
+
+def read_journal(path: str) -> Iterator[Dict]:
+    """Читает записи журнала, пропуская недописанную последнюю строку"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                # Обрыв записи при аварийном завершении процесса
+                break
+            try:
+                yield json.loads(line)
+            except ValueError:
+                break
+
+
+def tail_journal(path: str, offset: int) -> Tuple[List[Dict], int]:
+    """Записи журнала после смещения offset и смещение конца последней целой строки"""
+    entries = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+            offset += len(line)
+    return entries, offset
+
+
+class JournalCompactor(threading.Thread):
+    """Фоновый поток, сворачивающий журнал в снимок по порогу размера или возраста"""
+
+    def __init__(self, journal: Journal, compact: Callable[[], None],
+                 max_bytes: int, max_age: float):
+        super().__init__(name="journal-compactor", daemon=True)
+        self.journal = journal
+        self.compact = compact
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._wakeup = threading.Event()
+
+    def wake(self):
+        """Будит поток, если журнал перерос порог по размеру"""
+        if self.journal.size >= self.max_bytes:
+            self._wakeup.set()
+
+    def run(self):
+        interval = min(self.max_age, 1.0)
+        while True:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            size = self.journal.size
+            if size >= self.max_bytes or (size > 0 and self.journal.age() >= self.max_age):
+                try:
+                    self.compact()
+                except OSError as e:
+                    print(f"Ошибка компакции журнала: {e}")
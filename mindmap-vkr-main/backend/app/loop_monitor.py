@@ -0,0 +1,172 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Optional
+
+# Верхние границы корзин гистограммы задержки, мс (последняя - все остальное)
+LAG_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(APP_DIR)
+
+
+def call_site(frame) -> str:
+    """Ближайший к вершине стека кадр кода приложения (file:line function)"""
+    innermost = frame
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(APP_DIR) and path != __file__:
+            break
+        frame = frame.f_back
+    frame = frame or innermost
+    path = os.path.relpath(frame.f_code.co_filename, PROJECT_DIR)
+    return f"{path}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+class LoopMonitor:
+    """Монитор задержки цикла событий и блокирующих вызовов
+
+    Задача в цикле событий засыпает на interval и меряет, на сколько позже
+    проснулась: это задержка (lag) цикла. Каждое пробуждение обновляет
+    heartbeat. Сторожевой поток замечает, что heartbeat не обновлялся дольше
+    interval + threshold, снимает стек потока цикла событий и записывает
+    место вызова, которое держит цикл. Длительность блокировки узнается,
+    когда цикл освобождается, и добавляется к этому месту.
+    """
+
+    def __init__(self, interval: float = 0.02, threshold: float = 0.1,
+                 max_samples: int = 10000, stack_depth: int = 12):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=max_samples)
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id = None
+        self._heartbeat = time.monotonic()
+        self._episode: Optional[str] = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._histogram = [0] * (len(LAG_BUCKETS_MS) + 1)
+            self._lag_count = 0
+            self._lag_max = 0.0
+            self._sites: Dict[str, Dict] = {}
+            self._episodes = 0
+
+    def start(self):
+        """Запускает монитор; вызывается из работающего цикла событий"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._heartbeat = time.monotonic()
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self._record_lag(max(loop.time() - started - self.interval, 0.0))
+
+    def _record_lag(self, lag: float):
+        lag_ms = lag * 1000
+        with self._lock:
+            self._samples.append(lag_ms)
+            self._histogram[bisect_left(LAG_BUCKETS_MS, lag_ms)] += 1
+            self._lag_count += 1
+            self._lag_max = max(self._lag_max, lag_ms)
+            # Блокировка, замеченная сторожем, закончилась: ее длительность известна
+            site = self._sites.get(self._episode) if self._episode else None
+            if site is not None:
+                site["total_ms"] += lag_ms
+                site["max_ms"] = max(site["max_ms"], lag_ms)
+            self._episode = None
+
+    def _watch(self):
+        poll = min(self.interval, self.threshold) / 2
+        seen_heartbeat = None
+        while not self._stop.wait(poll):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked < self.threshold or heartbeat == seen_heartbeat:
+                continue
+            # Одна запись на эпизод: heartbeat не менялся с начала блокировки
+            seen_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._record_block(frame)
+
+    def _record_block(self, frame):
+        key = call_site(frame)
+        stack = traceback.format_stack(frame, limit=self.stack_depth)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = {"site": key, "count": 0, "total_ms": 0.0,
+                                           "max_ms": 0.0, "stack": []}
+            site["count"] += 1
+            site["stack"] = [line.rstrip() for line in stack]
+            self._episodes += 1
+            self._episode = key
+
+    def _percentile(self, ordered: List[float], p: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    def stats(self, top: int = 10) -> Dict:
+        """Гистограмма задержки и места вызовов, дольше всего державшие цикл"""
+        with self._lock:
+            ordered = sorted(self._samples)
+            histogram = [{"le_ms": bound, "count": count}
+                         for bound, count in zip(LAG_BUCKETS_MS + (None,), self._histogram)]
+            sites = sorted(self._sites.values(), key=lambda s: (s["total_ms"], s["count"]), reverse=True)
+            return {
+                "enabled": True,
+                "interval_ms": self.interval * 1000,
+                "threshold_ms": self.threshold * 1000,
+                "lag": {
+                    "samples": self._lag_count,
+                    "p50_ms": round(self._percentile(ordered, 50), 3),
+                    "p95_ms": round(self._percentile(ordered, 95), 3),
+                    "p99_ms": round(self._percentile(ordered, 99), 3),
+                    "max_ms": round(self._lag_max, 3),
+                    "histogram": histogram,
+                },
+                "blocking": {
+                    "episodes": self._episodes,
+                    "top": [{**site, "total_ms": round(site["total_ms"], 3), "max_ms": round(site["max_ms"], 3)}
+                            for site in sites[:top]],
+                },
+            }
+
+
+def monitor_from_env() -> Optional[LoopMonitor]:
+    """Монитор, если он включен GLOSSARY_LOOP_MONITOR=1"""
+    if os.getenv("GLOSSARY_LOOP_MONITOR", "0") != "1":
+        return None
+    return LoopMonitor(
+        interval=float(os.getenv("GLOSSARY_LOOP_SAMPLE_MS", "20")) / 1000,
+        threshold=float(os.getenv("GLOSSARY_LOOP_BLOCK_MS", "100")) / 1000,
+    )
@@ -1,15 +1,39 @@
-from fastapi import FastAPI, HTTPException, Query
+import json
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from typing import Optional
 
-from app.models import TermCreate, TermUpdate, TermResponse, TermListResponse
+from app.models import (TermCreate, TermUpdate, TermResponse, TermListResponse, SearchResponse,
+                        BatchCreateRequest, BatchIdsRequest, BatchResponse, ImportResponse)
+from app.compression import gunzip_stream, gzip_stream, header_weights
 from app.database import db
+from app.formats import JSON, encode_list, encode_search, encode_term, negotiate, representation_etag
+from app.fragments import Fields, ndjson, parse_fields, term_etag
+from app.loop_monitor import monitor_from_env
+
+# Монитор задержки цикла событий (GLOSSARY_LOOP_MONITOR=1)
+loop_monitor = monitor_from_env()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if loop_monitor is not None:
+        loop_monitor.start()
+    yield
+    if loop_monitor is not None:
+        await loop_monitor.stop()
+
 
 # Создаем приложение FastAPI
 app = FastAPI(
     title="Глоссарий терминов ВКР",
     description="API для управления глоссарием терминов выпускной квалификационной работы",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Настройка CORS для работы с фронтендом
@@ -22,6 +46,97 @@ app.add_middleware(
 )
 
 
+# Клиент может хранить ответ, но перед использованием обязан проверить его по ETag
+CACHE_CONTROL = "no-cache"
+# Проекция списка и поиска: в ответе только перечисленные поля терминов
+FIELDS_DESCRIPTION = "Поля терминов через запятую: id,term,definition,category,related_terms (по умолчанию все)"
+NDJSON = "application/x-ndjson"
+# Наибольшее число элементов в одном пакетном запросе
+BATCH_MAX_ITEMS = int(os.getenv("GLOSSARY_BATCH_MAX_ITEMS", "1000"))
+# Импорт: терминов в пачке, сколько ошибок вернуть и наибольшая длина строки NDJSON
+IMPORT_CHUNK_SIZE = int(os.getenv("GLOSSARY_IMPORT_CHUNK_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("GLOSSARY_IMPORT_MAX_ERRORS", "100"))
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+# Курсор - ID термина; больше int64 он не пройдет в параметр SQLite
+MAX_CURSOR = 2 ** 63 - 1
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[int]:
+    """ID из курсора; пустой курсор - первая страница, некорректный - 400"""
+    if not cursor:
+        return None
+    # isdigit пропускает цифры вроде "²", которые не разбирает int
+    if not (cursor.isascii() and cursor.isdecimal()) or int(cursor) > MAX_CURSOR:
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+    return int(cursor)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Слабое сравнение If-None-Match с ETag (RFC 9110)"""
+    if if_none_match is None:
+        return False
+    # "*" совпадает с любым текущим представлением
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/")
+               for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept, Accept-Encoding"}
+
+
+def encoded_response(body: bytes, media: str, encoding: Optional[str], etag: str) -> Response:
+    headers = cache_headers(etag)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=media, headers=headers)
+
+
+def body_response(body: bytes, key, media: str, encoding: Optional[str], etag: str) -> Response:
+    """Ответ с ETag; большое тело сжимается один раз на ключ и ETag"""
+    encoding, body = db.compressed.compress((key, etag), body, encoding)
+    return encoded_response(body, media, encoding, etag)
+
+
+def compressed_hit(key, media: str, encoding: Optional[str], etag: str) -> Optional[Response]:
+    """Готовый сжатый ответ из кэша: хранилище и сериализатор не нужны"""
+    body = db.compressed.get((key, etag), encoding)
+    return None if body is None else encoded_response(body, media, encoding, etag)
+
+
+def not_modified(if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    """Ответ 304 без тела, если у клиента актуальная копия"""
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+
+def projection(fields: Optional[str]) -> Fields:
+    """Поля терминов из параметра fields; неизвестное поле - ошибка 400"""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Неизвестные поля: {e}")
+
+
+def check_batch(size: int):
+    """Пакет больше BATCH_MAX_ITEMS - ошибка 400"""
+    if size > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Слишком большой пакет: {size} > {BATCH_MAX_ITEMS}")
+
+
+def validation_detail(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'body'}: {e['msg']}" for e in error.errors())
+
+
+def wait_commit(x_durability: Optional[str]) -> Optional[bool]:
+    """Режим фиксации из заголовка X-Durability (sync/async), иначе по умолчанию"""
+    if x_durability is None:
+        return None
+    return x_durability != "async"
+
+
 @app.get("/")
 async def read_root():
     """Корневой эндпоинт"""
@@ -36,51 +151,235 @@ async def read_root():
 async def get_terms(
     page: int = Query(1, ge=1, description="Номер страницы"),
     per_page: int = Query(10, ge=1, le=100, description="Количество терминов на странице"),
-    search: Optional[str] = Query(None, description="Поисковый запрос")
+    search: Optional[str] = Query(None, description="Поисковый запрос"),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor прошлой страницы; "
+                                                    "пустой - первая страница, page игнорируется"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
 ):
     """Получить список всех терминов с пагинацией и поиском"""
-    result = db.get_all_terms(page=page, per_page=per_page, search=search)
-    return TermListResponse(**result)
+    after_id = parse_cursor(cursor)
+    projected = projection(fields)
+    media = negotiate(accept)
+    # ETag поколения данных проверяется до чтения хранилища
+    etag = representation_etag(await db.etag(), media)
+    encoding = db.compressed.negotiate(accept_encoding)
+    key = ("list", media, page, per_page, search or "", cursor, projected)
+    cached = not_modified(if_none_match, etag) or compressed_hit(key, media, encoding, etag)
+    if cached:
+        return cached
+    result = await db.get_all_terms(page=page, per_page=per_page, search=search, after_id=after_id)
+    # Тело JSON из готовых фрагментов терминов; response_model остается для схемы OpenAPI
+    with_cursor = cursor is not None
+    body = (db.fragments.term_list(result, with_cursor, projected) if media == JSON
+            else encode_list(result, media, with_cursor, projected))
+    return body_response(body, key, media, encoding, etag)
+
+
+async def export_lines(fields: Fields):
+    async for chunk in db.iter_terms():
+        yield ndjson(chunk, fields)
+
+
+@app.get("/api/terms/export")
+async def export_terms(fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+                       accept_encoding: Optional[str] = Header(None)):
+    """Выгрузить все термины по возрастанию ID в NDJSON (JSON термина на строку)
+
+    Тело отдается частями по мере чтения одного снимка хранилища: память не
+    зависит от размера глоссария, первые строки уходят до чтения остальных.
+    С Accept-Encoding: gzip тело сжимается на лету.
+    """
+    projected = projection(fields)
+    body = export_lines(projected)
+    headers = {"Vary": "Accept-Encoding"}
+    if header_weights(accept_encoding or "").get("gzip", 0.0) > 0:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=NDJSON, headers=headers)
 
 
 @app.get("/api/terms/{term_id}", response_model=TermResponse)
-async def get_term(term_id: int):
+async def get_term(term_id: int, if_none_match: Optional[str] = Header(None),
+                   accept: Optional[str] = Header(None),
+                   accept_encoding: Optional[str] = Header(None)):
     """Получить информацию о конкретном термине"""
-    term = db.get_term(term_id)
+    term = await db.get_term(term_id)
     if not term:
         raise HTTPException(status_code=404, detail="Термин не найден")
-    return term
+    # ETag по содержимому термина: не меняется от изменений других терминов
+    fragment = db.fragments.term(term)
+    media = negotiate(accept)
+    etag = representation_etag(term_etag(fragment), media)
+    cached = not_modified(if_none_match, etag)
+    if cached:
+        return cached
+    body = fragment if media == JSON else encode_term(term, media)
+    return body_response(body, ("term", media), media, db.compressed.negotiate(accept_encoding), etag)
 
 
 @app.post("/api/terms", response_model=TermResponse)
-async def create_term(term_data: TermCreate):
+async def create_term(term_data: TermCreate, x_durability: Optional[str] = Header(None)):
     """Добавить новый термина в глоссарий"""
-    return db.create_term(term_data)
+    return await db.create_term(term_data, wait=wait_commit(x_durability))
 
 
 @app.put("/api/terms/{term_id}", response_model=TermResponse)
-async def update_term(term_id: int, term_data: TermUpdate):
+async def update_term(term_id: int, term_data: TermUpdate,
+                      x_durability: Optional[str] = Header(None)):
     """Обновить существующий термина"""
-    term = db.update_term(term_id, term_data)
+    term = await db.update_term(term_id, term_data, wait=wait_commit(x_durability))
     if not term:
         raise HTTPException(status_code=404, detail="Термин не найден")
     return term
 
 
 @app.delete("/api/terms/{term_id}")
-async def delete_term(term_id: int):
+async def delete_term(term_id: int, x_durability: Optional[str] = Header(None)):
     """Удалить термина из глоссария"""
-    success = db.delete_term(term_id)
+    success = await db.delete_term(term_id, wait=wait_commit(x_durability))
     if not success:
         raise HTTPException(status_code=404, detail="Термин не найден")
     return {"message": "Термин успешно удален"}
 
 
-@app.get("/api/terms/search/{query}")
-async def search_terms(query: str):
+@app.post("/api/terms:batchCreate", response_model=BatchResponse)
+async def batch_create_terms(batch: BatchCreateRequest, x_durability: Optional[str] = Header(None)):
+    """Создать пакет терминов одной транзакцией
+
+    Элементы, не прошедшие проверку TermCreate, получают статус 422 и не
+    создаются; остальные создаются вместе (статус 201).
+    """
+    check_batch(len(batch.terms))
+    results = [None] * len(batch.terms)
+    items, positions = [], []
+    for i, item in enumerate(batch.terms):
+        try:
+            items.append(TermCreate.model_validate(item))
+            positions.append(i)
+        except ValidationError as e:
+            results[i] = {"status": 422, "detail": validation_detail(e)}
+    created = await db.create_terms(items, wait=wait_commit(x_durability))
+    for i, term in zip(positions, created):
+        results[i] = {"status": 201, "id": term["id"], "term": term}
+    return {"results": results}
+
+
+@app.post("/api/terms:batchGet", response_model=BatchResponse)
+async def batch_get_terms(batch: BatchIdsRequest,
+                          fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
+    """Получить термины по списку ID; отсутствующие - статус 404"""
+    check_batch(len(batch.ids))
+    projected = projection(fields)
+    records = await db.get_terms(batch.ids)
+    return Response(db.fragments.batch(batch.ids, records, projected), media_type=JSON)
+
+
+@app.post("/api/terms:batchDelete", response_model=BatchResponse)
+async def batch_delete_terms(batch: BatchIdsRequest, x_durability: Optional[str] = Header(None)):
+    """Удалить пакет терминов одной транзакцией; отсутствующие - статус 404"""
+    check_batch(len(batch.ids))
+    deleted = await db.delete_terms(batch.ids, wait=wait_commit(x_durability))
+    return {"results": [
+        {"status": 200, "id": term_id, "detail": "Термин успешно удален"} if success
+        else {"status": 404, "id": term_id, "detail": "Термин не найден"}
+        for term_id, success in zip(batch.ids, deleted)
+    ]}
+
+
+async def ndjson_lines(chunks, max_bytes: int):
+    """Непустые строки NDJSON с номерами (с 1); строка длиннее max_bytes - (номер, None)"""
+    number = 0
+    buffer = b""
+    oversized = False
+    async for data in chunks:
+        lines = (buffer + data).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            number += 1
+            if oversized or len(line) > max_bytes:
+                oversized = False
+                yield number, None
+            elif line.strip():
+                yield number, line
+        if len(buffer) > max_bytes:
+            # Хвост длинной строки отбрасывается до ее конца
+            oversized = True
+            buffer = b""
+    if oversized or len(buffer) > max_bytes:
+        yield number + 1, None
+    elif buffer.strip():
+        yield number + 1, buffer
+
+
+@app.post("/api/terms:import", response_model=ImportResponse)
+async def import_terms(request: Request, x_durability: Optional[str] = Header(None)):
+    """Импортировать термины из тела NDJSON (объект TermCreate на строку)
+
+    Тело читается потоком (Content-Encoding: gzip распаковывается на лету),
+    термины создаются пачками по GLOSSARY_IMPORT_CHUNK_SIZE: одна транзакция
+    и одна запись на диск на пачку, в памяти только текущая пачка. Строки с
+    некорректным JSON или не прошедшие проверку TermCreate пропускаются.
+    """
+    wait = wait_commit(x_durability)
+    body = request.stream()
+    if request.headers.get("content-encoding", "").lower() == "gzip":
+        body = gunzip_stream(body)
+    summary = {"created": 0, "failed": 0, "chunks": 0, "errors": []}
+
+    def fail(line: int, detail: str):
+        summary["failed"] += 1
+        if len(summary["errors"]) < IMPORT_MAX_ERRORS:
+            summary["errors"].append({"line": line, "detail": detail})
+
+    async def flush(chunk):
+        summary["created"] += len(await db.create_terms(chunk, wait=wait))
+        summary["chunks"] += 1
+
+    chunk = []
+    try:
+        async for number, line in ndjson_lines(body, IMPORT_MAX_LINE_BYTES):
+            if line is None:
+                fail(number, f"Строка длиннее {IMPORT_MAX_LINE_BYTES} байт")
+                continue
+            try:
+                chunk.append(TermCreate.model_validate(json.loads(line)))
+            except ValueError as e:
+                # ValidationError - тоже ValueError
+                fail(number, validation_detail(e) if isinstance(e, ValidationError) else "Некорректный JSON")
+                continue
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                await flush(chunk)
+                chunk = []
+    except ValueError as e:
+        # Поврежденный gzip: созданные пачки остаются, остаток тела не читается
+        fail(0, str(e))
+    if chunk:
+        await flush(chunk)
+    return summary
+
+
+@app.get("/api/terms/search/{query}", response_model=SearchResponse)
+async def search_terms(query: str,
+                       fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+                       if_none_match: Optional[str] = Header(None),
+                       accept: Optional[str] = Header(None),
+                       accept_encoding: Optional[str] = Header(None)):
     """Поиск терминов по запросу"""
-    results = db.search_terms(query)
-    return {"results": results, "query": query, "count": len(results)}
+    projected = projection(fields)
+    media = negotiate(accept)
+    etag = representation_etag(await db.etag(), media)
+    encoding = db.compressed.negotiate(accept_encoding)
+    key = ("search", media, query, projected)
+    cached = not_modified(if_none_match, etag) or compressed_hit(key, media, encoding, etag)
+    if cached:
+        return cached
+    results = await db.search_terms(query)
+    body = (db.fragments.search(results, query, projected) if media == JSON
+            else encode_search(results, query, media, projected))
+    return body_response(body, key, media, encoding, etag)
 
 
 @app.get("/api/health")
@@ -89,6 +388,23 @@ async def health_check():
     return {"status": "healthy", "message": "API работает корректно"}
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Статистика кэшей результатов, JSON-фрагментов и сжатых ответов"""
+    return {**db.cache.stats(), "fragments": db.fragments.stats(), "compressed": db.compressed.stats()}
+
+
+@app.get("/api/debug/loop")
+async def loop_stats(top: int = Query(10, ge=1, le=100), reset: bool = False):
+    """Задержка цикла событий и места блокирующих вызовов (GLOSSARY_LOOP_MONITOR=1)"""
+    if loop_monitor is None:
+        raise HTTPException(status_code=404, detail="Монитор цикла событий выключен")
+    stats = loop_monitor.stats(top=top)
+    if reset:
+        loop_monitor.reset()
+    return stats
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
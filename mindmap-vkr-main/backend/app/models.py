@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Optional, List
 
 
 class TermBase(BaseModel):
@@ -37,3 +37,49 @@ class TermListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    # Только при запросе с cursor: курсор следующей страницы или null
+    next_cursor: Optional[str] = None
+
+
+class SearchResponse(BaseModel):
+    """Модель ответа поиска"""
+    results: List[TermResponse]
+    query: str
+    count: int
+
+
+class BatchCreateRequest(BaseModel):
+    """Пакет терминов для создания; каждый элемент проверяется отдельно"""
+    terms: List[Any]
+
+
+class BatchIdsRequest(BaseModel):
+    """Список ID для пакетного чтения или удаления"""
+    ids: List[int]
+
+
+class BatchItemResult(BaseModel):
+    """Результат одного элемента пакета: HTTP статус и термин или ошибка"""
+    status: int
+    id: Optional[int] = None
+    term: Optional[TermResponse] = None
+    detail: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    """Результаты пакетной операции в порядке элементов запроса"""
+    results: List[BatchItemResult]
+
+
+class ImportLineError(BaseModel):
+    """Ошибка одной строки импорта NDJSON (строки нумеруются с 1)"""
+    line: int
+    detail: str
+
+
+class ImportResponse(BaseModel):
+    """Итог импорта: точные счетчики, первые ошибки и число пачек (записей на диск)"""
+    created: int
+    failed: int
+    chunks: int
+    errors: List[ImportLineError]
@@ -0,0 +1,142 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class OrderedIndex:
+    """Записи, упорядоченные по ID: двухуровневый B-tree из отсортированных блоков
+
+    Верхний уровень - список максимальных ключей блоков, нижний - блоки
+    по LOAD..2*LOAD записей. Вставка и удаление сдвигают только один блок,
+    а страница с конца (новые термины сверху) стоит O(per_page + n / LOAD).
+    Затронутый блок заменяется копией, поэтому clone() дает независимую
+    версию за O(n / LOAD), не трогая блоки, которые видят читатели.
+    """
+
+    LOAD = 512
+
+    def __init__(self, items: Iterable[Tuple[int, Dict]] = ()):
+        self._keys: List[List[int]] = []
+        self._values: List[List[Dict]] = []
+        self._maxes: List[int] = []
+        self._len = 0
+        items = sorted(items, key=lambda item: item[0])
+        for start in range(0, len(items), self.LOAD):
+            chunk = items[start:start + self.LOAD]
+            self._keys.append([key for key, _ in chunk])
+            self._values.append([value for _, value in chunk])
+            self._maxes.append(chunk[-1][0])
+        self._len = len(items)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def clone(self) -> "OrderedIndex":
+        copy = OrderedIndex()
+        copy._keys = list(self._keys)
+        copy._values = list(self._values)
+        copy._maxes = list(self._maxes)
+        copy._len = self._len
+        return copy
+
+    def put(self, key: int, value: Dict):
+        """Вставляет запись или заменяет запись с тем же ключом"""
+        if not self._maxes:
+            self._keys.append([key])
+            self._values.append([value])
+            self._maxes.append(key)
+            self._len = 1
+            return
+
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            # Новые ID монотонны, обычно это дописывание в последний блок
+            i -= 1
+        keys = self._keys[i]
+        j = bisect_left(keys, key)
+        values = list(self._values[i])
+        self._values[i] = values
+        if j < len(keys) and keys[j] == key:
+            values[j] = value
+            return
+
+        keys = self._keys[i] = list(keys)
+        keys.insert(j, key)
+        values.insert(j, value)
+        self._maxes[i] = keys[-1]
+        self._len += 1
+        if len(keys) > 2 * self.LOAD:
+            self._split(i)
+
+    def remove(self, key: int) -> bool:
+        """Удаляет запись по ключу; возвращает False, если ее не было"""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        keys = self._keys[i]
+        j = bisect_left(keys, key)
+        if j == len(keys) or keys[j] != key:
+            return False
+
+        keys = self._keys[i] = keys[:j] + keys[j + 1:]
+        values = self._values[i]
+        self._values[i] = values[:j] + values[j + 1:]
+        self._len -= 1
+        if keys:
+            self._maxes[i] = keys[-1]
+        else:
+            del self._keys[i]
+            del self._values[i]
+            del self._maxes[i]
+        return True
+
+    def _split(self, i: int):
+        keys, values = self._keys[i], self._values[i]
+        half = len(keys) // 2
+        self._keys[i:i + 1] = [keys[:half], keys[half:]]
+        self._values[i:i + 1] = [values[:half], values[half:]]
+        self._maxes[i:i + 1] = [keys[half - 1], keys[-1]]
+
+    def page_desc(self, offset: int, limit: int) -> List[Dict]:
+        """Страница записей в порядке убывания ID"""
+        result: List[Dict] = []
+        for values in reversed(self._values):
+            if len(result) >= limit:
+                break
+            count = len(values)
+            if offset >= count:
+                # Целые блоки пропускаются без обхода записей
+                offset -= count
+                continue
+            end = count - offset
+            start = max(0, end - (limit - len(result)))
+            result.extend(reversed(values[start:end]))
+            offset = 0
+        return result
+
+    def page_before(self, key: int, limit: int) -> List[Dict]:
+        """Страница записей с ID меньше key в порядке убывания ID (курсор)
+
+        Блок с key находится бинарным поиском, поэтому страница стоит
+        O(limit + log n) на любой глубине.
+        """
+        result: List[Dict] = []
+        i = bisect_left(self._maxes, key)
+        if i < len(self._maxes):
+            end = bisect_left(self._keys[i], key)
+            result.extend(reversed(self._values[i][max(0, end - limit):end]))
+        i -= 1
+        while i >= 0 and len(result) < limit:
+            values = self._values[i]
+            result.extend(reversed(values[max(0, len(values) - (limit - len(result))):]))
+            i -= 1
+        return result
+
+    def values_asc(self) -> Iterator[Dict]:
+        """Все записи в порядке возрастания ID"""
+        for values in self._values:
+            yield from values
+
+    def values_desc(self) -> Iterator[Dict]:
+        """Все записи в порядке убывания ID"""
+        for values in reversed(self._values):
+            yield from reversed(values)
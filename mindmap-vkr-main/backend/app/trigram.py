@@ -0,0 +1,60 @@
+from typing import Dict, Iterable, Optional, Set
+
+
+def search_texts(term_data: Dict) -> tuple:
+    """Поля термина, по которым идет поиск подстроки"""
+    return term_data["term"], term_data["definition"], term_data.get("category") or ""
+
+
+def trigrams(text: str) -> Set[str]:
+    """Множество триграмм строки (строка уже приведена к нижнему регистру)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Инвертированный индекс триграмм: триграмма -> множество ID терминов
+
+    Поля приводятся к нижнему регистру тем же str.lower(), что и при проверке
+    вхождения, поэтому любая строка, содержащая запрос как подстроку, содержит
+    и все его триграммы. Индекс только сужает круг кандидатов, окончательную
+    проверку делает вызывающий код.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+
+    def add(self, key: int, texts: Iterable[str]):
+        for text in texts:
+            for gram in trigrams(text.lower()):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    self._postings[gram] = {key}
+                else:
+                    posting.add(key)
+
+    def remove(self, key: int, texts: Iterable[str]):
+        for text in texts:
+            for gram in trigrams(text.lower()):
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(key)
+                    if not posting:
+                        del self._postings[gram]
+
+    def candidates(self, query_lower: str) -> Optional[Set[int]]:
+        """ID терминов, которые могут содержать запрос
+
+        Возвращает None для запросов короче трех символов: по ним индекс
+        ничего не сужает, и нужен полный просмотр.
+        """
+        grams = trigrams(query_lower)
+        if not grams:
+            return None
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
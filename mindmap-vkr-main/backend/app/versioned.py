@@ -0,0 +1,99 @@
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from app.ordered import OrderedIndex
+from app.trigram import TrigramIndex
+
+
+class TermMap:
+    """Отображение id -> запись, разбитое на бакеты по 2**SHIFT соседних ID
+
+    Структура копируется при записи: clone() копирует только верхний уровень
+    (n / 1024 ссылок), а set и delete заменяют единственный затронутый бакет
+    его измененной копией. Версии, которые держат читатели, не меняются.
+    Поиск по ID - два обращения к словарю, то есть O(1).
+    """
+
+    SHIFT = 10
+
+    def __init__(self, items: Iterable[Tuple[int, Dict]] = ()):
+        self._buckets: Dict[int, Dict[int, Dict]] = {}
+        self._len = 0
+        for key, value in items:
+            bucket = self._buckets.setdefault(key >> self.SHIFT, {})
+            if key not in bucket:
+                self._len += 1
+            bucket[key] = value
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, key: int) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: int, default: Optional[Dict] = None) -> Optional[Dict]:
+        bucket = self._buckets.get(key >> self.SHIFT)
+        if bucket is None:
+            return default
+        return bucket.get(key, default)
+
+    def values(self) -> Iterator[Dict]:
+        for bucket in self._buckets.values():
+            yield from bucket.values()
+
+    def items(self) -> Iterator[Tuple[int, Dict]]:
+        for bucket in self._buckets.values():
+            yield from bucket.items()
+
+    def clone(self) -> "TermMap":
+        copy = TermMap()
+        copy._buckets = dict(self._buckets)
+        copy._len = self._len
+        return copy
+
+    def set(self, key: int, value: Dict):
+        index = key >> self.SHIFT
+        bucket = dict(self._buckets.get(index, ()))
+        if key not in bucket:
+            self._len += 1
+        bucket[key] = value
+        self._buckets[index] = bucket
+
+    def delete(self, key: int) -> Optional[Dict]:
+        index = key >> self.SHIFT
+        bucket = self._buckets.get(index)
+        if bucket is None or key not in bucket:
+            return None
+        bucket = dict(bucket)
+        value = bucket.pop(key)
+        self._len -= 1
+        if bucket:
+            self._buckets[index] = bucket
+        else:
+            del self._buckets[index]
+        return value
+
+
+class Version(NamedTuple):
+    """Неизменяемая версия данных, которую читатели используют без блокировок
+
+    terms и ordered у каждой версии свои (копии при записи). Индекс
+    триграмм общий для всех версий от его публикации до следующей замены.
+    В общий индекс писатель только добавляет ID и никогда не удаляет их
+    (TrigramIndex.remove писатели не вызывают): удаление убрало бы
+    кандидатов у более старых версий, которые еще читают этот индекс.
+    Поэтому для каждой версии индекс дает надмножество кандидатов, а лишние
+    отсеиваются проверкой по terms этой версии.
+
+    Устаревшие ID копятся, и индекс заменяется целиком. Новый объект индекса
+    строится в фоне по неизменяемой версии. ID, измененные за время сборки,
+    дописываются в него под блокировкой писателя, и индекс публикуется
+    только вместе с текущей версией (Version._replace). Старые версии
+    остаются со старым объектом, он по-прежнему для них надмножество.
+    trigrams=None - индекс еще строится, поиск идет полным просмотром.
+    Операции над множествами int-ов в индексе выполняются целиком под GIL,
+    поэтому читатель не видит множество посередине изменения.
+    """
+
+    terms: TermMap
+    ordered: OrderedIndex
+    trigrams: TrigramIndex
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.main  # noqa: E402
+from app.database import Database  # noqa: E402
+from app.sqlite_storage import SqliteStorage  # noqa: E402
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    db = Database(SqliteStorage(str(tmp_path / "terms.db")))
+    yield db
+    db.storage.close()
+
+
+@pytest.fixture
+def sqlite_client(sqlite_db, monkeypatch):
+    """REST приложение поверх пустой SQLite базы во временной директории"""
+    monkeypatch.setattr(app.main, "db", sqlite_db)
+    with TestClient(app.main.app) as client:
+        yield client
@@ -0,0 +1,22 @@
+from app.database import Database
+from app.json_storage import JsonStorage
+
+
+def test_sqlite_disables_fragment_cache(sqlite_client, sqlite_db):
+    created = sqlite_client.post("/api/terms", json={"term": "Vue.js", "definition": "Фреймворк"}).json()
+    for _ in range(3):
+        assert sqlite_client.get(f"/api/terms/{created['id']}").json() == created
+        assert sqlite_client.get("/api/terms").json()["terms"] == [created]
+    assert sqlite_db.fragments.max_entries == 0
+    assert sqlite_db.fragments.stats()["entries"] == 0
+
+
+def test_json_reuses_fragments(tmp_path):
+    db = Database(JsonStorage(str(tmp_path / "data" / "terms.json"), journal=False, write_behind=False))
+    try:
+        record = db.storage.storage.create_term("Vue.js", "Фреймворк")
+        first = db.fragments.term(db.storage.storage.get_term(record["id"]))
+        assert db.fragments.term(db.storage.storage.get_term(record["id"])) == first
+        assert db.fragments.stats() == {"hits": 1, "misses": 1, "entries": 1}
+    finally:
+        db.storage.close()
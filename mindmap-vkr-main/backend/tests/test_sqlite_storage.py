@@ -0,0 +1,35 @@
+import pytest
+
+from app.sqlite_storage import SqliteStorage
+
+# Больше INTEGER SQLite: sqlite3 не передает такое число в запрос
+HUGE_ID = 2 ** 63
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "terms.db"))
+    yield storage
+    storage.close()
+
+
+def test_out_of_range_id_is_missing(storage):
+    term = storage.create_term("Vue.js", "Фреймворк")
+    assert storage.get_term(HUGE_ID) is None
+    assert storage.get_term(-HUGE_ID - 1) is None
+    assert storage.update_term(HUGE_ID, {"term": "x"}) is None
+    assert storage.delete_term(HUGE_ID) is False
+    assert storage.get_terms([term["id"], HUGE_ID]) == [term, None]
+    assert storage.delete_terms([HUGE_ID, term["id"]]) == [False, True]
+
+
+def test_rest_out_of_range_id_is_not_found(sqlite_client):
+    assert sqlite_client.get(f"/api/terms/{HUGE_ID}").status_code == 404
+    assert sqlite_client.put(f"/api/terms/{HUGE_ID}", json={"term": "x"}).status_code == 404
+    assert sqlite_client.delete(f"/api/terms/{HUGE_ID}").status_code == 404
+    response = sqlite_client.post("/api/terms:batchGet", json={"ids": [HUGE_ID]})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["status"] == 404
+    response = sqlite_client.post("/api/terms:batchDelete", json={"ids": [HUGE_ID]})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["status"] == 404
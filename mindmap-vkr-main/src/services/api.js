@@ -5,7 +5,8 @@ const API_BASE = process.env.NODE_ENV === 'production'
 
 class GlossaryAPI {
   // Получить все термины с пагинацией и поиском
-  async getTerms(page = 1, perPage = 10, search = '') {
+  // fields - нужные поля терминов, например ['id', 'term', 'related_terms']
+  async getTerms(page = 1, perPage = 10, search = '', fields = null) {
     const params = new URLSearchParams({
       page: page.toString(),
       per_page: perPage.toString()
@@ -15,6 +16,10 @@ class GlossaryAPI {
       params.append('search', search)
     }
     
+    if (fields) {
+      params.append('fields', fields.join(','))
+    }
+    
     const response = await fetch(`${API_BASE}/terms?${params}`)
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`)
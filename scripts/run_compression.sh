@@ -0,0 +1,109 @@
+#!/bin/bash
+# Usage: ./run_compression.sh [users] [spawn_rate] [duration] [modes ...]
+#
+# Прогоняет REST сценарий Locust с разным Accept-Encoding и сравнивает байты
+# тел ответов на проводе и процессорное время сервиса на запрос. Режимы
+# (по умолчанию все): identity - без сжатия, gzip, br - сжатые ответы из
+# кэша, gzip-nocache - сжатие на каждый запрос (GLOSSARY_COMPRESS_CACHE_SIZE=0).
+# Сервис запускается и останавливается скриптом, он не должен быть запущен
+# заранее. Процессорное время берется из /proc/<pid>/stat процесса uvicorn.
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+LOADTEST_DIR="$PROJECT_ROOT/loadtest"
+
+USERS="${1:-50}"
+SPAWN_RATE="${2:-5}"
+DURATION="${3:-1m}"
+shift $(( $# < 3 ? $# : 3 ))
+MODES=("$@")
+if [ ${#MODES[@]} -eq 0 ]; then
+    MODES=(identity gzip br gzip-nocache)
+fi
+CLK_TCK=$(getconf CLK_TCK)
+
+cd "$LOADTEST_DIR" || exit 1
+
+if [ ! -d "venv" ]; then
+    echo "Ошибка: виртуальное окружение не найдено"
+    echo "Создайте venv: cd loadtest && python3 -m venv venv && source venv/bin/activate && pip install -r requirements.txt"
+    exit 1
+fi
+
+source venv/bin/activate
+
+mkdir -p out
+
+service_ready() {
+    curl -s -f http://127.0.0.1:8000/api/health >/dev/null 2>&1
+}
+
+cpu_ticks() {
+    awk '{print $14 + $15}' "/proc/$1/stat"
+}
+
+run_mode() {
+    local mode="$1"
+    local encoding="${mode%-nocache}"
+    local cache_size=256
+    [ "$mode" != "$encoding" ] && cache_size=0
+    local output_prefix="out/rest_compression_${mode}"
+    if service_ready; then
+        echo "Ошибка: REST сервис уже запущен, остановите его перед тестом"
+        return 1
+    fi
+    GLOSSARY_COMPRESS_CACHE_SIZE="$cache_size" \
+        "$SCRIPT_DIR/start_rest.sh" > "${output_prefix}_service.log" 2>&1 &
+    local service_pid=$!
+    for _ in $(seq 1 120); do
+        service_ready && break
+        sleep 0.5
+    done
+    if ! service_ready; then
+        echo "Ошибка: сервис не запустился, см. ${output_prefix}_service.log"
+        kill "$service_pid" 2>/dev/null
+        return 1
+    fi
+
+    echo "Locust: rest Accept-Encoding=$encoding (кэш сжатых ответов: $cache_size) u=$USERS r=$SPAWN_RATE t=$DURATION"
+    local ticks_before ticks_after
+    ticks_before=$(cpu_ticks "$service_pid")
+    REST_ACCEPT_ENCODING="$encoding" REST_WIRE_FILE="${output_prefix}_wire.json" locust -f locustfile_rest.py \
+        --host http://127.0.0.1:8000 \
+        -u "$USERS" \
+        -r "$SPAWN_RATE" \
+        -t "$DURATION" \
+        --stop-timeout 10 \
+        --csv "$output_prefix" \
+        --json-file "$output_prefix" \
+        --headless > "${output_prefix}_locust.log" 2>&1
+    local code=$?
+    ticks_after=$(cpu_ticks "$service_pid")
+    kill "$service_pid" 2>/dev/null
+    wait "$service_pid" 2>/dev/null
+
+    python3 -c "
+import json, sys
+mode, prefix, ticks, clk_tck = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+stats = json.load(open(prefix + '.json'))
+wire = json.load(open(prefix + '_wire.json'))
+requests = sum(s['num_requests'] for s in stats)
+failures = sum(s['num_failures'] for s in stats)
+rps = requests / max(max(s['last_request_timestamp'] for s in stats) - min(s['start_time'] for s in stats), 1e-9)
+listing = wire.get('GET /api/terms', {'requests': 0, 'wire_bytes': 0})
+total = sum(w['wire_bytes'] for w in wire.values())
+print(f'{mode:<14} {requests:>9} {failures:>9} {rps:>8.1f} {listing[\"wire_bytes\"] / max(listing[\"requests\"], 1):>12.0f}'
+      f' {total / max(requests, 1):>12.0f} {ticks * 1000 / clk_tck / max(requests, 1):>12.2f}')
+" "$mode" "$output_prefix" "$((ticks_after - ticks_before))" "$CLK_TCK" >> out/rest_compression_summary.txt
+    return $code
+}
+
+rm -f out/rest_compression_summary.txt
+EXIT_CODE=0
+for mode in "${MODES[@]}"; do
+    run_mode "$mode" || EXIT_CODE=1
+done
+
+printf "%-14s %9s %9s %8s %12s %12s %12s\n" mode requests failures rps "list B/req" "all B/req" "cpu ms/req"
+cat out/rest_compression_summary.txt
+exit $EXIT_CODE
@@ -0,0 +1,134 @@
+#!/bin/bash
+# Usage: ./run_grpc_processes.sh [users] [spawn_rate] [duration] [processes ...]
+#
+# Прогоняет gRPC сценарий Locust против сервиса с разным числом процессов
+# на одном порту (GLOSSARY_GRPC_PROCESSES, по умолчанию 1 2 4 8) в общем
+# режиме хранилища (GLOSSARY_SHARED=1). Сервис запускается и
+# останавливается скриптом, он не должен быть запущен заранее. У каждого
+# пользователя Locust свое соединение (GRPC_CHANNEL_PER_USER=1), иначе все
+# запросы уходят в один процесс. После каждого прогона число терминов
+# сверяется с числом успешных CreateTerm: lost > 0 означает потерянные
+# записи. Хранилище задается GLOSSARY_STORAGE (json по умолчанию), сервер -
+# GLOSSARY_GRPC_SERVER (thread по умолчанию).
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+LOADTEST_DIR="$PROJECT_ROOT/loadtest"
+
+USERS="${1:-100}"
+SPAWN_RATE="${2:-10}"
+DURATION="${3:-1m}"
+shift $(( $# < 3 ? $# : 3 ))
+PROCESSES=("$@")
+if [ ${#PROCESSES[@]} -eq 0 ]; then
+    PROCESSES=(1 2 4 8)
+fi
+STORAGE="${GLOSSARY_STORAGE:-json}"
+SERVER="${GLOSSARY_GRPC_SERVER:-thread}"
+
+cd "$LOADTEST_DIR" || exit 1
+
+if [ ! -d "venv" ]; then
+    echo "Ошибка: виртуальное окружение не найдено"
+    echo "Создайте venv: cd loadtest && python3 -m venv venv && source venv/bin/activate && pip install -r requirements.txt"
+    exit 1
+fi
+
+source venv/bin/activate
+
+mkdir -p out
+
+port_open() {
+    timeout 1 bash -c "echo > /dev/tcp/127.0.0.1/50052" >/dev/null 2>&1
+}
+
+# Готов, когда все процессы написали о старте: раньше соединения Locust
+# достались бы только уже запущенным процессам
+service_ready() {
+    [ "$(grep -c "started, listening" "$1")" -ge "$2" ] && port_open
+}
+
+# Число терминов, которое видят все процессы; пусто, если ответы расходятся.
+# Каждый запрос - на новом соединении, чтобы попасть в разные процессы.
+consistent_total() {
+    python3 -c "
+import sys
+import grpc
+from grpc_gen.glossary_pb2 import GetTermsRequest
+from grpc_gen.glossary_pb2_grpc import GlossaryServiceStub
+
+totals = set()
+for _ in range(4 * int(sys.argv[1])):
+    with grpc.insecure_channel('127.0.0.1:50052', options=[('grpc.use_local_subchannel_pool', 1)]) as channel:
+        totals.add(GlossaryServiceStub(channel).GetTerms(GetTermsRequest(page=1, per_page=1), timeout=5).total)
+if len(totals) == 1:
+    print(totals.pop())
+" "$1"
+}
+
+run_processes() {
+    local processes="$1"
+    local output_prefix="out/grpc_processes${processes}_${SERVER}_${STORAGE}"
+    if port_open; then
+        echo "Ошибка: gRPC сервис уже запущен, остановите его перед тестом"
+        return 1
+    fi
+    # Общий режим и при одном процессе: одинаковый путь записи во всех прогонах
+    GLOSSARY_GRPC_PROCESSES="$processes" GLOSSARY_STORAGE="$STORAGE" GLOSSARY_GRPC_SERVER="$SERVER" \
+        GLOSSARY_SHARED=1 PYTHONUNBUFFERED=1 \
+        "$SCRIPT_DIR/start_grpc.sh" > "${output_prefix}_service.log" 2>&1 &
+    local service_pid=$!
+    for _ in $(seq 1 120); do
+        service_ready "${output_prefix}_service.log" "$processes" && break
+        sleep 0.5
+    done
+    if ! service_ready "${output_prefix}_service.log" "$processes"; then
+        echo "Ошибка: сервис не запустился, см. ${output_prefix}_service.log"
+        kill "$service_pid" 2>/dev/null
+        return 1
+    fi
+    local before
+    before=$(consistent_total "$processes")
+
+    echo "Locust: grpc processes=$processes u=$USERS r=$SPAWN_RATE t=$DURATION ($SERVER, $STORAGE)"
+    GRPC_TARGET=127.0.0.1:50052 GRPC_CHANNEL_PER_USER=1 locust -f locustfile_grpc.py \
+        -u "$USERS" \
+        -r "$SPAWN_RATE" \
+        -t "$DURATION" \
+        --stop-timeout 10 \
+        --csv "$output_prefix" \
+        --json-file "$output_prefix" \
+        --html "${output_prefix}.html" \
+        --headless > "${output_prefix}_locust.log" 2>&1
+    local code=$?
+
+    local after created
+    after=$(consistent_total "$processes")
+    # Итоговая статистика из JSON: CSV пишется до завершения последних запросов
+    created=$(python3 -c "
+import json, sys
+stats = json.load(open(sys.argv[1]))
+print(sum(s['num_requests'] - s['num_failures'] for s in stats if s['name'] == 'CreateTerm'))
+" "${output_prefix}.json")
+    kill "$service_pid" 2>/dev/null
+    wait "$service_pid" 2>/dev/null
+
+    awk -F, -v processes="$processes" -v before="$before" -v after="$after" -v created="$created" '
+        $2 == "Aggregated" { requests = $3; failures = $4; avg = $6; p95 = $17; rps = $10 }
+        END {
+            lost = (before == "" || after == "") ? "n/a" : before + created - after
+            printf "%-9s %10s %9s %9.1f %9s %9.1f %9s %9s\n",
+                processes, requests, failures, avg, p95, rps, created, lost
+        }' "${output_prefix}_stats.csv" >> "out/grpc_processes_${SERVER}_${STORAGE}_summary.txt"
+    return $code
+}
+
+rm -f "out/grpc_processes_${SERVER}_${STORAGE}_summary.txt"
+EXIT_CODE=0
+for processes in "${PROCESSES[@]}"; do
+    run_processes "$processes" || EXIT_CODE=1
+done
+
+printf "%-9s %10s %9s %9s %9s %9s %9s %9s\n" processes requests failures "avg ms" "p95 ms" rps created lost
+cat "out/grpc_processes_${SERVER}_${STORAGE}_summary.txt"
+exit $EXIT_CODE
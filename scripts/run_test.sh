@@ -1,5 +1,21 @@
 #!/bin/bash
-# Usage: ./run_test.sh [rest|grpc] [sanity|normal|stress|stability] [users] [spawn_rate] [duration]
+# Usage: ./run_test.sh [rest|grpc] [sanity|normal|stress|stability] [users] [spawn_rate] [duration] [json|sqlite|compare]
+#
+# Без шестого аргумента тест идет против уже запущенного сервиса.
+# С json/sqlite скрипт сам запускает сервис с этим хранилищем (GLOSSARY_STORAGE)
+# и останавливает его после теста; compare прогоняет оба хранилища подряд
+# и печатает сводку по строке Aggregated.
+# REST_CONDITIONAL=1 - REST сценарий с условными запросами (If-None-Match),
+# результаты пишутся с суффиксом _conditional. REST_FORMAT=protobuf|msgpack -
+# ответы чтения REST в бинарном формате, суффикс _protobuf/_msgpack.
+# REST_WALK=cursor|offset (для grpc - GRPC_WALK) - обход всего корпуса
+# страница за страницей вместо смешанной нагрузки, суффикс _walk_cursor/_walk_offset.
+# REST_PROJECTION=1 (GRPC_PROJECTION=1) - полный список против проекции полей
+# вместо смешанной нагрузки, суффикс _projection.
+# REST_BATCH=1,10,100 (GRPC_BATCH) - пакетные создание, чтение и удаление
+# пакетами из списка размеров, суффикс _batch_1-10-100.
+# GLOSSARY_GRPC_SERVER=aio - gRPC сервис на grpc.aio вместо пула потоков
+# (при запуске сервиса скриптом), суффикс _aio.
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
@@ -10,6 +26,35 @@ SCENARIO="${2:-sanity}"
 USERS="${3:-5}"
 SPAWN_RATE="${4:-1}"
 DURATION="${5:-2m}"
+STORAGE="${6:-}"
+VARIANT=""
+if [ "$PROTOCOL" == "rest" ]; then
+    if [ -n "$REST_FORMAT" ] && [ "$REST_FORMAT" != "json" ]; then
+        VARIANT="_${REST_FORMAT}"
+    fi
+    if [ "${REST_CONDITIONAL:-0}" == "1" ]; then
+        VARIANT="${VARIANT}_conditional"
+    fi
+    WALK="$REST_WALK"
+    PROJECTION="$REST_PROJECTION"
+    BATCH="$REST_BATCH"
+else
+    WALK="$GRPC_WALK"
+    PROJECTION="$GRPC_PROJECTION"
+    BATCH="$GRPC_BATCH"
+    if [ "$GLOSSARY_GRPC_SERVER" == "aio" ]; then
+        VARIANT="_aio"
+    fi
+fi
+if [ -n "$WALK" ]; then
+    VARIANT="${VARIANT}_walk_${WALK}"
+fi
+if [ "${PROJECTION:-0}" == "1" ]; then
+    VARIANT="${VARIANT}_projection"
+fi
+if [ -n "$BATCH" ]; then
+    VARIANT="${VARIANT}_batch_${BATCH//,/-}"
+fi
 
 if [[ ! "$PROTOCOL" =~ ^(rest|grpc)$ ]]; then
     echo "Ошибка: протокол должен быть 'rest' или 'grpc'"
@@ -21,6 +66,31 @@ if [[ ! "$SCENARIO" =~ ^(sanity|normal|stress|stability)$ ]]; then
     exit 1
 fi
 
+if [ -n "$STORAGE" ] && [[ ! "$STORAGE" =~ ^(json|sqlite|compare)$ ]]; then
+    echo "Ошибка: хранилище должно быть 'json', 'sqlite' или 'compare'"
+    exit 1
+fi
+
+if [ -n "$REST_FORMAT" ] && [[ ! "$REST_FORMAT" =~ ^(json|protobuf|msgpack)$ ]]; then
+    echo "Ошибка: REST_FORMAT должен быть 'json', 'protobuf' или 'msgpack'"
+    exit 1
+fi
+
+if [ -n "$WALK" ] && [[ ! "$WALK" =~ ^(cursor|offset)$ ]]; then
+    echo "Ошибка: REST_WALK/GRPC_WALK должен быть 'cursor' или 'offset'"
+    exit 1
+fi
+
+if [ -n "$GLOSSARY_GRPC_SERVER" ] && [[ ! "$GLOSSARY_GRPC_SERVER" =~ ^(thread|aio)$ ]]; then
+    echo "Ошибка: GLOSSARY_GRPC_SERVER должен быть 'thread' или 'aio'"
+    exit 1
+fi
+
+if [ -n "$BATCH" ] && [[ ! "$BATCH" =~ ^[0-9]+(,[0-9]+)*$ ]]; then
+    echo "Ошибка: REST_BATCH/GRPC_BATCH должен быть списком размеров, например 1,10,100"
+    exit 1
+fi
+
 cd "$LOADTEST_DIR" || exit 1
 
 if [ ! -d "venv" ]; then
@@ -31,38 +101,90 @@ fi
 
 source venv/bin/activate
 
-OUTPUT_PREFIX="out/${PROTOCOL}_${SCENARIO}"
+mkdir -p out
 
-echo "Locust: $PROTOCOL $SCENARIO u=$USERS r=$SPAWN_RATE t=$DURATION"
+run_locust() {
+    local output_prefix="$1"
+    echo "Locust: $PROTOCOL $SCENARIO$VARIANT u=$USERS r=$SPAWN_RATE t=$DURATION"
+    if [ "$PROTOCOL" == "rest" ]; then
+        locust -f locustfile_rest.py \
+            --host http://127.0.0.1:8000 \
+            -u "$USERS" \
+            -r "$SPAWN_RATE" \
+            -t "$DURATION" \
+            --csv "$output_prefix" \
+            --html "${output_prefix}.html" \
+            --headless
+    else
+        GRPC_TARGET=127.0.0.1:50052 locust -f locustfile_grpc.py \
+            -u "$USERS" \
+            -r "$SPAWN_RATE" \
+            -t "$DURATION" \
+            --csv "$output_prefix" \
+            --html "${output_prefix}.html" \
+            --headless
+    fi
+    local code=$?
+    if [ $code -eq 0 ]; then
+        echo "OK: ${output_prefix}_stats.csv ${output_prefix}_failures.csv ${output_prefix}_exceptions.csv ${output_prefix}.html"
+    else
+        echo "FAIL (code=$code)"
+    fi
+    return $code
+}
 
-mkdir -p out
+service_ready() {
+    if [ "$PROTOCOL" == "rest" ]; then
+        curl -s -f http://127.0.0.1:8000/api/health >/dev/null 2>&1
+    else
+        timeout 1 bash -c "echo > /dev/tcp/127.0.0.1/50052" >/dev/null 2>&1
+    fi
+}
 
-if [ "$PROTOCOL" == "rest" ]; then
-    locust -f locustfile_rest.py \
-        --host http://127.0.0.1:8000 \
-        -u "$USERS" \
-        -r "$SPAWN_RATE" \
-        -t "$DURATION" \
-        --csv "$OUTPUT_PREFIX" \
-        --html "${OUTPUT_PREFIX}.html" \
-        --headless
-else
-    GRPC_TARGET=127.0.0.1:50052 locust -f locustfile_grpc.py \
-        -u "$USERS" \
-        -r "$SPAWN_RATE" \
-        -t "$DURATION" \
-        --csv "$OUTPUT_PREFIX" \
-        --html "${OUTPUT_PREFIX}.html" \
-        --headless
-fi
+run_with_storage() {
+    local storage="$1"
+    local output_prefix="out/${PROTOCOL}_${SCENARIO}${VARIANT}_${storage}"
+    if service_ready; then
+        echo "Ошибка: сервис $PROTOCOL уже запущен, остановите его перед тестом с хранилищем $storage"
+        return 1
+    fi
+    GLOSSARY_STORAGE="$storage" "$SCRIPT_DIR/start_${PROTOCOL}.sh" > "${output_prefix}_service.log" 2>&1 &
+    local service_pid=$!
+    for _ in $(seq 1 120); do
+        service_ready && break
+        sleep 0.5
+    done
+    if ! service_ready; then
+        echo "Ошибка: сервис не запустился, см. ${output_prefix}_service.log"
+        kill "$service_pid" 2>/dev/null
+        return 1
+    fi
+    run_locust "$output_prefix"
+    local code=$?
+    kill "$service_pid" 2>/dev/null
+    wait "$service_pid" 2>/dev/null
+    return $code
+}
 
-EXIT_CODE=$?
+print_summary() {
+    printf "%-8s %10s %9s %9s %9s %9s\n" storage requests failures "avg ms" "p95 ms" rps
+    for storage in json sqlite; do
+        awk -F, -v storage="$storage" '$2 == "Aggregated" {
+            printf "%-8s %10s %9s %9.1f %9s %9.1f\n", storage, $3, $4, $6, $17, $10
+        }' "out/${PROTOCOL}_${SCENARIO}${VARIANT}_${storage}_stats.csv"
+    done
+}
 
-if [ $EXIT_CODE -eq 0 ]; then
-    echo "OK: ${OUTPUT_PREFIX}_stats.csv ${OUTPUT_PREFIX}_failures.csv ${OUTPUT_PREFIX}_exceptions.csv ${OUTPUT_PREFIX}.html"
+if [ -z "$STORAGE" ]; then
+    run_locust "out/${PROTOCOL}_${SCENARIO}${VARIANT}"
+    EXIT_CODE=$?
+elif [ "$STORAGE" == "compare" ]; then
+    run_with_storage json && run_with_storage sqlite
+    EXIT_CODE=$?
+    [ $EXIT_CODE -eq 0 ] && print_summary
 else
-    echo "FAIL (code=$EXIT_CODE)"
+    run_with_storage "$STORAGE"
+    EXIT_CODE=$?
 fi
 
 exit $EXIT_CODE
-
@@ -0,0 +1,121 @@
+#!/bin/bash
+# Usage: ./run_workers.sh [users] [spawn_rate] [duration] [workers ...]
+#
+# Прогоняет REST сценарий Locust против uvicorn с разным числом воркеров
+# (по умолчанию 1 2 4 8) в общем режиме хранилища (GLOSSARY_SHARED=1).
+# Сервис запускается и останавливается скриптом, он не должен быть запущен
+# заранее. После каждого прогона число терминов сверяется с числом успешных
+# POST /api/terms: lost > 0 означает потерянные записи. --stop-timeout дает
+# пользователям дождаться ответов, чтобы в статистику попали все POST.
+# Хранилище задается GLOSSARY_STORAGE (json по умолчанию).
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+LOADTEST_DIR="$PROJECT_ROOT/loadtest"
+
+USERS="${1:-100}"
+SPAWN_RATE="${2:-10}"
+DURATION="${3:-1m}"
+shift $(( $# < 3 ? $# : 3 ))
+WORKERS=("$@")
+if [ ${#WORKERS[@]} -eq 0 ]; then
+    WORKERS=(1 2 4 8)
+fi
+STORAGE="${GLOSSARY_STORAGE:-json}"
+
+cd "$LOADTEST_DIR" || exit 1
+
+if [ ! -d "venv" ]; then
+    echo "Ошибка: виртуальное окружение не найдено"
+    echo "Создайте venv: cd loadtest && python3 -m venv venv && source venv/bin/activate && pip install -r requirements.txt"
+    exit 1
+fi
+
+source venv/bin/activate
+
+mkdir -p out
+
+service_ready() {
+    curl -s -f http://127.0.0.1:8000/api/health >/dev/null 2>&1
+}
+
+term_total() {
+    curl -s -f "http://127.0.0.1:8000/api/terms?page=1&per_page=1" |
+        python3 -c "import json, sys; print(json.load(sys.stdin)['total'])"
+}
+
+# Число терминов, которое видят все воркеры; пусто, если ответы расходятся
+consistent_total() {
+    local totals
+    totals=$(for _ in $(seq 1 $((4 * $1))); do term_total; done | sort -u)
+    if [ "$(echo "$totals" | wc -l)" -eq 1 ]; then
+        echo "$totals"
+    fi
+}
+
+run_workers() {
+    local workers="$1"
+    local output_prefix="out/rest_workers${workers}_${STORAGE}"
+    if service_ready; then
+        echo "Ошибка: REST сервис уже запущен, остановите его перед тестом"
+        return 1
+    fi
+    # Общий режим и при одном воркере: одинаковый путь записи во всех прогонах
+    GLOSSARY_WORKERS="$workers" GLOSSARY_STORAGE="$STORAGE" GLOSSARY_SHARED=1 \
+        "$SCRIPT_DIR/start_rest.sh" > "${output_prefix}_service.log" 2>&1 &
+    local service_pid=$!
+    for _ in $(seq 1 120); do
+        service_ready && break
+        sleep 0.5
+    done
+    if ! service_ready; then
+        echo "Ошибка: сервис не запустился, см. ${output_prefix}_service.log"
+        kill "$service_pid" 2>/dev/null
+        return 1
+    fi
+    local before
+    before=$(consistent_total "$workers")
+
+    echo "Locust: rest workers=$workers u=$USERS r=$SPAWN_RATE t=$DURATION ($STORAGE)"
+    locust -f locustfile_rest.py \
+        --host http://127.0.0.1:8000 \
+        -u "$USERS" \
+        -r "$SPAWN_RATE" \
+        -t "$DURATION" \
+        --stop-timeout 10 \
+        --csv "$output_prefix" \
+        --json-file "$output_prefix" \
+        --html "${output_prefix}.html" \
+        --headless > "${output_prefix}_locust.log" 2>&1
+    local code=$?
+
+    local after created
+    after=$(consistent_total "$workers")
+    # Итоговая статистика из JSON: CSV пишется до завершения последних запросов
+    created=$(python3 -c "
+import json, sys
+stats = json.load(open(sys.argv[1]))
+print(sum(s['num_requests'] - s['num_failures'] for s in stats if s['name'] == 'POST /api/terms'))
+" "${output_prefix}.json")
+    kill "$service_pid" 2>/dev/null
+    wait "$service_pid" 2>/dev/null
+
+    awk -F, -v workers="$workers" -v before="$before" -v after="$after" -v created="$created" '
+        $2 == "Aggregated" { requests = $3; failures = $4; avg = $6; p95 = $17; rps = $10 }
+        END {
+            lost = (before == "" || after == "") ? "n/a" : before + created - after
+            printf "%-8s %10s %9s %9.1f %9s %9.1f %9s %9s\n",
+                workers, requests, failures, avg, p95, rps, created, lost
+        }' "${output_prefix}_stats.csv" >> "out/rest_workers_${STORAGE}_summary.txt"
+    return $code
+}
+
+rm -f "out/rest_workers_${STORAGE}_summary.txt"
+EXIT_CODE=0
+for workers in "${WORKERS[@]}"; do
+    run_workers "$workers" || EXIT_CODE=1
+done
+
+printf "%-8s %10s %9s %9s %9s %9s %9s %9s\n" workers requests failures "avg ms" "p95 ms" rps created lost
+cat "out/rest_workers_${STORAGE}_summary.txt"
+exit $EXIT_CODE
@@ -25,6 +25,17 @@ if [ ! -f "glossary_pb2.py" ] || [ ! -f "glossary_pb2_grpc.py" ]; then
     venv/bin/python3 -m grpc_tools.protoc -I ./protobufs --python_out=. --grpc_python_out=. ./protobufs/glossary.proto
 fi
 
-echo "gRPC: 127.0.0.1:50052"
-venv/bin/python3 glossary.py
+# Бэкенд хранилища: json (по умолчанию) или sqlite
+export GLOSSARY_STORAGE="${GLOSSARY_STORAGE:-json}"
+# Сервер: thread (пул из 10 потоков, по умолчанию) или aio (grpc.aio)
+export GLOSSARY_GRPC_SERVER="${GLOSSARY_GRPC_SERVER:-thread}"
+
+# Число процессов сервера на порту 50052; при нескольких хранилище работает в общем режиме
+export GLOSSARY_GRPC_PROCESSES="${GLOSSARY_GRPC_PROCESSES:-1}"
+if [ "$GLOSSARY_GRPC_PROCESSES" -gt 1 ]; then
+    export GLOSSARY_SHARED=1
+fi
+
+echo "gRPC: 127.0.0.1:50052 (хранилище: $GLOSSARY_STORAGE, сервер: $GLOSSARY_GRPC_SERVER, процессов: $GLOSSARY_GRPC_PROCESSES)"
+exec venv/bin/python3 glossary.py
 
@@ -25,6 +25,15 @@ if ! venv/bin/python3 -m uvicorn --help >/dev/null 2>&1; then
     venv/bin/pip install --force-reinstall -r requirements.txt
 fi
 
-echo "REST: http://127.0.0.1:8000"
-venv/bin/python3 -m uvicorn app.main:app --host 0.0.0.0 --port 8000
+# Бэкенд хранилища: json (по умолчанию) или sqlite
+export GLOSSARY_STORAGE="${GLOSSARY_STORAGE:-json}"
+
+# Число воркеров uvicorn; при нескольких воркерах хранилище работает в общем режиме
+GLOSSARY_WORKERS="${GLOSSARY_WORKERS:-1}"
+if [ "$GLOSSARY_WORKERS" -gt 1 ]; then
+    export GLOSSARY_SHARED=1
+fi
+
+echo "REST: http://127.0.0.1:8000 (хранилище: $GLOSSARY_STORAGE, воркеров: $GLOSSARY_WORKERS)"
+exec venv/bin/python3 -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers "$GLOSSARY_WORKERS"
 